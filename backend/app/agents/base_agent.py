@@ -34,7 +34,7 @@ class BaseAgent(ABC):
         
         Args:
             success: Whether the operation was successful
-            data: Result data if successful
+            data: Result data if successful (or details of the failure)
             error: Error message if unsuccessful
         
         Returns:
@@ -49,5 +49,7 @@ class BaseAgent(ABC):
             response["data"] = data
         else:
             response["error"] = error
+            if data is not None:
+                response["data"] = data  # e.g. a user-facing explanation of the failure
         
         return response
@@ -1,10 +1,13 @@
 """Parent agent for orchestrating tourism queries with enhanced text parsing."""
 
-from typing import Dict, Any
+import asyncio
+from typing import Dict, Any, AsyncIterator, List, Mapping, Optional, Tuple
+from app.config import settings
 from app.agents.base_agent import BaseAgent
 from app.agents.weather_agent import WeatherAgent
 from app.agents.places_agent import PlacesAgent
 from app.services.geocoding import get_coordinates
+from app.services.weather import get_current_weather_bulk
 from app.utils.text_parser import EnhancedTextParser
 from app.utils.exceptions import PlaceNotFoundError, GeocodingAPIError
 
@@ -19,6 +22,115 @@ class ParentAgent(BaseAgent):
         self.text_parser = EnhancedTextParser()
         self.logger.info("Initialized parent agent with enhanced text parser")
     
+    def _select_agents(self, intent: Dict[str, bool]) -> List[Tuple[str, BaseAgent, float]]:
+        """
+        Select the child agents to invoke for a detected intent.
+        
+        Args:
+            intent: Dictionary with weather/places flags
+        
+        Returns:
+            List of (name, agent, timeout_seconds) tuples
+        """
+        selected = []
+        
+        if intent["weather"]:
+            selected.append(("weather", self.weather_agent, settings.weather_agent_timeout))
+        
+        if intent["places"]:
+            selected.append(("places", self.places_agent, settings.places_agent_timeout))
+        
+        return selected
+    
+    async def _run_agent(self, name: str, agent: BaseAgent, timeout: float,
+                         lat: float, lon: float, location: str) -> Dict[str, Any]:
+        """Run one child agent with a deadline, converting a timeout into a failed response."""
+        self.logger.info(f"Invoking {name} agent for {location}")
+        
+        try:
+            return await asyncio.wait_for(agent.process(lat, lon, location), timeout=timeout)
+        except asyncio.TimeoutError:
+            self.logger.warning(f"{name.capitalize()} agent timed out after {timeout}s for {location}")
+            response = agent.format_response(
+                success=False,
+                error=f"{name.capitalize()} agent timed out after {timeout}s"
+            )
+            response["timed_out"] = True
+            return response
+    
+    async def _run_agents(self, agents: List[Tuple[str, BaseAgent, float]],
+                          lat: float, lon: float, location: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Run the selected child agents concurrently.
+        
+        Total latency is that of the slowest agent (bounded by its deadline)
+        rather than the sum of all agents.
+        
+        Args:
+            agents: List of (name, agent, timeout_seconds) tuples
+            lat: Latitude
+            lon: Longitude
+            location: Place name
+        
+        Returns:
+            Dictionary mapping agent name to its response
+        """
+        responses = await asyncio.gather(*(
+            self._run_agent(name, agent, timeout, lat, lon, location)
+            for name, agent, timeout in agents
+        ))
+        
+        return {name: response for (name, _, _), response in zip(agents, responses)}
+    
+    async def _locate(self, parsed: Mapping[str, Any]) -> Tuple[Optional[Dict[str, float]], Optional[Dict[str, Any]]]:
+        """
+        Geocode the location of a parsed query.
+        
+        Args:
+            parsed: Result of EnhancedTextParser.parse_query
+        
+        Returns:
+            (coordinates, None) on success, or (None, failure response)
+        """
+        location = parsed["location"]
+        
+        if not location:
+            return None, self.format_response(
+                success=False,
+                data={
+                    "text": "I couldn't identify a location in your query. Please mention a city or place you'd like to know about. For example: 'What's the weather in Paris?' or 'Places to visit in Tokyo'"
+                }
+            )
+        
+        try:
+            return await get_coordinates(location), None
+            
+        except PlaceNotFoundError as e:
+            # If we have suggestions from our enhanced parser (or the geocoder), use them
+            suggestions = parsed["suggestions"] or e.suggestions
+            if suggestions:
+                suggestion_text = ", ".join(suggestions)
+                return None, self.format_response(
+                    success=False,
+                    data={
+                        "text": f"I couldn't find '{location}'. Did you mean: {suggestion_text}? Please try again with the correct spelling."
+                    }
+                )
+            else:
+                return None, self.format_response(
+                    success=False,
+                    data={
+                        "text": f"I couldn't find a place called '{location}'. Please check the spelling or try a different location."
+                    }
+                )
+        except GeocodingAPIError as e:
+            return None, self.format_response(
+                success=False,
+                data={
+                    "text": f"I couldn't locate '{location}' at the moment. Please try again later."
+                }
+            )
+    
     async def process(self, query: str) -> Dict[str, Any]:
         """
         Process tourism query by coordinating child agents using enhanced text parsing.
@@ -35,131 +147,283 @@ class ParentAgent(BaseAgent):
             # Parse query using enhanced text parser
             parsed = self.text_parser.parse_query(query)
             
+            # Geocode the place
+            coordinates, failure = await self._locate(parsed)
+            if failure:
+                return failure
+            
+            return await self._respond(parsed, coordinates)
+                
+        except Exception as e:
+            return self._error_response(e)
+    
+    async def process_batch(self, queries: List[str]) -> List[Dict[str, Any]]:
+        """
+        Process many tourism queries at once.
+        
+        Each distinct location is geocoded once, in order of first
+        appearance (geocoding is rate limited, so this is the sequential
+        part). Weather for all items that ask for it is then fetched with
+        bulk Open-Meteo requests, which fill the weather cache, and the
+        items are answered concurrently; places lookups for repeated
+        locations are coalesced by the places cache and single flight.
+        
+        Args:
+            queries: User query texts
+        
+        Returns:
+            One formatted response per query, in input order
+        """
+        self.logger.info(f"Processing batch of {len(queries)} queries")
+        
+        parsed_queries = [self.text_parser.parse_query(query) for query in queries]
+        
+        # Geocode each distinct location once
+        located: Dict[Optional[str], Tuple[Optional[Dict[str, float]], Optional[Dict[str, Any]]]] = {}
+        for parsed in parsed_queries:
             location = parsed["location"]
-            intent = parsed["intent"]
-            was_corrected = parsed["was_corrected"]
-            suggestions = parsed["suggestions"]
+            if location not in located:
+                try:
+                    located[location] = await self._locate(parsed)
+                except Exception as e:
+                    located[location] = (None, self._error_response(e))
+        
+        # Warm the weather cache with bulk requests
+        weather_points = [
+            (located[parsed["location"]][0]["lat"], located[parsed["location"]][0]["lon"])
+            for parsed in parsed_queries
+            if parsed["intent"]["weather"] and located[parsed["location"]][0]
+        ]
+        if weather_points:
+            try:
+                await get_current_weather_bulk(weather_points)
+            except Exception as e:
+                # Items fall back to individual weather lookups
+                self.logger.warning(f"Bulk weather prefetch failed: {str(e)}")
+        
+        async def answer(parsed: Mapping[str, Any]) -> Dict[str, Any]:
+            coordinates, failure = located[parsed["location"]]
+            if failure:
+                return failure
+            try:
+                return await self._respond(parsed, coordinates)
+            except Exception as e:
+                return self._error_response(e)
+        
+        return list(await asyncio.gather(*(answer(parsed) for parsed in parsed_queries)))
+    
+    def _error_response(self, error: Exception) -> Dict[str, Any]:
+        """Failure response for an unexpected error."""
+        self.logger.error(f"Unexpected error in parent agent: {str(error)}")
+        return self.format_response(
+            success=False,
+            data={
+                "text": f"An error occurred while processing your request: {str(error)}"
+            }
+        )
+    
+    def _intent_for(self, parsed: Mapping[str, Any]) -> Dict[str, bool]:
+        """Intent of a parsed query, defaulting to places when nothing specific was asked."""
+        intent = dict(parsed["intent"])  # Parse results are shared and read-only
+        
+        # Smart default: If no specific intent detected, show places (tourist guide mode)
+        # This makes it more helpful when user just says a city name
+        if not intent["weather"] and not intent["places"]:
+            self.logger.info(f"No specific intent - defaulting to tourist guide mode for {parsed['location']}")
+            intent["places"] = True  # Auto-show places
+        
+        return intent
+    
+    async def _respond(self, parsed: Mapping[str, Any], coordinates: Dict[str, float]) -> Dict[str, Any]:
+        """
+        Run the child agents for a located query and combine their answers.
+        
+        Args:
+            parsed: Result of EnhancedTextParser.parse_query
+            coordinates: Geocoded coordinates of the parsed location
+        
+        Returns:
+            Formatted response
+        """
+        intent = self._intent_for(parsed)
+        
+        # Fan out to the relevant child agents concurrently
+        agent_responses = await self._run_agents(
+            self._select_agents(intent), coordinates["lat"], coordinates["lon"], parsed["location"]
+        )
+        
+        return self._compose(parsed, coordinates, intent, agent_responses)
+    
+    async def process_stream(self, query: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process a tourism query, yielding partial results as each stage completes.
+        
+        Events (each a dict with an "event" key), in order:
+        - "parsed": location and intent from the text parser
+        - "located": place name and coordinates
+        - "weather" / "places": each child agent's response (under "result")
+          as soon as it finishes, so fast weather does not wait for slow
+          places lookups
+        - "done": the combined response (under "result"), as process() returns it
+        
+        A failure at any stage yields an "error" event with the failure
+        response under "result" and ends the stream.
+        
+        Args:
+            query: User query text
+        
+        Yields:
+            Event dictionaries
+        """
+        try:
+            self.logger.info(f"Streaming query: {query}")
             
-            if not location:
-                return self.format_response(
-                    success=False,
-                    data={
-                        "text": "I couldn't identify a location in your query. Please mention a city or place you'd like to know about. For example: 'What's the weather in Paris?' or 'Places to visit in Tokyo'"
-                    }
-                )
+            parsed = self.text_parser.parse_query(query)
+            yield {
+                "event": "parsed",
+                "location": parsed["location"],
+                "intent": dict(parsed["intent"]),
+                "was_corrected": parsed["was_corrected"]
+            }
             
-            # Geocode the place
-            try:
-                coordinates = await get_coordinates(location)
-                lat = coordinates["lat"]
-                lon = coordinates["lon"]
-                
-                # Build correction note if location was auto-corrected
-                correction_note = ""
-                if was_corrected:
-                    correction_note = f"(I understood '{parsed['original_query'].split()[-1]}' as '{location}') "
-                    self.logger.info(f"Auto-corrected to: {location}")
-                    
-            except PlaceNotFoundError as e:
-                # If we have suggestions from our enhanced parser, use them
-                if suggestions:
-                    suggestion_text = ", ".join(suggestions)
-                    return self.format_response(
-                        success=False,
-                        data={
-                            "text": f"I couldn't find '{location}'. Did you mean: {suggestion_text}? Please try again with the correct spelling."
-                        }
-                    )
-                else:
-                    return self.format_response(
-                        success=False,
-                        data={
-                            "text": f"I couldn't find a place called '{location}'. Please check the spelling or try a different location."
-                        }
-                    )
-            except GeocodingAPIError as e:
-                return self.format_response(
-                    success=False,
-                    data={
-                        "text": f"I couldn't locate '{location}' at the moment. Please try again later."
-                    }
-                )
+            coordinates, failure = await self._locate(parsed)
+            if failure:
+                yield {"event": "error", "result": failure}
+                return
             
-            # Collect responses from relevant agents based on detected intent
-            responses = []
-            weather_data = None
-            places_data = []
+            yield {"event": "located", "place_name": parsed["location"], "coordinates": coordinates}
             
-            # Smart default: If no specific intent detected, show places (tourist guide mode)
-            # This makes it more helpful when user just says a city name
-            if not intent["weather"] and not intent["places"]:
-                self.logger.info(f"No specific intent - defaulting to tourist guide mode for {location}")
-                intent["places"] = True  # Auto-show places
+            intent = self._intent_for(parsed)
+            tasks = {
+                asyncio.ensure_future(
+                    self._run_agent(name, agent, timeout, coordinates["lat"], coordinates["lon"], parsed["location"])
+                ): name
+                for name, agent, timeout in self._select_agents(intent)
+            }
+            agent_responses = {}
             
-            if intent["weather"]:
-                self.logger.info(f"Invoking weather agent for {location}")
-                weather_response = await self.weather_agent.process(lat, lon, location)
-                if weather_response["success"]:
-                    responses.append(weather_response["data"]["text"])
-                    # Store weather data for map
-                    weather_data = {
-                        "temp": weather_response["data"].get("temperature"),
-                        "precipitation": weather_response["data"].get("precipitation")
-                    }
+            try:
+                pending = set(tasks)
+                while pending:
+                    done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    # Stable order when several finish together
+                    for task in sorted(done, key=lambda t: tasks[t] != "weather"):
+                        name = tasks[task]
+                        agent_responses[name] = task.result()
+                        yield {"event": name, "result": agent_responses[name]}
+            finally:
+                # Client went away mid-stream
+                for task in tasks:
+                    task.cancel()
             
-            if intent["places"]:
-                self.logger.info(f"Invoking places agent for {location}")
-                places_response = await self.places_agent.process(lat, lon, location)
-                if places_response["success"]:
-                    responses.append(places_response["data"]["text"])
-                    # Store places data for map
-                    places_data = places_response["data"].get("places", [])
+            yield {"event": "done", "result": self._compose(parsed, coordinates, intent, agent_responses)}
             
-            # Combine responses with tourist guide personality
-            if responses:
-                # Handle combined responses with proper formatting
-                if len(responses) == 2:
-                    # Weather + Places
-                    final_text = correction_note + responses[0].rstrip('.') + ". And " + responses[1][0].lower() + responses[1][1:]
-                elif len(responses) == 1 and intent["places"] and not intent["weather"]:
-                    # Just places - add friendly tourist guide intro
-                    if correction_note:
-                        final_text = correction_note + f"Great choice! {responses[0]}"
-                    else:
-                        final_text = f"Welcome to {location}! {responses[0]}"
-                    
-                    # Add helpful suggestions
-                    if places_data:
-                        final_text += f"\n\n💡 Would you like to know the weather in {location}? Or see these places on an interactive map? Just ask!"
+        except Exception as e:
+            yield {"event": "error", "result": self._error_response(e)}
+    
+    def _compose(self, parsed: Mapping[str, Any], coordinates: Dict[str, float],
+                 intent: Dict[str, bool], agent_responses: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Combine child agent responses into the final answer.
+        
+        Args:
+            parsed: Result of EnhancedTextParser.parse_query
+            coordinates: Geocoded coordinates of the parsed location
+            intent: Effective intent (see _intent_for)
+            agent_responses: Dictionary mapping agent name to its response
+        
+        Returns:
+            Formatted response
+        """
+        location = parsed["location"]
+        
+        # Build correction note if location was auto-corrected
+        correction_note = ""
+        if parsed["was_corrected"]:
+            correction_note = f"(I understood '{parsed['original_query'].split()[-1]}' as '{location}') "
+            self.logger.info(f"Auto-corrected to: {location}")
+        
+        # Collect responses in a stable order (weather first, then places)
+        responses = []
+        weather_data = None
+        places_data = []
+        timed_out = []
+        
+        weather_response = agent_responses.get("weather")
+        if weather_response:
+            if weather_response["success"]:
+                responses.append(weather_response["data"]["text"])
+                # Store weather data for map
+                weather_data = {
+                    "temp": weather_response["data"].get("temperature"),
+                    "precipitation": weather_response["data"].get("precipitation")
+                }
+            elif weather_response.get("timed_out"):
+                timed_out.append("weather")
+        
+        places_response = agent_responses.get("places")
+        if places_response:
+            if places_response["success"]:
+                responses.append(places_response["data"]["text"])
+                # Store places data for map
+                places_data = places_response["data"].get("places", [])
+            elif places_response.get("timed_out"):
+                timed_out.append("places")
+        
+        # Combine responses with tourist guide personality
+        if responses:
+            # Handle combined responses with proper formatting
+            if len(responses) == 2:
+                # Weather + Places
+                final_text = correction_note + responses[0].rstrip('.') + ". And " + responses[1][0].lower() + responses[1][1:]
+            elif len(responses) == 1 and intent["places"] and not intent["weather"]:
+                # Just places - add friendly tourist guide intro
+                if correction_note:
+                    final_text = correction_note + f"Great choice! {responses[0]}"
                 else:
-                    final_text = correction_note + responses[0]
+                    final_text = f"Welcome to {location}! {responses[0]}"
                 
-                return self.format_response(
-                    success=True,
-                    data={
-                        "text": final_text,
-                        "place_name": location,
-                        "coordinates": coordinates,
-                        "places": places_data,  # For map generation
-                        "weather": weather_data  # For map generation
-                    }
-                )
+                # Add helpful suggestions
+                if places_data:
+                    final_text += f"\n\n💡 Would you like to know the weather in {location}? Or see these places on an interactive map? Just ask!"
             else:
-                # Fallback with helpful suggestions
-                return self.format_response(
-                    success=True,
-                    data={
-                        "text": f"I can help you explore {location}! Ask me about:\n• Weather and temperature\n• Top tourist attractions\n• Interactive map view\n\nWhat would you like to know?",
-                        "place_name": location,
-                        "coordinates": coordinates
-                    }
-                )
-                
-        except Exception as e:
-            self.logger.error(f"Unexpected error in parent agent: {str(e)}")
+                final_text = correction_note + responses[0]
+            
+            # Partial result: mention agents that missed their deadline
+            if timed_out:
+                final_text += f"\n\n⏳ {' and '.join(timed_out).capitalize()} information is taking longer than usual - please try again in a moment."
+            
             return self.format_response(
+                success=True,
+                data={
+                    "text": final_text,
+                    "place_name": location,
+                    "coordinates": coordinates,
+                    "places": places_data,  # For map generation
+                    "weather": weather_data  # For map generation
+                }
+            )
+        elif timed_out:
+            # Every agent that was asked missed its deadline: nothing to show
+            self.logger.warning(f"All agents timed out for {location}: {', '.join(timed_out)}")
+            response = self.format_response(
                 success=False,
+                error=f"{' and '.join(timed_out).capitalize()} agent timed out",
+                data={
+                    "text": f"{' and '.join(timed_out).capitalize()} information for {location} is taking longer than usual - please try again in a moment.",
+                    "place_name": location,
+                    "coordinates": coordinates
+                }
+            )
+            response["timed_out"] = True
+            return response
+        else:
+            # Fallback with helpful suggestions
+            return self.format_response(
+                success=True,
                 data={
-                    "text": f"An error occurred while processing your request: {str(e)}"
+                    "text": f"I can help you explore {location}! Ask me about:\n• Weather and temperature\n• Top tourist attractions\n• Interactive map view\n\nWhat would you like to know?",
+                    "place_name": location,
+                    "coordinates": coordinates
                 }
             )
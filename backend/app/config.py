@@ -29,14 +29,88 @@ class Settings(BaseSettings):
     # API Configuration
     api_timeout: int = Field(default=30, alias="API_TIMEOUT")
     
+    # Per-agent deadlines (seconds) when fanning out to child agents
+    weather_agent_timeout: float = Field(default=10.0, alias="WEATHER_AGENT_TIMEOUT")
+    places_agent_timeout: float = Field(default=30.0, alias="PLACES_AGENT_TIMEOUT")
+
+    # Batch queries (/api/tourism/query/batch) and multi-location weather requests
+    batch_max_queries: int = Field(default=50, alias="BATCH_MAX_QUERIES")
+    weather_bulk_max_locations: int = Field(default=100, alias="WEATHER_BULK_MAX_LOCATIONS")  # per Open-Meteo request
+    weather_batch_window_ms: float = Field(default=5.0, alias="WEATHER_BATCH_WINDOW_MS")  # 0 disables micro-batching
+
     # External API URLs
     nominatim_url: str = "https://nominatim.openstreetmap.org/search"
     openmeteo_url: str = "https://api.open-meteo.com/v1/forecast"
     overpass_url: str = "https://overpass-api.de/api/interpreter"
     
-    # Rate limiting
+    # Rate limiting (token bucket per upstream; delay 0 disables limiting)
     nominatim_delay: float = 1.0  # Delay between Nominatim requests (seconds)
-    
+    nominatim_burst: int = 1  # Nominatim policy: absolute maximum of 1 request per second
+    overpass_delay: float = Field(default=0.5, alias="OVERPASS_DELAY")
+    overpass_burst: int = Field(default=2, alias="OVERPASS_BURST")
+
+    # Attraction lookups (Overpass): categories as key=value|value;..., results kept, server-side cap
+    places_categories: str = Field(
+        default="tourism=attraction|museum|viewpoint|theme_park;historic=monument|castle;leisure=park",
+        alias="PLACES_CATEGORIES"
+    )
+    places_max_results: int = Field(default=5, alias="PLACES_MAX_RESULTS")
+    overpass_max_elements: int = Field(default=150, alias="OVERPASS_MAX_ELEMENTS")  # per part: wikidata-tagged, then others
+    poi_index_path: str = Field(default="", alias="POI_INDEX_PATH")  # local index (build_poi_index.py); empty = Overpass only
+
+    # Map pages (/api/tourism/map): 'template' (markers drawn client-side from JSON) or 'folium'
+    map_renderer: str = Field(default="template", alias="MAP_RENDERER")
+    map_shell_max_age: int = Field(default=86400, alias="MAP_SHELL_MAX_AGE")  # seconds browsers/CDNs keep /map
+    # Map renders run off the event loop on a 'thread' or 'process' pool; renders beyond workers + queue get a 503.
+    # Render threads share the GIL with the event loop, so more than one only pays off with processes (spare cores).
+    map_render_executor: str = Field(default="thread", alias="MAP_RENDER_EXECUTOR")
+    map_render_workers: int = Field(default=1, alias="MAP_RENDER_WORKERS")
+    map_render_queue: int = Field(default=16, alias="MAP_RENDER_QUEUE")
+
+    # Response compression: gzip, plus brotli when the 'brotli' package is installed. Complete bodies below
+    # the minimum size are sent as they are; static files with precompressed variants are served from those.
+    compression_enabled: bool = Field(default=True, alias="COMPRESSION_ENABLED")
+    compression_min_size: int = Field(default=1024, alias="COMPRESSION_MIN_SIZE")
+    compression_gzip_level: int = Field(default=6, alias="COMPRESSION_GZIP_LEVEL")
+    compression_brotli_quality: int = Field(default=4, alias="COMPRESSION_BROTLI_QUALITY")
+
+    # In-memory caches (LRU bounded by entry count and approximate bytes)
+    geocoding_cache_max_entries: int = Field(default=10000, alias="GEOCODING_CACHE_MAX_ENTRIES")
+    geocoding_cache_max_bytes: int = Field(default=8 * 1024 * 1024, alias="GEOCODING_CACHE_MAX_BYTES")
+    geocoding_negative_cache_ttl_minutes: float = Field(default=15, alias="GEOCODING_NEGATIVE_CACHE_TTL_MINUTES")
+    geocoding_negative_cache_max_entries: int = Field(default=5000, alias="GEOCODING_NEGATIVE_CACHE_MAX_ENTRIES")
+    places_cache_max_entries: int = Field(default=2000, alias="PLACES_CACHE_MAX_ENTRIES")
+    places_cache_max_bytes: int = Field(default=32 * 1024 * 1024, alias="PLACES_CACHE_MAX_BYTES")
+    places_cache_ttl_minutes: float = Field(default=360, alias="PLACES_CACHE_TTL_MINUTES")
+    weather_cache_max_entries: int = Field(default=5000, alias="WEATHER_CACHE_MAX_ENTRIES")
+    weather_cache_ttl_minutes: float = Field(default=10, alias="WEATHER_CACHE_TTL_MINUTES")
+    parse_cache_max_entries: int = Field(default=2048, alias="PARSE_CACHE_MAX_ENTRIES")  # memoized parse_query results
+    map_cache_max_entries: int = Field(default=500, alias="MAP_CACHE_MAX_ENTRIES")  # rendered /api/tourism/map pages
+    map_cache_max_bytes: int = Field(default=64 * 1024 * 1024, alias="MAP_CACHE_MAX_BYTES")
+    map_cache_ttl_minutes: float = Field(default=60, alias="MAP_CACHE_TTL_MINUTES")
+    cache_grid_cell_km: float = Field(default=1.0, alias="CACHE_GRID_CELL_KM")  # weather/places key cells
+    cache_sweep_interval: float = Field(default=60.0, alias="CACHE_SWEEP_INTERVAL")  # seconds
+
+    # Persistent cache tier (SQLite, shared by worker processes on one host)
+    disk_cache_enabled: bool = Field(default=True, alias="DISK_CACHE_ENABLED")
+    disk_cache_path: str = Field(default=".cache/tourism_cache.sqlite3", alias="DISK_CACHE_PATH")
+    disk_cache_workers: int = Field(default=2, alias="DISK_CACHE_WORKERS")
+
+    # Offline gazetteer (known cities resolve without calling Nominatim).
+    # Exact lookups only: spelling suggestions come from the bundled city
+    # lists, and the fuzzy index behind them is not meant for 100k-name lists
+    # (see app/utils/fuzzy_index.py)
+    gazetteer_enabled: bool = Field(default=True, alias="GAZETTEER_ENABLED")
+    gazetteer_path: str = Field(default="", alias="GAZETTEER_PATH")  # empty = bundled app/data/gazetteer.tsv
+
+    # Outbound HTTP connection pooling (per upstream)
+    nominatim_max_connections: int = Field(default=2, alias="NOMINATIM_MAX_CONNECTIONS")
+    openmeteo_max_connections: int = Field(default=20, alias="OPENMETEO_MAX_CONNECTIONS")
+    overpass_max_connections: int = Field(default=4, alias="OVERPASS_MAX_CONNECTIONS")
+    http_max_keepalive_connections: int = Field(default=10, alias="HTTP_MAX_KEEPALIVE_CONNECTIONS")
+    http_keepalive_expiry: float = Field(default=60.0, alias="HTTP_KEEPALIVE_EXPIRY")  # seconds
+    http2_enabled: bool = Field(default=True, alias="HTTP2_ENABLED")
+
     class Config:
         env_file = ".env"
         case_sensitive = False
@@ -1,15 +1,31 @@
 """FastAPI main application."""
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, HTMLResponse
+from fastapi.responses import FileResponse, JSONResponse, HTMLResponse, Response, StreamingResponse
 from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import json
 
 from app.config import settings
-from app.models import TourismQuery, TourismResponse, ErrorResponse
+from app.models import (
+    TourismQuery, TourismResponse, TourismBatchQuery, TourismBatchResponse, ErrorResponse
+)
 from app.agents.parent_agent import ParentAgent
 from app.utils.logger import setup_logger
-from app.services.map_service import create_enhanced_map_html
+from app.services.map_service import (
+    MAP_SHELL_PATH, bucket_weather, get_map_html, map_fingerprint, map_geojson, render_executor
+)
+from app.services.http_client import http_clients
+from app.services.gazetteer import gazetteer
+from app.services.poi_index import poi_index
+from app.utils.rate_limiter import rate_limiter_stats
+from app.utils.single_flight import single_flight_stats
+from app.utils.micro_batcher import micro_batcher_stats
+from app.utils.bounded_executor import bounded_executor_stats
+from app.utils.compression import CompressionMiddleware, compression_stats, precompressed_variant
+from app.utils.exceptions import ExecutorBusyError
+from app.utils.cache import cache_stats, start_disk_tier, close_disk_tier
 
 logger = setup_logger(__name__)
 
@@ -24,6 +40,13 @@ async def lifespan(app: FastAPI):
     
     # Startup
     logger.info(f"Starting {settings.app_name} v{settings.app_version}")
+    await http_clients.start()
+    logger.info("HTTP client pool initialized")
+    await start_disk_tier()
+    if settings.gazetteer_enabled:
+        gazetteer.load()
+    if settings.poi_index_path:
+        poi_index.load()
     parent_agent = ParentAgent()
     logger.info("Parent agent initialized")
     
@@ -31,6 +54,9 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down application")
+    await http_clients.close()
+    close_disk_tier()
+    render_executor.close()
 
 
 # Create FastAPI app
@@ -50,6 +76,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress responses the client accepts gzip/brotli for (outermost, so CORS headers are kept)
+if settings.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_min_size,
+        gzip_level=settings.compression_gzip_level,
+        brotli_quality=settings.compression_brotli_quality,
+    )
+
 
 @app.get("/")
 async def root():
@@ -60,7 +95,12 @@ async def root():
         "description": "Multi-agent tourism system with interactive maps",
         "endpoints": {
             "query": "/api/tourism/query",
+            "batch": "/api/tourism/query/batch",
+            "stream": "/api/tourism/query/stream",
             "map": "/api/tourism/map",
+            "map_data": "/api/tourism/map/data",
+            "map_shell": "/map",
+            "stats": "/api/stats",
             "health": "/health"
         },
         "features": [
@@ -82,6 +122,22 @@ async def health_check():
     }
 
 
+@app.get("/api/stats")
+async def stats():
+    """Runtime metrics for caches, the gazetteer and POI index, upstream rate limiting, request coalescing/batching, render pools and parsing."""
+    return {
+        "caches": cache_stats(),
+        "gazetteer": gazetteer.stats(),
+        "poi_index": poi_index.stats(),
+        "rate_limiters": rate_limiter_stats(),
+        "single_flight": single_flight_stats(),
+        "micro_batchers": micro_batcher_stats(),
+        "executors": bounded_executor_stats(),
+        "compression": compression_stats(),
+        "parser": parent_agent.text_parser.stage_stats() if parent_agent else {}
+    }
+
+
 @app.post(
     "/api/tourism/query",
     response_model=TourismResponse,
@@ -108,17 +164,7 @@ async def tourism_query(query: TourismQuery) -> TourismResponse:
         # Process query through parent agent
         result = await parent_agent.process(query.query)
         
-        # Extract response data
-        response_data = result.get("data", {})
-        
-        return TourismResponse(
-            success=result.get("success", True),
-            message=response_data.get("text", ""),
-            place_name=response_data.get("place_name"),
-            coordinates=response_data.get("coordinates"),
-            places=response_data.get("places"),
-            weather=response_data.get("weather")
-        )
+        return _to_tourism_response(result)
         
     except Exception as e:
         logger.error(f"Error processing query: {str(e)}")
@@ -129,51 +175,159 @@ async def tourism_query(query: TourismQuery) -> TourismResponse:
 
 
 @app.post(
-    "/api/tourism/map",
-    response_class=HTMLResponse,
+    "/api/tourism/query/stream",
     responses={
-        400: {"model": ErrorResponse, "description": "Bad request"},
-        500: {"model": ErrorResponse, "description": "Internal server error"}
+        200: {"content": {"application/x-ndjson": {}}, "description": "One JSON event per line"}
     }
 )
-async def tourism_map(query: TourismQuery) -> HTMLResponse:
+async def tourism_query_stream(query: TourismQuery) -> StreamingResponse:
     """
-    Generate an interactive map for a tourism query.
+    Process a tourism query, streaming partial results as NDJSON.
     
-    This endpoint processes a query and returns an interactive HTML map
-    with tourist attractions marked.
+    Each line is one JSON object with an "event" field:
+    - "parsed": {location, intent, was_corrected}
+    - "located": {place_name, coordinates}
+    - "weather" / "places": {success, message, ...agent data} as each
+      agent finishes (weather usually arrives long before places)
+    - "done": the same fields as /api/tourism/query
+    - "error": {success: false, message}; ends the stream
     
-    Examples:
-    - "Show me Paris"
-    - "Map of Tokyo attractions"
-    - "Places to visit in London"
+    The first line is sent as soon as the query is parsed, so clients
+    can render progressively instead of waiting on the slowest agent.
+    """
+    logger.info(f"Received streaming query: {query.query}")
     
-    Returns:
-        HTML page with interactive map
+    async def lines() -> AsyncIterator[str]:
+        async for event in parent_agent.process_stream(query.query):
+            yield json.dumps(_stream_event(event), ensure_ascii=False) + "\n"
+    
+    return StreamingResponse(
+        lines(),
+        media_type="application/x-ndjson",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"  # Don't let reverse proxies buffer the stream
+        }
+    )
+
+
+def _stream_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a parent agent stream event into its JSON line payload."""
+    if "result" not in event:
+        return event
+    
+    name = event["event"]
+    result = event["result"]
+    
+    if name in ("done", "error"):
+        return {"event": name, **_to_tourism_response(result).model_dump()}
+    
+    # Child agent response: flatten its data next to a uniform message field
+    data = dict(result.get("data") or {})
+    message = data.pop("text", None) or result.get("error") or ""
+    return {"event": name, "success": result.get("success", False), "message": message, **data}
+
+
+@app.post(
+    "/api/tourism/query/batch",
+    response_model=TourismBatchResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "Bad request"},
+        500: {"model": ErrorResponse, "description": "Internal server error"}
+    }
+)
+async def tourism_query_batch(batch: TourismBatchQuery) -> TourismBatchResponse:
+    """
+    Process several tourism queries in one request (e.g. an itinerary).
+    
+    Repeated locations are geocoded once, weather is fetched with bulk
+    Open-Meteo requests and places are looked up concurrently. Each query
+    gets its own response, in request order; one failing query does not
+    fail the batch.
     """
     try:
-        logger.info(f"Received map request: {query.query}")
+        logger.info(f"Received batch of {len(batch.queries)} queries")
         
-        # Process query through parent agent
-        result = await parent_agent.process(query.query)
+        results = await parent_agent.process_batch([item.query for item in batch.queries])
         
-        if not result.get("success"):
-            raise HTTPException(
-                status_code=400,
-                detail=result.get("data", {}).get("text", "Could not process query")
-            )
+        return TourismBatchResponse(results=[_to_tourism_response(result) for result in results])
         
-        response_data = result.get("data", {})
-        place_name = response_data.get("place_name")
-        coordinates = response_data.get("coordinates")
-        places = response_data.get("places", [])
-        weather = response_data.get("weather")
+    except Exception as e:
+        logger.error(f"Error processing batch: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"An error occurred while processing your queries: {str(e)}"
+        )
+
+
+def _to_tourism_response(result: dict) -> TourismResponse:
+    """Convert a parent agent result into the API response model."""
+    response_data = result.get("data", {})
+    
+    return TourismResponse(
+        success=result.get("success", True),
+        message=response_data.get("text", ""),
+        place_name=response_data.get("place_name"),
+        coordinates=response_data.get("coordinates"),
+        places=response_data.get("places"),
+        weather=response_data.get("weather")
+    )
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if not if_none_match:
+        return False
+    
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag.removeprefix("W/") for tag in tags)
+
+
+async def _resolve_map(
+    query_text: str
+) -> Tuple[str, Dict[str, float], List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Run a map query through the parent agent.
+    
+    Returns:
+        (place_name, coordinates, places, weather)
+    
+    Raises:
+        HTTPException: 400 if the query or its location could not be resolved
+    """
+    result = await parent_agent.process(query_text)
+    
+    if not result.get("success"):
+        raise HTTPException(
+            status_code=400,
+            detail=result.get("data", {}).get("text", "Could not process query")
+        )
+    
+    response_data = result.get("data", {})
+    place_name = response_data.get("place_name")
+    coordinates = response_data.get("coordinates")
+    
+    if not place_name or not coordinates:
+        raise HTTPException(
+            status_code=400,
+            detail="Could not identify location from query"
+        )
+    
+    return place_name, coordinates, response_data.get("places", []), response_data.get("weather")
+
+
+async def _map_response(query_text: str, if_none_match: Optional[str] = None) -> Response:
+    """
+    Build the map page for a query.
+    
+    Pages are cached under a fingerprint of their content (city, places,
+    weather bucket) which doubles as a weak ETag. When if_none_match (only
+    passed for GET) matches it, a 304 is returned without rendering.
+    """
+    try:
+        logger.info(f"Received map request: {query_text}")
         
-        if not place_name or not coordinates:
-            raise HTTPException(
-                status_code=400,
-                detail="Could not identify location from query"
-            )
+        place_name, coordinates, places, weather = await _resolve_map(query_text)
         
         if not places:
             # Return a simple message if no places found
@@ -215,8 +369,15 @@ async def tourism_map(query: TourismQuery) -> HTMLResponse:
             """
             return HTMLResponse(content=html_content)
         
-        # Create the enhanced map
-        map_html = create_enhanced_map_html(
+        # Same city, places and weather bucket as before: reuse the rendered page
+        fingerprint = map_fingerprint(place_name, coordinates['lat'], coordinates['lon'], places, weather)
+        headers = {"ETag": f'W/"{fingerprint}"', "Cache-Control": "no-cache"}
+        
+        if _etag_matches(if_none_match, headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+        
+        map_html = await get_map_html(
+            fingerprint,
             city_name=place_name,
             city_lat=coordinates['lat'],
             city_lon=coordinates['lon'],
@@ -224,10 +385,16 @@ async def tourism_map(query: TourismQuery) -> HTMLResponse:
             weather_info=weather
         )
         
-        return HTMLResponse(content=map_html)
+        return HTMLResponse(content=map_html, headers=headers)
         
     except HTTPException:
         raise
+    except ExecutorBusyError:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many maps are being rendered, please retry shortly",
+            headers={"Retry-After": "1"}
+        )
     except Exception as e:
         logger.error(f"Error generating map: {str(e)}")
         raise HTTPException(
@@ -236,6 +403,123 @@ async def tourism_map(query: TourismQuery) -> HTMLResponse:
         )
 
 
+@app.post(
+    "/api/tourism/map",
+    response_class=HTMLResponse,
+    responses={
+        400: {"model": ErrorResponse, "description": "Bad request"},
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+        503: {"model": ErrorResponse, "description": "Map render pool saturated (see Retry-After)"}
+    }
+)
+async def tourism_map(query: TourismQuery) -> Response:
+    """
+    Generate an interactive map for a tourism query.
+    
+    This endpoint processes a query and returns an interactive HTML map
+    with tourist attractions marked.
+    
+    Examples:
+    - "Show me Paris"
+    - "Map of Tokyo attractions"
+    - "Places to visit in London"
+    
+    Returns:
+        HTML page with interactive map
+    """
+    return await _map_response(query.query)
+
+
+@app.get(
+    "/api/tourism/map",
+    response_class=HTMLResponse,
+    responses={
+        304: {"description": "Not modified (If-None-Match matched the page's ETag)"},
+        400: {"model": ErrorResponse, "description": "Bad request"},
+        500: {"model": ErrorResponse, "description": "Internal server error"},
+        503: {"model": ErrorResponse, "description": "Map render pool saturated (see Retry-After)"}
+    }
+)
+async def tourism_map_page(
+    request: Request,
+    query: str = Query(..., min_length=1, description="User query about a place")
+) -> Response:
+    """
+    Same map as POST /api/tourism/map, as a linkable page.
+    
+    Responses carry an ETag, so browsers revalidate with If-None-Match and
+    get a 304 while the city, its places and the weather bucket are unchanged.
+    """
+    return await _map_response(query, if_none_match=request.headers.get("if-none-match"))
+
+
+@app.get(
+    "/api/tourism/map/data",
+    responses={
+        200: {"content": {"application/geo+json": {}}, "description": "City center and attractions as GeoJSON"},
+        304: {"description": "Not modified (If-None-Match matched the data's ETag)"},
+        400: {"model": ErrorResponse, "description": "Bad request"},
+        500: {"model": ErrorResponse, "description": "Internal server error"}
+    }
+)
+async def tourism_map_data(
+    request: Request,
+    query: str = Query(..., min_length=1, description="User query about a place")
+) -> Response:
+    """
+    Map data for a query as compact GeoJSON, for the map shell at /map.
+    
+    A FeatureCollection with the city center (properties: kind "city",
+    name, weather) followed by the attractions (kind "attraction", name,
+    type) in rank order. Weather is bucketed like on map pages, and the
+    response carries an ETag for If-None-Match revalidation.
+    """
+    try:
+        place_name, coordinates, places, weather = await _resolve_map(query)
+        
+        fingerprint = map_fingerprint(place_name, coordinates['lat'], coordinates['lon'], places, weather)
+        headers = {"ETag": f'"{fingerprint}"', "Cache-Control": "no-cache"}
+        
+        if _etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+        
+        data = map_geojson(place_name, coordinates['lat'], coordinates['lon'], places, bucket_weather(weather))
+        return Response(
+            content=json.dumps(data, ensure_ascii=False, separators=(",", ":")),
+            media_type="application/geo+json",
+            headers=headers
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error building map data: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"An error occurred while building the map data: {str(e)}"
+        )
+
+
+@app.get("/map", response_class=HTMLResponse)
+async def map_shell(request: Request) -> FileResponse:
+    """
+    Static map page that loads /api/tourism/map/data for the place in its URL fragment.
+    
+    Open it as /map#query=Show me Paris (?query= works too). The page is
+    the same for every map, so browsers and CDNs can cache it
+    (MAP_SHELL_MAX_AGE); each map view then only downloads its GeoJSON.
+    Variants written by precompress_static.py are sent as they are to
+    clients accepting their encoding.
+    """
+    headers = {"Cache-Control": f"public, max-age={settings.map_shell_max_age}", "Vary": "Accept-Encoding"}
+    variant = precompressed_variant(MAP_SHELL_PATH, request.headers.get("accept-encoding", ""))
+    if variant:
+        path, encoding = variant
+        return FileResponse(path, media_type="text/html", headers={**headers, "Content-Encoding": encoding})
+    
+    return FileResponse(MAP_SHELL_PATH, media_type="text/html", headers=headers)
+
+
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request, exc):
     """Handle HTTP exceptions."""
@@ -244,7 +528,8 @@ async def http_exception_handler(request, exc):
         content=ErrorResponse(
             error=exc.detail,
             detail=str(exc)
-        ).model_dump()
+        ).model_dump(),
+        headers=exc.headers
     )
 
 
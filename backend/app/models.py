@@ -1,7 +1,8 @@
 """Pydantic models for request/response validation."""
 
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
+from app.config import settings
 
 
 class TourismQuery(BaseModel):
@@ -47,6 +48,25 @@ class TourismResponse(BaseModel):
     )
 
 
+class TourismBatchQuery(BaseModel):
+    """Request model for batch tourism queries (e.g. an itinerary)."""
+    
+    queries: List[TourismQuery] = Field(
+        ...,
+        description="Tourism queries, answered in order",
+        min_length=1,
+        max_length=settings.batch_max_queries
+    )
+
+
+class TourismBatchResponse(BaseModel):
+    """Response model for batch tourism queries."""
+    
+    results: List[TourismResponse] = Field(
+        description="One response per query, in request order"
+    )
+
+
 class ErrorResponse(BaseModel):
     """Response model for errors."""
     
@@ -0,0 +1,130 @@
+"""Offline gazetteer for resolving well-known places without calling Nominatim."""
+
+import os
+import unicodedata
+from typing import Dict, NamedTuple, Optional
+from app.config import settings
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Bundled gazetteer shipped with the app (see build_gazetteer.py)
+DEFAULT_GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "gazetteer.tsv")
+
+
+class GazetteerEntry(NamedTuple):
+    """One place in the gazetteer."""
+    name: str
+    lat: float
+    lon: float
+    country: str
+    population: int
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize a place name for gazetteer lookups.
+
+    Lowercases, strips accents and dots, and collapses whitespace so
+    'São Paulo', 'sao paulo' and 'St. Petersburg'/'St Petersburg' match.
+    """
+    decomposed = unicodedata.normalize("NFKD", name.replace(".", " "))
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(stripped.lower().split())
+
+
+class Gazetteer:
+    """
+    In-memory hash index over a compact tab-separated gazetteer file.
+
+    File columns: name, aliases (';'-separated), lat, lon, country, population.
+    Lines starting with '#' are comments. When two entries share a name or
+    alias, the more populous one wins, which matches what users usually mean.
+    """
+
+    def __init__(self, path: str = DEFAULT_GAZETTEER_PATH):
+        """
+        Initialize the gazetteer (the file is read by load()).
+
+        Args:
+            path: Path to the gazetteer TSV file
+        """
+        self.path = path
+        self._index: Dict[str, GazetteerEntry] = {}
+        self._loaded = False
+        self.logger = setup_logger(__name__)
+        self.hits = 0
+        self.misses = 0
+
+    def load(self) -> int:
+        """
+        Read the gazetteer file and build the name/alias index.
+
+        Returns:
+            Number of places loaded (0 if the file is missing)
+        """
+        index: Dict[str, GazetteerEntry] = {}
+        places = 0
+
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                for line_no, line in enumerate(f, 1):
+                    if not line.strip() or line.startswith("#"):
+                        continue
+
+                    try:
+                        name, aliases, lat, lon, country, population = line.rstrip("\n").split("\t")
+                        entry = GazetteerEntry(name, float(lat), float(lon), country, int(population or 0))
+                    except ValueError:
+                        self.logger.warning(f"Skipping malformed gazetteer line {line_no} in {self.path}")
+                        continue
+
+                    places += 1
+                    for key in [name, *aliases.split(";")]:
+                        key = normalize_name(key)
+                        if key and (key not in index or index[key].population < entry.population):
+                            index[key] = entry
+        except FileNotFoundError:
+            self.logger.warning(f"Gazetteer file not found: {self.path}")
+
+        self._index = index
+        self._loaded = True
+        self.logger.info(f"Gazetteer loaded: {places} places, {len(index)} names")
+        return places
+
+    def lookup(self, name: str) -> Optional[GazetteerEntry]:
+        """
+        Look up a place by name or alias.
+
+        Args:
+            name: Place name as typed (case, accents and spacing are ignored)
+
+        Returns:
+            GazetteerEntry or None if the place is not in the gazetteer
+        """
+        if not self._loaded:
+            self.load()
+
+        entry = self._index.get(normalize_name(name))
+
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+        return entry
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def stats(self) -> Dict[str, int]:
+        """Return index size and hit/miss counts."""
+        return {
+            "names": len(self._index),
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+# Global gazetteer instance
+gazetteer = Gazetteer(settings.gazetteer_path or DEFAULT_GAZETTEER_PATH)
@@ -1,29 +1,52 @@
 """Geocoding service using Nominatim API with spell checking and caching."""
 
-import asyncio
 import httpx
-from typing import Dict, Optional
+from typing import Dict
 from app.config import settings
 from app.utils.logger import setup_logger
 from app.utils.exceptions import PlaceNotFoundError, GeocodingAPIError
 from app.utils.spell_checker import SpellChecker
-from app.utils.cache import geocoding_cache
+from app.utils.cache import geocoding_cache, geocoding_negative_cache
+from app.utils.rate_limiter import nominatim_limiter
+from app.utils.single_flight import SingleFlight
+from app.services.http_client import http_clients
+from app.services.gazetteer import gazetteer
 
 logger = setup_logger(__name__)
 
-# Global variable to track last request time for rate limiting
-_last_request_time: Optional[float] = None
-
 # Initialize spell checker
 spell_checker = SpellChecker()
 
+# Coalesces concurrent lookups of the same place into one Nominatim call
+_geocode_flight = SingleFlight("geocoding")
+
+
+def _lookup_key(place_name: str, auto_correct: bool) -> str:
+    """Key of a lookup for single flight and the not-found cache; spelling correction changes the answer."""
+    return f"{' '.join(place_name.lower().split())}|{auto_correct}"
+
+
+def _gazetteer_lookup(place_name: str):
+    """Return {'lat', 'lon'} for a place in the offline gazetteer, or None."""
+    if not settings.gazetteer_enabled:
+        return None
+    
+    entry = gazetteer.lookup(place_name)
+    if entry is None:
+        return None
+    
+    return {"lat": entry.lat, "lon": entry.lon}
+
 
 async def get_coordinates(place_name: str, auto_correct: bool = True) -> Dict[str, any]:
     """
     Get coordinates for a place using Nominatim geocoding API.
     
-    Implements rate limiting (1 request per second as per Nominatim policy).
-    Includes spell checking and caching for better UX.
+    Well-known places are resolved from the offline gazetteer without any
+    network call. Implements rate limiting (1 request per second as per
+    Nominatim policy). Includes spell checking and caching for better UX.
+    Places that were not found are remembered briefly so repeated lookups
+    fail fast.
     
     Args:
         place_name: Name of the place to geocode
@@ -36,17 +59,35 @@ async def get_coordinates(place_name: str, auto_correct: bool = True) -> Dict[st
         PlaceNotFoundError: If the place cannot be found
         GeocodingAPIError: If the API request fails
     """
-    global _last_request_time
-    
-    original_name = place_name
-    corrected = False
-    
     # Check cache first
-    cached_result = geocoding_cache.get(place_name)
+    cached_result = await geocoding_cache.aget(place_name)
     if cached_result:
         logger.info(f"Using cached coordinates for: {place_name}")
         return cached_result
     
+    # Known cities resolve offline in microseconds
+    gazetteer_result = _gazetteer_lookup(place_name)
+    if gazetteer_result:
+        logger.info(f"Resolved {place_name} from gazetteer")
+        return gazetteer_result
+    
+    # Known misses fail fast without spending Nominatim budget
+    key = _lookup_key(place_name, auto_correct)
+    negative_result = geocoding_negative_cache.get(key)
+    if negative_result:
+        logger.info(f"Using cached not-found result for: {place_name}")
+        raise PlaceNotFoundError(negative_result["detail"], suggestions=negative_result["suggestions"])
+    
+    # Concurrent identical lookups share one upstream request
+    result = await _geocode_flight.do(key, lambda: _geocode(place_name, auto_correct))
+    return dict(result)
+
+
+async def _geocode(place_name: str, auto_correct: bool) -> Dict[str, any]:
+    """Resolve a cache miss: spell correction, gazetteer, then a rate-limited Nominatim request."""
+    original_name = place_name
+    corrected = False
+    
     # Try spell correction if enabled
     if auto_correct:
         corrected_name, was_corrected = spell_checker.check_and_correct(place_name)
@@ -56,16 +97,14 @@ async def get_coordinates(place_name: str, auto_correct: bool = True) -> Dict[st
             logger.info(f"Auto-corrected '{original_name}' to '{place_name}'")
             
             # Check cache with corrected name
-            cached_result = geocoding_cache.get(place_name)
+            cached_result = await geocoding_cache.aget(place_name)
             if cached_result:
-                cached_result["corrected_from"] = original_name
-                return cached_result
-    
-    # Rate limiting: ensure at least 1 second between requests
-    if _last_request_time is not None:
-        elapsed = asyncio.get_event_loop().time() - _last_request_time
-        if elapsed < settings.nominatim_delay:
-            await asyncio.sleep(settings.nominatim_delay - elapsed)
+                return {**cached_result, "corrected_from": original_name}
+            
+            gazetteer_result = _gazetteer_lookup(place_name)
+            if gazetteer_result:
+                logger.info(f"Resolved {place_name} from gazetteer")
+                return {**gazetteer_result, "corrected_from": original_name}
     
     params = {
         "q": place_name,
@@ -79,51 +118,50 @@ async def get_coordinates(place_name: str, auto_correct: bool = True) -> Dict[st
     }
     
     try:
+        # Rate limiting: queue fairly for the Nominatim budget (1 request per second)
+        await nominatim_limiter.acquire()
+        
         logger.info(f"Geocoding place: {place_name}")
-        async with httpx.AsyncClient(timeout=settings.api_timeout) as client:
-            response = await client.get(
-                settings.nominatim_url,
-                params=params,
-                headers=headers
-            )
-            response.raise_for_status()
-            
-            # Update last request time
-            _last_request_time = asyncio.get_event_loop().time()
-            
-            data = response.json()
-            
-            if not data or len(data) == 0:
-                # If corrected name didn't work, try suggestions
-                if corrected:
-                    suggestions = spell_checker.suggest_correction(original_name, max_suggestions=3)
-                    suggestion_text = f"Did you mean: {', '.join(suggestions)}?" if suggestions else ""
-                    raise PlaceNotFoundError(f"{original_name}. {suggestion_text}")
-                else:
-                    # Try spell correction as fallback
-                    suggestions = spell_checker.suggest_correction(place_name, max_suggestions=3)
-                    if suggestions:
-                        suggestion_text = f"Did you mean: {', '.join(suggestions)}?"
-                        raise PlaceNotFoundError(f"{place_name}. {suggestion_text}")
-                    else:
-                        raise PlaceNotFoundError(place_name)
-            
-            result = {
-                "lat": float(data[0]["lat"]),
-                "lon": float(data[0]["lon"])
-            }
+        client = http_clients.get("nominatim")
+        response = await client.get(
+            settings.nominatim_url,
+            params=params,
+            headers=headers
+        )
+        response.raise_for_status()
+        
+        data = response.json()
+        
+        if not data or len(data) == 0:
+            # If corrected name didn't work, suggest against the original spelling
+            lookup_name = original_name if corrected else place_name
+            suggestions = spell_checker.suggest_correction(lookup_name, max_suggestions=3)
+            detail = f"{lookup_name}. Did you mean: {', '.join(suggestions)}?" if suggestions else lookup_name
             
+            # Remember the miss so repeats skip the spell checker and the rate limiter
+            negative_result = {"detail": detail, "suggestions": suggestions}
+            geocoding_negative_cache.set(_lookup_key(original_name, auto_correct), negative_result)
             if corrected:
-                result["corrected_from"] = original_name
-            
-            # Cache the result
-            geocoding_cache.set(place_name, result)
-            if corrected:
-                geocoding_cache.set(original_name, result)  # Also cache with original name
-            
-            logger.info(f"Found coordinates for {place_name}: {result}")
-            return result
+                geocoding_negative_cache.set(_lookup_key(place_name, auto_correct), negative_result)
             
+            raise PlaceNotFoundError(detail, suggestions=suggestions)
+        
+        result = {
+            "lat": float(data[0]["lat"]),
+            "lon": float(data[0]["lon"])
+        }
+        
+        if corrected:
+            result["corrected_from"] = original_name
+        
+        # Cache the result
+        await geocoding_cache.aset(place_name, result)
+        if corrected:
+            await geocoding_cache.aset(original_name, result)  # Also cache with original name
+        
+        logger.info(f"Found coordinates for {place_name}: {result}")
+        return result
+        
     except httpx.HTTPError as e:
         logger.error(f"Geocoding API error for {place_name}: {str(e)}")
         raise GeocodingAPIError(f"Failed to geocode {place_name}: {str(e)}")
@@ -0,0 +1,112 @@
+"""Shared, connection-pooled HTTP clients for outbound API calls."""
+
+import importlib.util
+import httpx
+from typing import Dict
+from app.config import settings
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# HTTP/2 needs the optional 'h2' package (pip install httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class HTTPClientRegistry:
+    """
+    Registry of long-lived httpx.AsyncClient instances, one per upstream.
+
+    Reusing a client keeps TCP/TLS connections alive between requests, so
+    only the first call to an upstream pays the handshake cost. Clients are
+    created in the application lifespan and closed on shutdown; scripts that
+    call the services directly get a client created lazily on first use.
+    """
+
+    def __init__(self):
+        """Initialize an empty client registry."""
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self.logger = setup_logger(__name__)
+
+    def _max_connections(self, upstream: str) -> int:
+        """Return the connection pool size for an upstream."""
+        pool_sizes = {
+            "nominatim": settings.nominatim_max_connections,
+            "openmeteo": settings.openmeteo_max_connections,
+            "overpass": settings.overpass_max_connections
+        }
+
+        if upstream not in pool_sizes:
+            raise KeyError(f"Unknown upstream: {upstream}")
+
+        return pool_sizes[upstream]
+
+    def _create_client(self, upstream: str) -> httpx.AsyncClient:
+        """Create a pooled client for an upstream."""
+        max_connections = self._max_connections(upstream)
+
+        # HTTP/2 is negotiated via ALPN, so servers without it fall back to HTTP/1.1
+        http2 = settings.http2_enabled and HTTP2_AVAILABLE
+
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=min(max_connections, settings.http_max_keepalive_connections),
+            keepalive_expiry=settings.http_keepalive_expiry
+        )
+
+        self.logger.info(
+            f"Creating HTTP client for {upstream} "
+            f"(max_connections={max_connections}, http2={http2})"
+        )
+
+        return httpx.AsyncClient(
+            timeout=settings.api_timeout,
+            limits=limits,
+            http2=http2,
+            headers={"User-Agent": f"{settings.app_name}/{settings.app_version}"}
+        )
+
+    async def start(self) -> None:
+        """Create clients for all known upstreams."""
+        for upstream in ("nominatim", "openmeteo", "overpass"):
+            if upstream not in self._clients:
+                self._clients[upstream] = self._create_client(upstream)
+
+    def get(self, upstream: str) -> httpx.AsyncClient:
+        """
+        Get the shared client for an upstream.
+
+        Args:
+            upstream: Upstream name ('nominatim', 'openmeteo' or 'overpass')
+
+        Returns:
+            Pooled httpx.AsyncClient
+        """
+        client = self._clients.get(upstream)
+
+        if client is None or client.is_closed:
+            client = self._create_client(upstream)
+            self._clients[upstream] = client
+
+        return client
+
+    def register(self, upstream: str, client: httpx.AsyncClient) -> None:
+        """
+        Replace the client for an upstream (e.g. with a stub transport in tests).
+
+        Args:
+            upstream: Upstream name
+            client: Client to use for this upstream
+        """
+        self._clients[upstream] = client
+
+    async def close(self) -> None:
+        """Close all clients and release their connections."""
+        for upstream, client in self._clients.items():
+            await client.aclose()
+            self.logger.info(f"Closed HTTP client for {upstream}")
+
+        self._clients.clear()
+
+
+# Global client registry
+http_clients = HTTPClientRegistry()
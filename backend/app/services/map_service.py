@@ -1,12 +1,38 @@
-"""Map visualization service using Folium."""
+"""Map visualization service (map data, and pages drawn client-side from it or with Folium)."""
 
 import folium
+import hashlib
+import html
+import json
+import os
 from folium import plugins
 from typing import List, Dict, Optional
+from app.config import settings
+from app.utils.bounded_executor import BoundedExecutor
+from app.utils.cache import map_cache
 from app.utils.logger import setup_logger
+from app.utils.single_flight import SingleFlight
 
 logger = setup_logger(__name__)
 
+# Renders are CPU-bound, so they run on a bounded pool instead of the event loop
+render_executor = BoundedExecutor(
+    "map_render",
+    kind=settings.map_render_executor,
+    max_workers=settings.map_render_workers,
+    max_queue=settings.map_render_queue
+)
+_map_flight = SingleFlight("map")
+
+# Static map shell (served as /map, fetches its data). Full pages are the shell with the data filled in;
+# it is split once at import around the title and the empty data element.
+MAP_SHELL_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "static", "map.html")
+_SHELL_TITLE = "<title>Tourist Map</title>"
+_SHELL_DATA = '<script type="application/json" id="map-data"></script>'
+with open(MAP_SHELL_PATH, encoding="utf-8") as _shell_file:
+    _PAGE_START, _rest = _shell_file.read().split(_SHELL_TITLE)
+    _PAGE_MIDDLE, _PAGE_END = _rest.split(_SHELL_DATA)
+
 
 def create_city_map(
     city_name: str,
@@ -473,3 +499,199 @@ def create_enhanced_map_html(
     """
     
     return complete_html
+
+
+def _script_json(value) -> str:
+    """JSON that can be embedded in a <script> element as is."""
+    text = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    return text.replace("<", "\\u003c").replace(">", "\\u003e").replace("&", "\\u0026")
+
+
+def map_geojson(
+    city_name: str,
+    city_lat: float,
+    city_lon: float,
+    places: List[Dict],
+    weather_info: Optional[Dict] = None
+) -> Dict:
+    """
+    Map data as a GeoJSON FeatureCollection.
+    
+    The first feature is the city center (kind "city", with name and
+    weather), followed by one point per place (kind "attraction", with name
+    and type) in list order. Coordinates are rounded to 6 decimals (~10 cm).
+    
+    Args:
+        city_name: Name of the city
+        city_lat: City center latitude
+        city_lon: City center longitude
+        places: List of places with name, lat, lon, type
+        weather_info: Optional weather information
+    
+    Returns:
+        GeoJSON dict
+    """
+    weather = None
+    if weather_info:
+        weather = {"temp": weather_info.get("temp"), "precipitation": weather_info.get("precipitation")}
+    
+    features = [{
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [round(city_lon, 6), round(city_lat, 6)]},
+        "properties": {"kind": "city", "name": city_name, "weather": weather}
+    }]
+    for place in places:
+        features.append({
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [round(place["lon"], 6), round(place["lat"], 6)]},
+            "properties": {"kind": "attraction", "name": place["name"], "type": place.get("type", "attraction")}
+        })
+    
+    return {"type": "FeatureCollection", "features": features}
+
+
+def create_map_page_html(
+    city_name: str,
+    city_lat: float,
+    city_lon: float,
+    places: List[Dict],
+    weather_info: Optional[Dict] = None
+) -> str:
+    """
+    Create the complete map page: the static map shell with its data embedded.
+    
+    Looks like create_enhanced_map_html, but instead of building a Folium
+    object per marker, popup, icon and line, the map_geojson() data is
+    embedded once and the page draws markers, lines and the sidebar list
+    with Leaflet in the browser. Rendering is a few string joins.
+    
+    Args:
+        city_name: Name of the city
+        city_lat: City center latitude
+        city_lon: City center longitude
+        places: List of places with name, lat, lon, type
+        weather_info: Optional weather information
+    
+    Returns:
+        Complete HTML page as string
+    """
+    data = _script_json(map_geojson(city_name, city_lat, city_lon, places, weather_info))
+    
+    return "".join((
+        _PAGE_START,
+        f"<title>{html.escape(city_name)} - Tourist Map</title>",
+        _PAGE_MIDDLE,
+        f'<script type="application/json" id="map-data">{data}</script>',
+        _PAGE_END
+    ))
+
+
+def render_map_page(
+    city_name: str,
+    city_lat: float,
+    city_lon: float,
+    places: List[Dict],
+    weather_info: Optional[Dict] = None
+) -> str:
+    """Render a map page with the configured renderer (MAP_RENDERER)."""
+    if settings.map_renderer == "folium":
+        return create_enhanced_map_html(city_name, city_lat, city_lon, places, weather_info)
+    
+    return create_map_page_html(city_name, city_lat, city_lon, places, weather_info)
+
+
+def bucket_weather(weather_info: Optional[Dict]) -> Optional[Dict]:
+    """
+    Round weather to the precision map pages show.
+    
+    Whole degrees and 10% rain-chance steps, so small changes between
+    weather refreshes still hit the map cache.
+    
+    Args:
+        weather_info: Weather dict with temp and precipitation (or None)
+    
+    Returns:
+        Rounded copy, or None
+    """
+    if not weather_info:
+        return None
+    
+    temp = weather_info.get("temp")
+    precipitation = weather_info.get("precipitation")
+    return {
+        "temp": round(temp) if isinstance(temp, (int, float)) else temp,
+        "precipitation": int(round(precipitation / 10) * 10) if isinstance(precipitation, (int, float)) else precipitation
+    }
+
+
+def map_fingerprint(
+    city_name: str,
+    city_lat: float,
+    city_lon: float,
+    places: List[Dict],
+    weather_info: Optional[Dict] = None
+) -> str:
+    """
+    Stable hash of everything a map page depends on.
+    
+    Covers the city, its coordinates, the places (name, position, type, in
+    order), the weather bucket, the app version and the renderer (pages
+    change between releases and renderers).
+    
+    Returns:
+        Hex digest, usable as a cache key and ETag
+    """
+    payload = json.dumps([
+        settings.app_version,
+        settings.map_renderer,
+        city_name,
+        round(city_lat, 5),
+        round(city_lon, 5),
+        [[place["name"], round(place["lat"], 5), round(place["lon"], 5), place.get("type", "attraction")]
+         for place in places],
+        bucket_weather(weather_info)
+    ], ensure_ascii=False, separators=(",", ":"))
+    
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:32]
+
+
+async def get_map_html(
+    fingerprint: str,
+    city_name: str,
+    city_lat: float,
+    city_lon: float,
+    places: List[Dict],
+    weather_info: Optional[Dict] = None
+) -> str:
+    """
+    Return the map page for a fingerprint, rendering it only on a cache miss.
+    
+    Misses render on render_executor; concurrent misses for the same
+    fingerprint share one render.
+    
+    Args:
+        fingerprint: map_fingerprint() of the other arguments
+        city_name: Name of the city
+        city_lat: City center latitude
+        city_lon: City center longitude
+        places: List of places with name, lat, lon, type
+        weather_info: Optional weather information (shown bucketed)
+    
+    Returns:
+        Complete HTML page as string
+    
+    Raises:
+        ExecutorBusyError: If the render pool is saturated
+    """
+    page = map_cache.get(fingerprint)
+    if page is not None:
+        return page
+    
+    async def render() -> str:
+        rendered = await render_executor.run(
+            render_map_page, city_name, city_lat, city_lon, places, bucket_weather(weather_info)
+        )
+        map_cache.set(fingerprint, rendered)
+        return rendered
+    
+    return await _map_flight.do(fingerprint, render)
@@ -0,0 +1,102 @@
+"""Overpass QL query building for tourist attraction lookups."""
+
+import re
+from typing import Dict, Tuple
+
+# Tag keys/values allowed in a category spec; none are special in Overpass regexes or strings
+_TOKEN = re.compile(r"^[A-Za-z0-9_:\-]+$")
+
+
+def parse_categories(spec: str) -> Dict[str, Tuple[str, ...]]:
+    """
+    Parse a category spec into OSM tag keys and their accepted values.
+
+    Args:
+        spec: e.g. "tourism=attraction|museum;leisure=park"
+
+    Returns:
+        Ordered mapping of tag key to values, e.g. {"tourism": ("attraction", "museum"), ...}
+
+    Raises:
+        ValueError: If the spec is empty or malformed
+    """
+    categories: Dict[str, Tuple[str, ...]] = {}
+
+    for part in filter(None, (part.strip() for part in spec.split(";"))):
+        key, sep, values = part.partition("=")
+        key = key.strip()
+        values = tuple(value.strip() for value in values.split("|") if value.strip())
+
+        if not sep or not values or not _TOKEN.match(key) or not all(_TOKEN.match(value) for value in values):
+            raise ValueError(f"Invalid place category '{part}' (expected key=value|value)")
+
+        categories[key] = categories.get(key, ()) + tuple(v for v in values if v not in categories.get(key, ()))
+
+    if not categories:
+        raise ValueError("No place categories configured")
+
+    return categories
+
+
+def _value_filter(key: str, values: Tuple[str, ...]) -> str:
+    """Tag filter for one key: exact match for one value, an anchored alternation for several."""
+    if len(values) == 1:
+        return f'["{key}"="{values[0]}"]'
+
+    alternation = "|".join(values)
+    return f'["{key}"~"^({alternation})$"]'
+
+
+def build_attractions_query(
+    lat: float,
+    lon: float,
+    radius: int,
+    categories: Dict[str, Tuple[str, ...]],
+    max_elements: int,
+    timeout: int = 25
+) -> str:
+    """
+    Build the Overpass QL query for named attractions around a point.
+
+    There is one `nwr` clause per tag key with a regex over its values
+    (instead of one node/way clause per key/value pair), and unnamed
+    elements are dropped server-side. Overpass truncates capped output in
+    id order, which says nothing about relevance, so the output comes in
+    two capped parts: first the elements with a `wikidata` tag (the
+    strongest signal in place_ranking.score_attraction), then the others.
+    In a dense city the cap therefore drops the least notable elements
+    rather than those with the highest ids. Each part holds at most
+    `max_elements`, so a response has at most twice that.
+    Output stays in id order rather than quadtile order ('qt'): a capped
+    qt output is one spatial corner of the search area, which would skew
+    the distance ranking in place_ranking.
+
+    Args:
+        lat: Latitude
+        lon: Longitude
+        radius: Search radius in metres
+        categories: Tag keys and accepted values (see parse_categories)
+        max_elements: Maximum number of elements per output part
+        timeout: Overpass server-side timeout in seconds
+
+    Returns:
+        Overpass QL query text
+    """
+    around = f"(around:{int(radius)},{lat:.6f},{lon:.6f})"
+
+    def union(extra: str) -> str:
+        return "\n".join(
+            f'  nwr{_value_filter(key, values)}["name"]{extra}{around};'
+            for key, values in categories.items()
+        )
+
+    notable = union('["wikidata"]')
+    cap = int(max_elements)
+    return (
+        f"[out:json][timeout:{int(timeout)}];\n"
+        f"(\n{notable}\n)->.notable;\n"
+        f".notable out tags center {cap};\n"
+        f"(\n{union('')}\n)->.named;\n"
+        f"(.named; - .notable;);\n"
+        f"out tags center {cap};"
+    )
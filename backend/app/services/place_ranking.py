@@ -0,0 +1,116 @@
+"""Scoring and top-k selection of attraction candidates."""
+
+import heapq
+from itertools import count
+from typing import Any, Dict, List
+
+# Relative interest of each attraction type (unknown types get DEFAULT_TYPE_WEIGHT)
+TYPE_WEIGHTS = {
+    "attraction": 3.0,
+    "museum": 3.0,
+    "castle": 3.0,
+    "theme_park": 2.5,
+    "monument": 2.0,
+    "viewpoint": 2.0,
+    "park": 1.5,
+}
+DEFAULT_TYPE_WEIGHT = 1.0
+
+# Places notable enough for Wikidata/Wikipedia are usually worth a visit
+WIKIDATA_WEIGHT = 3.0
+WIKIPEDIA_WEIGHT = 2.0
+
+# Full bonus at the center, none at the edge of the search radius
+DISTANCE_WEIGHT = 3.0
+
+
+def score_attraction(tags: Dict[str, str], place_type: str, distance_km: float, radius_km: float) -> float:
+    """
+    Score an attraction candidate; higher is better.
+
+    Args:
+        tags: OSM element tags
+        place_type: Attraction type (e.g. 'museum')
+        distance_km: Distance from the search center
+        radius_km: Search radius
+
+    Returns:
+        Score (type weight + notability bonuses + closeness bonus)
+    """
+    score = TYPE_WEIGHTS.get(place_type, DEFAULT_TYPE_WEIGHT)
+
+    if tags.get("wikidata"):
+        score += WIKIDATA_WEIGHT
+    if tags.get("wikipedia") or any(key.startswith("wikipedia:") for key in tags):
+        score += WIKIPEDIA_WEIGHT
+
+    if radius_km > 0:
+        score += DISTANCE_WEIGHT * max(0.0, 1.0 - distance_km / radius_km)
+
+    return score
+
+
+class TopK:
+    """
+    Keeps the k highest-scoring items seen so far, at most one per name.
+
+    Items are pushed one at a time (e.g. while iterating a response), so
+    memory stays O(k) however many candidates there are. Ties go to the
+    item pushed first.
+    """
+
+    def __init__(self, k: int):
+        """
+        Initialize the selector.
+
+        Args:
+            k: Number of items to keep
+        """
+        self.k = k
+        self._heap: List[list] = []  # min-heap of [score, -seq, name, item]
+        self._by_name: Dict[str, list] = {}
+        self._seq = count()
+
+    def push(self, score: float, name: str, item: Any) -> bool:
+        """
+        Offer an item.
+
+        Args:
+            score: Item score
+            name: Deduplication key
+            item: The item itself
+
+        Returns:
+            True if the item is now among the top k
+        """
+        if self.k <= 0:
+            return False
+
+        entry = [score, -next(self._seq), name, item]
+        existing = self._by_name.get(name)
+
+        if existing is not None:
+            # Same name already kept: keep whichever scores higher
+            if entry[:2] <= existing[:2]:
+                return False
+            existing[:] = [score, existing[1], name, item]
+            heapq.heapify(self._heap)
+            return True
+
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        elif entry[:2] > self._heap[0][:2]:
+            evicted = heapq.heapreplace(self._heap, entry)
+            del self._by_name[evicted[2]]
+        else:
+            return False
+
+        self._by_name[name] = entry
+        return True
+
+    def items(self) -> List[Any]:
+        """Kept items, best first."""
+        return [entry[3] for entry in sorted(self._heap, key=lambda entry: entry[:2], reverse=True)]
+
+    def __len__(self) -> int:
+        return len(self._heap)
@@ -1,13 +1,39 @@
 """Places service using Overpass API."""
 
+import asyncio
 import httpx
-from typing import List, Dict
+import zlib
+from contextlib import aclosing
+from typing import List, Dict, Optional, Tuple
 from app.config import settings
 from app.utils.logger import setup_logger
 from app.utils.exceptions import PlacesAPIError
+from app.utils.rate_limiter import overpass_limiter
+from app.utils.cache import places_cache
+from app.utils.geo import distance_km
+from app.utils.json_stream import iter_array_items
+from app.utils.single_flight import SingleFlight
+from app.services.http_client import http_clients
+from app.services.overpass_query import build_attractions_query, parse_categories
+from app.services.place_ranking import TYPE_WEIGHTS, TopK, score_attraction
+from app.services.poi_index import poi_index
 
 logger = setup_logger(__name__)
 
+# OSM tag keys and values counted as attractions (PLACES_CATEGORIES)
+PLACE_CATEGORIES = parse_categories(settings.places_categories)
+
+# The same categories as 'key=value' strings, for local POI index lookups
+_CATEGORY_NAMES = {f"{key}={value}" for key, values in PLACE_CATEGORIES.items() for value in values}
+
+# Part of the cache key, so changing the categories, result count or ranking doesn't serve old entries
+_RESULT_SIGNATURE = format(zlib.crc32(
+    f"{sorted(PLACE_CATEGORIES.items())}:{settings.places_max_results}:{sorted(TYPE_WEIGHTS.items())}".encode()
+), "08x")
+
+# Coalesces concurrent lookups for the same grid cell and radius
+_places_flight = SingleFlight("places")
+
 
 def _is_english_text(text: str) -> bool:
     """
@@ -69,6 +95,47 @@ def _get_english_name(tags: Dict) -> str:
     return None
 
 
+def _candidate(element: Dict, lat: float, lon: float, radius_km: float) -> Optional[Tuple[float, str, Dict]]:
+    """
+    Turn an Overpass element into a scored attraction candidate.
+    
+    Args:
+        element: Overpass JSON element (node with lat/lon, way/relation with center)
+        lat: Search center latitude
+        lon: Search center longitude
+        radius_km: Search radius in kilometres
+    
+    Returns:
+        (score, name, place) or None if the element has no English name or no coordinates
+    """
+    tags = element.get("tags", {})
+    
+    # Get English name
+    name = _get_english_name(tags)
+    if not name:
+        return None
+    
+    # Filter out names with non-Latin scripts (Arabic, Chinese, etc.)
+    if not _is_english_text(name):
+        logger.debug(f"Filtered non-Latin name: {name}")
+        return None
+    
+    # Extract coordinates (for ways, the center)
+    place_lat = element.get("lat")
+    place_lon = element.get("lon")
+    if not place_lat and "center" in element:
+        place_lat = element["center"].get("lat")
+        place_lon = element["center"].get("lon")
+    
+    if not (place_lat and place_lon):
+        logger.debug(f"Skipped place without coordinates: {name}")
+        return None
+    
+    place_type = next((tags[key] for key in PLACE_CATEGORIES if key in tags), "attraction")
+    score = score_attraction(tags, place_type, distance_km(lat, lon, place_lat, place_lon), radius_km)
+    return score, name, {"name": name, "lat": place_lat, "lon": place_lon, "type": place_type}
+
+
 async def get_tourist_attractions(lat: float, lon: float, radius: int = 10000) -> List[Dict]:
     """
     Get tourist attractions near coordinates using Overpass API.
@@ -80,91 +147,92 @@ async def get_tourist_attractions(lat: float, lon: float, radius: int = 10000) -
         radius: Search radius in meters (default: 10km)
     
     Returns:
-        List of up to 5 tourist attractions with name, lat, lon
+        List of up to settings.places_max_results (default 5) tourist attractions with name, lat, lon,
+        best first (see place_ranking.score_attraction)
     
     Raises:
         PlacesAPIError: If the API request fails
     """
-    # Overpass QL query to find tourist attractions
-    # Request all name tags to get English names
-    query = f"""
-    [out:json][timeout:25];
-    (
-      node["tourism"="attraction"](around:{radius},{lat},{lon});
-      node["tourism"="museum"](around:{radius},{lat},{lon});
-      node["tourism"="viewpoint"](around:{radius},{lat},{lon});
-      node["tourism"="theme_park"](around:{radius},{lat},{lon});
-      node["historic"="monument"](around:{radius},{lat},{lon});
-      node["historic"="castle"](around:{radius},{lat},{lon});
-      node["leisure"="park"](around:{radius},{lat},{lon});
-      way["tourism"="attraction"](around:{radius},{lat},{lon});
-      way["tourism"="museum"](around:{radius},{lat},{lon});
-      way["leisure"="park"](around:{radius},{lat},{lon});
-      way["historic"="monument"](around:{radius},{lat},{lon});
-    );
-    out tags center;
-    """
+    # Nearby coordinates (same grid cell) share cache entries and in-flight requests
+    suffix = f"{radius}:{_RESULT_SIGNATURE}"
+    cached_places = await places_cache.aget(lat, lon, suffix=suffix)
+    if cached_places is not None:
+        logger.info(f"Using cached attractions near ({lat}, {lon})")
+        return list(cached_places)
+    
+    key = places_cache.key(lat, lon, suffix=suffix)
+    places = await _places_flight.do(key, lambda: _fetch_attractions(lat, lon, radius, suffix))
+    return list(places)
+
+
+def _local_attractions(lat: float, lon: float, radius: int) -> List[Dict]:
+    """Rank attractions from the local POI index (the caller checks coverage)."""
+    top = TopK(settings.places_max_results)
+    
+    for element in poi_index.query(lat, lon, radius, categories=_CATEGORY_NAMES):
+        candidate = _candidate(element, lat, lon, radius / 1000)
+        if candidate is not None:
+            top.push(*candidate)
+    
+    return top.items()
+
+
+async def _fetch_attractions(lat: float, lon: float, radius: int, suffix: str) -> List[Dict]:
+    """Look up attractions around a point (local POI index or Overpass) and cache them for the grid cell."""
+    # Areas covered by the local POI index never need Overpass. A wide radius in a dense
+    # index scans and scores thousands of POIs, so that runs off the event loop.
+    if settings.poi_index_path and poi_index.covers(lat, lon, radius):
+        places = await asyncio.to_thread(_local_attractions, lat, lon, radius)
+        logger.info(f"Found {len(places)} tourist attractions near ({lat}, {lon}) in the local POI index")
+        await places_cache.aset(lat, lon, places, suffix=suffix)
+        return places
+    
+    # Named elements in the configured categories, notable (wikidata) ones first, each part capped server-side
+    query = build_attractions_query(
+        lat, lon, radius,
+        categories=PLACE_CATEGORIES,
+        max_elements=settings.overpass_max_elements
+    )
     
     try:
+        await overpass_limiter.acquire()
+        
         logger.info(f"Fetching tourist attractions near ({lat}, {lon})")
-        async with httpx.AsyncClient(timeout=settings.api_timeout) as client:
-            response = await client.post(
-                settings.overpass_url,
-                data={"data": query}
-            )
+        client = http_clients.get("overpass")
+        
+        # Elements are parsed as they arrive. Reading stops past the element cap if the
+        # server ignores it (the rest of the body is never downloaded); a server that
+        # honours it sends a complete body, so the connection goes back to the pool.
+        top = TopK(settings.places_max_results)
+        radius_km = radius / 1000
+        received = 0
+        
+        async with client.stream("POST", settings.overpass_url, data={"data": query}) as response:
             response.raise_for_status()
             
-            data = response.json()
-            elements = data.get("elements", [])
-            
-            # Extract English place names with coordinates
-            places = []
-            seen_names = set()  # To avoid duplicates
-            
-            for element in elements:
-                tags = element.get("tags", {})
-                
-                # Get English name
-                name = _get_english_name(tags)
-                
-                if name and name not in seen_names:
-                    # Filter out names with non-Latin scripts (Arabic, Chinese, etc.)
-                    if _is_english_text(name):
-                        # Extract coordinates
-                        place_lat = element.get("lat")
-                        place_lon = element.get("lon")
-                        
-                        # For ways, get center coordinates
-                        if not place_lat and "center" in element:
-                            place_lat = element["center"].get("lat")
-                            place_lon = element["center"].get("lon")
-                        
-                        if place_lat and place_lon:
-                            place_info = {
-                                "name": name,
-                                "lat": place_lat,
-                                "lon": place_lon,
-                                "type": tags.get("tourism", tags.get("historic", tags.get("leisure", "attraction")))
-                            }
-                            places.append(place_info)
-                            seen_names.add(name)
-                            logger.debug(f"Added place: {name} at ({place_lat}, {place_lon})")
-                        else:
-                            logger.debug(f"Skipped place without coordinates: {name}")
-                    else:
-                        logger.debug(f"Filtered non-Latin name: {name}")
-                    
-                    # Limit to 5 places
-                    if len(places) >= 5:
+            async with aclosing(iter_array_items(response.aiter_bytes(), "elements")) as elements:
+                async for element in elements:
+                    received += 1
+                    if received > 2 * settings.overpass_max_elements:
+                        logger.warning(f"Overpass returned more than 2 x {settings.overpass_max_elements} elements; ignoring the rest")
                         break
-            
-            if places:
-                logger.info(f"Found {len(places)} tourist attractions with Latin names")
-            else:
-                logger.warning(f"No tourist attractions found near ({lat}, {lon})")
-            
-            return places
-            
+                    
+                    candidate = _candidate(element, lat, lon, radius_km)
+                    if candidate is not None:
+                        top.push(*candidate)
+        
+        # Best-scoring English-named places (one per name), best first
+        places = top.items()
+        
+        if places:
+            logger.info(f"Found {len(places)} tourist attractions with Latin names")
+        else:
+            logger.warning(f"No tourist attractions found near ({lat}, {lon})")
+        
+        await places_cache.aset(lat, lon, places, suffix=suffix)
+        
+        return places
+        
     except httpx.HTTPError as e:
         logger.error(f"Places API error: {str(e)}")
         raise PlacesAPIError(f"Failed to fetch tourist attractions: {str(e)}")
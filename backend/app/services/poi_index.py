@@ -0,0 +1,298 @@
+"""Local spatial index of attractions, so covered areas don't need the Overpass API."""
+
+import json
+import math
+import sys
+from array import array
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+from app.config import settings
+from app.utils.geo import KM_PER_DEGREE, distance_km
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+MAGIC = b"POIX1\n"
+
+# Coordinates are stored as integers in units of 1e-7 degrees (about 1 cm)
+SCALE = 10_000_000
+
+# Tags kept per POI: the name variants and everything else the places service reads besides the category
+NAME_TAGS = ("name", "name:en", "int_name", "official_name")
+KEPT_TAGS = NAME_TAGS + ("wikidata", "wikipedia")
+
+# Separates 'key=value' pairs in the tags blob (never part of OSM tag text)
+_SEP = "\x1f"
+
+
+class PoiRecord(NamedTuple):
+    """One POI as written by the ingest (see build_poi_index.py)."""
+    lat: float
+    lon: float
+    category: str  # 'key=value', e.g. 'tourism=museum'
+    tags: Dict[str, str]
+
+
+class Coverage(NamedTuple):
+    """Area an extract fully covers (min/max latitude and longitude)."""
+    min_lat: float
+    min_lon: float
+    max_lat: float
+    max_lon: float
+
+
+def _cell(lat: float, lon: float, cell_deg: float) -> Tuple[int, int]:
+    """Grid row and column of a point."""
+    return math.floor((lat + 90) / cell_deg), math.floor((lon + 180) / cell_deg)
+
+
+def _cell_key(row: int, col: int, cell_deg: float) -> int:
+    return row * (math.ceil(360 / cell_deg) + 1) + col
+
+
+def write_index(path: str, records: Iterable[PoiRecord], coverage: Sequence[Coverage], cell_deg: float = 0.05) -> int:
+    """
+    Write a POI index file.
+
+    Layout: magic, one JSON header line, then arrays in header order.
+    POIs are sorted by grid cell, so each cell is one contiguous range:
+    cell keys (int64) and range starts (uint32), then per POI latitude
+    and longitude (int32, 1e-7 degrees), category number (uint16) and an
+    offset into the tags blob (uint32), then the UTF-8 tags blob.
+
+    Args:
+        path: File to write
+        records: POIs to index
+        coverage: Areas the records completely cover (queries elsewhere go to Overpass)
+        cell_deg: Grid cell size in degrees
+
+    Returns:
+        Number of POIs written
+    """
+    categories: Dict[str, int] = {}
+    rows = []
+    for record in records:
+        code = categories.setdefault(record.category, len(categories))
+        tags = _SEP.join(f"{key}={record.tags[key]}" for key in KEPT_TAGS if record.tags.get(key))
+        rows.append((_cell_key(*_cell(record.lat, record.lon, cell_deg), cell_deg),
+                     round(record.lat * SCALE), round(record.lon * SCALE), code, tags.encode("utf-8")))
+    rows.sort(key=lambda row: row[0])
+
+    cell_keys, cell_starts = array("q"), array("I")
+    lats, lons, codes, offsets = array("i"), array("i"), array("H"), array("I", [0])
+    blob = bytearray()
+    for i, (key, lat, lon, code, tags) in enumerate(rows):
+        if not cell_keys or cell_keys[-1] != key:
+            cell_keys.append(key)
+            cell_starts.append(i)
+        lats.append(lat)
+        lons.append(lon)
+        codes.append(code)
+        blob += tags
+        offsets.append(len(blob))
+    cell_starts.append(len(rows))
+
+    header = {
+        "cell_deg": cell_deg,
+        "count": len(rows),
+        "cells": len(cell_keys),
+        "blob_bytes": len(blob),
+        "byteorder": sys.byteorder,
+        "coverage": [list(box) for box in coverage],
+        "categories": sorted(categories, key=categories.get),
+    }
+
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(json.dumps(header).encode("utf-8") + b"\n")
+        for values in (cell_keys, cell_starts, lats, lons, codes, offsets):
+            values.tofile(f)
+        f.write(blob)
+
+    return len(rows)
+
+
+class PoiIndex:
+    """
+    Grid-bucketed POI arrays loaded from a file written by write_index.
+
+    Radius queries only visit the grid cells overlapping the search
+    circle's bounding box; each cell is a contiguous slice of the
+    coordinate arrays. Storage is compact (about 15 bytes per POI plus
+    its tags) and loading is a handful of bulk array reads.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the index (the file is read by load()).
+
+        Args:
+            path: Path to the index file
+        """
+        self.path = path
+        self._clear()
+        self.logger = setup_logger(__name__)
+        self.hits = 0
+        self.misses = 0
+
+    def _clear(self) -> None:
+        """Empty index: covers nothing, finds nothing."""
+        self.cell_deg = 0.05
+        self.coverage: List[Coverage] = []
+        self.categories: List[str] = []
+        self._cells: Dict[int, Tuple[int, int]] = {}
+        self._lats = array("i")
+        self._lons = array("i")
+        self._codes = array("H")
+        self._offsets = array("I", [0])
+        self._blob = b""
+
+    def load(self) -> int:
+        """
+        Read the index file.
+
+        Returns:
+            Number of POIs loaded (0 if the file is missing or invalid)
+        """
+        try:
+            with open(self.path, "rb") as f:
+                if f.read(len(MAGIC)) != MAGIC:
+                    raise ValueError("not a POI index file")
+                header = json.loads(f.readline())
+
+                arrays = []
+                for typecode, length in (("q", header["cells"]), ("I", header["cells"] + 1),
+                                         ("i", header["count"]), ("i", header["count"]),
+                                         ("H", header["count"]), ("I", header["count"] + 1)):
+                    values = array(typecode)
+                    values.fromfile(f, length)
+                    if header["byteorder"] != sys.byteorder:
+                        values.byteswap()
+                    arrays.append(values)
+                blob = f.read(header["blob_bytes"])
+        except FileNotFoundError:
+            self.logger.warning(f"POI index file not found: {self.path}")
+            self._clear()
+            return 0
+        except (ValueError, KeyError, EOFError) as e:
+            self.logger.error(f"Invalid POI index file {self.path}: {e}")
+            self._clear()
+            return 0
+
+        cell_keys, cell_starts, self._lats, self._lons, self._codes, self._offsets = arrays
+        self._cells = {key: (cell_starts[i], cell_starts[i + 1]) for i, key in enumerate(cell_keys)}
+        self._blob = blob
+        self.cell_deg = header["cell_deg"]
+        self.coverage = [Coverage(*box) for box in header["coverage"]]
+        self.categories = header["categories"]
+
+        self.logger.info(f"POI index loaded: {len(self._lats)} POIs in {len(self._cells)} cells, "
+                         f"{len(self.coverage)} covered areas")
+        return len(self._lats)
+
+    def covers(self, lat: float, lon: float, radius: int) -> bool:
+        """
+        Check whether a search circle lies entirely inside one covered area.
+
+        Args:
+            lat: Latitude
+            lon: Longitude
+            radius: Search radius in metres
+
+        Returns:
+            True if the index has every POI the search could find
+        """
+        lat_span, lon_span = self._spans(lat, radius)
+        covered = any(
+            box.min_lat <= lat - lat_span and lat + lat_span <= box.max_lat
+            and box.min_lon <= lon - lon_span and lon + lon_span <= box.max_lon
+            for box in self.coverage
+        )
+
+        if covered:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+        return covered
+
+    @staticmethod
+    def _spans(lat: float, radius: int) -> Tuple[float, float]:
+        """Latitude and longitude half-widths (degrees) of a circle's bounding box."""
+        radius_km = radius / 1000
+        cos_lat = max(math.cos(math.radians(lat)), 0.01)
+        return radius_km / KM_PER_DEGREE, radius_km / (KM_PER_DEGREE * cos_lat)
+
+    def query(self, lat: float, lon: float, radius: int, categories: Optional[Set[str]] = None) -> List[Dict]:
+        """
+        Find POIs within a radius, as Overpass-style elements.
+
+        Args:
+            lat: Latitude
+            lon: Longitude
+            radius: Search radius in metres
+            categories: Only these 'key=value' categories (None = all)
+
+        Returns:
+            List of {"type": "node", "lat", "lon", "tags"} dicts, in index order
+        """
+        wanted = None
+        if categories is not None:
+            wanted = {code for code, category in enumerate(self.categories) if category in categories}
+            if not wanted:
+                return []
+
+        lat_span, lon_span = self._spans(lat, radius)
+        min_lat, max_lat = round((lat - lat_span) * SCALE), round((lat + lat_span) * SCALE)
+        min_lon, max_lon = round((lon - lon_span) * SCALE), round((lon + lon_span) * SCALE)
+        first_row, first_col = _cell(lat - lat_span, lon - lon_span, self.cell_deg)
+        last_row, last_col = _cell(lat + lat_span, lon + lon_span, self.cell_deg)
+        radius_km = radius / 1000
+
+        lats, lons, codes = self._lats, self._lons, self._codes
+        results = []
+        for row in range(first_row, last_row + 1):
+            for col in range(first_col, last_col + 1):
+                bounds = self._cells.get(_cell_key(row, col, self.cell_deg))
+                if bounds is None:
+                    continue
+
+                for i in range(*bounds):
+                    if wanted is not None and codes[i] not in wanted:
+                        continue
+                    point_lat, point_lon = lats[i], lons[i]
+                    if not (min_lat <= point_lat <= max_lat and min_lon <= point_lon <= max_lon):
+                        continue
+                    point_lat, point_lon = point_lat / SCALE, point_lon / SCALE
+                    if distance_km(lat, lon, point_lat, point_lon) <= radius_km:
+                        results.append(self._element(i, point_lat, point_lon))
+
+        return results
+
+    def _element(self, i: int, lat: float, lon: float) -> Dict:
+        """Overpass-style element for POI i."""
+        key, _, value = self.categories[self._codes[i]].partition("=")
+        tags = {key: value}
+
+        text = self._blob[self._offsets[i]:self._offsets[i + 1]].decode("utf-8")
+        for pair in filter(None, text.split(_SEP)):
+            tag, _, tag_value = pair.partition("=")
+            tags[tag] = tag_value
+
+        return {"type": "node", "lat": lat, "lon": lon, "tags": tags}
+
+    def __len__(self) -> int:
+        return len(self._lats)
+
+    def stats(self) -> Dict[str, int]:
+        """Return index size and covered/uncovered lookup counts."""
+        return {
+            "pois": len(self._lats),
+            "cells": len(self._cells),
+            "covered_areas": len(self.coverage),
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+
+# Global POI index instance (loaded at startup when POI_INDEX_PATH is set)
+poi_index = PoiIndex(settings.poi_index_path)
@@ -1,13 +1,28 @@
 """Weather service using Open-Meteo API."""
 
 import httpx
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 from app.config import settings
 from app.utils.logger import setup_logger
 from app.utils.exceptions import WeatherAPIError
+from app.utils.cache import weather_cache
+from app.utils.single_flight import SingleFlight
+from app.utils.micro_batcher import MicroBatcher
+from app.services.http_client import http_clients
 
 logger = setup_logger(__name__)
 
+# Coalesces concurrent lookups for the same grid cell
+_weather_flight = SingleFlight("weather")
+
+# Gathers concurrent lookups for different cells into one multi-location request
+_weather_batcher = MicroBatcher(
+    "weather",
+    dispatch=lambda points: _fetch_weather_bulk(points),
+    max_delay=settings.weather_batch_window_ms / 1000,
+    max_batch=settings.weather_bulk_max_locations
+)
+
 
 async def get_current_weather(lat: float, lon: float) -> Dict[str, any]:
     """
@@ -25,6 +40,25 @@ async def get_current_weather(lat: float, lon: float) -> Dict[str, any]:
     Raises:
         WeatherAPIError: If the API request fails
     """
+    # Nearby coordinates (same grid cell) share cache entries and in-flight requests
+    cached_result = weather_cache.get(lat, lon)
+    if cached_result:
+        logger.info(f"Using cached weather for coordinates: ({lat}, {lon})")
+        return dict(cached_result)
+    
+    if settings.weather_batch_window_ms > 0:
+        # Other cells requested within the window go out in the same upstream call
+        fetch = lambda: _weather_batcher.submit((lat, lon))
+    else:
+        fetch = lambda: _fetch_weather(lat, lon)
+    
+    key = weather_cache.key(lat, lon)
+    result = await _weather_flight.do(key, fetch)
+    return dict(result)
+
+
+async def _fetch_weather(lat: float, lon: float) -> Dict[str, any]:
+    """Fetch current weather from Open-Meteo and cache it for the grid cell."""
     params = {
         "latitude": lat,
         "longitude": lon,
@@ -36,36 +70,131 @@ async def get_current_weather(lat: float, lon: float) -> Dict[str, any]:
     
     try:
         logger.info(f"Fetching weather for coordinates: ({lat}, {lon})")
-        async with httpx.AsyncClient(timeout=settings.api_timeout) as client:
-            response = await client.get(
-                settings.openmeteo_url,
-                params=params
-            )
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            # Extract current weather data
-            current = data.get("current", {})
-            hourly = data.get("hourly", {})
-            
-            temperature = current.get("temperature_2m")
-            
-            # Get average precipitation probability from hourly forecast
-            precip_probs = hourly.get("precipitation_probability", [])
-            avg_precip_prob = sum(precip_probs) / len(precip_probs) if precip_probs else 0
-            
-            result = {
-                "temperature": round(temperature, 1) if temperature is not None else None,
-                "precipitation_probability": round(avg_precip_prob)
-            }
-            
-            logger.info(f"Weather data retrieved: {result}")
-            return result
-            
+        client = http_clients.get("openmeteo")
+        response = await client.get(
+            settings.openmeteo_url,
+            params=params
+        )
+        response.raise_for_status()
+        
+        result = _parse_weather(response.json())
+        weather_cache.set(lat, lon, result)
+        
+        logger.info(f"Weather data retrieved: {result}")
+        return result
+        
     except httpx.HTTPError as e:
         logger.error(f"Weather API error: {str(e)}")
         raise WeatherAPIError(f"Failed to fetch weather data: {str(e)}")
     except (KeyError, ValueError, TypeError) as e:
         logger.error(f"Error parsing weather response: {str(e)}")
         raise WeatherAPIError(f"Invalid response from weather API: {str(e)}")
+
+
+def _parse_weather(data: Dict[str, any]) -> Dict[str, any]:
+    """Extract temperature and average precipitation probability from one Open-Meteo location."""
+    current = data.get("current", {})
+    hourly = data.get("hourly", {})
+    
+    temperature = current.get("temperature_2m")
+    
+    # Get average precipitation probability from hourly forecast
+    precip_probs = hourly.get("precipitation_probability", [])
+    avg_precip_prob = sum(precip_probs) / len(precip_probs) if precip_probs else 0
+    
+    return {
+        "temperature": round(temperature, 1) if temperature is not None else None,
+        "precipitation_probability": round(avg_precip_prob)
+    }
+
+
+async def get_current_weather_bulk(coordinates: List[Tuple[float, float]]) -> List[Optional[Dict[str, any]]]:
+    """
+    Get current weather for many coordinates with as few Open-Meteo calls as possible.
+    
+    Cached grid cells are served from the cache; the remaining cells are
+    deduplicated and requested together, since Open-Meteo accepts
+    comma-separated latitude/longitude lists (up to
+    settings.weather_bulk_max_locations per request). Fetched results are
+    cached like single lookups.
+    
+    Args:
+        coordinates: List of (lat, lon) tuples
+    
+    Returns:
+        Weather dictionaries in input order; None where a request failed
+        (callers can fall back to get_current_weather)
+    """
+    results: List[Optional[Dict[str, any]]] = [None] * len(coordinates)
+    missing: Dict[str, List[int]] = {}  # grid cell key -> input positions
+    
+    for i, (lat, lon) in enumerate(coordinates):
+        cached_result = weather_cache.get(lat, lon)
+        if cached_result:
+            results[i] = dict(cached_result)
+        else:
+            missing.setdefault(weather_cache.key(lat, lon), []).append(i)
+    
+    if not missing:
+        return results
+    
+    cells = list(missing.values())
+    chunk_size = max(1, settings.weather_bulk_max_locations)
+    logger.info(f"Fetching weather for {len(cells)} locations in bulk ({len(coordinates) - sum(map(len, cells))} cached)")
+    
+    for start in range(0, len(cells), chunk_size):
+        chunk = cells[start:start + chunk_size]
+        points = [coordinates[positions[0]] for positions in chunk]
+        
+        try:
+            fetched = await _fetch_weather_bulk(points)
+        except WeatherAPIError:
+            continue  # leave these as None
+        
+        for positions, result in zip(chunk, fetched):
+            for i in positions:
+                results[i] = dict(result)
+    
+    return results
+
+
+async def _fetch_weather_bulk(points: List[Tuple[float, float]]) -> List[Dict[str, any]]:
+    """Fetch current weather for several locations in one Open-Meteo request and cache each."""
+    params = {
+        "latitude": ",".join(str(lat) for lat, _ in points),
+        "longitude": ",".join(str(lon) for _, lon in points),
+        "current": "temperature_2m,precipitation",
+        "hourly": "precipitation_probability",
+        "timezone": "auto",
+        "forecast_days": 1
+    }
+    
+    try:
+        client = http_clients.get("openmeteo")
+        response = await client.get(
+            settings.openmeteo_url,
+            params=params
+        )
+        response.raise_for_status()
+        
+        data = response.json()
+        # A single location comes back as an object, several as a list in request order
+        locations = data if isinstance(data, list) else [data]
+        if len(locations) != len(points):
+            raise ValueError(f"expected {len(points)} locations, got {len(locations)}")
+        
+        results = []
+        for (lat, lon), location in zip(points, locations):
+            result = _parse_weather(location)
+            weather_cache.set(lat, lon, result)
+            results.append(result)
+        
+        logger.info(f"Bulk weather data retrieved for {len(results)} locations")
+        return results
+        
+    except httpx.HTTPError as e:
+        logger.error(f"Bulk weather API error: {str(e)}")
+        raise WeatherAPIError(f"Failed to fetch weather data: {str(e)}")
+    except (KeyError, ValueError, TypeError, AttributeError) as e:
+        logger.error(f"Error parsing bulk weather response: {str(e)}")
+        raise WeatherAPIError(f"Invalid response from weather API: {str(e)}")
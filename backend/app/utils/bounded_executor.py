@@ -0,0 +1,154 @@
+"""Bounded thread/process pools for CPU-bound work that must not block the event loop."""
+
+import asyncio
+import multiprocessing
+import time
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List
+from app.utils.exceptions import ExecutorBusyError
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# All executors, for metrics
+_executors: List["BoundedExecutor"] = []
+
+# Queue and run times kept for the percentiles in stats()
+_SAMPLES = 1000
+
+
+def _timed(fn: Callable, *args) -> tuple:
+    """Run fn in a worker; returns (start time, result, run time). time.monotonic is system-wide."""
+    started = time.monotonic()
+    return started, fn(*args), time.monotonic() - started
+
+
+def _percentile(samples, fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class BoundedExecutor:
+    """
+    Thread or process pool with a bounded backlog.
+
+    At most `max_workers` jobs run and `max_queue` more wait for a worker;
+    a submission beyond that is rejected straight away with
+    ExecutorBusyError instead of queueing without limit, so callers can
+    shed load (e.g. answer 503). Cancelling a waiting caller removes its
+    job from the queue. Queue time (submit to start) and run time are
+    recorded for metrics.
+    """
+
+    def __init__(self, name: str, kind: str = "thread", max_workers: int = 2, max_queue: int = 16):
+        """
+        Initialize the executor (worker threads or processes start on first use).
+
+        Args:
+            name: Executor name (for logging and metrics)
+            kind: 'thread' or 'process'; process workers need picklable
+                functions and arguments and don't share module state
+            max_workers: Jobs that run at the same time
+            max_queue: Jobs that may wait for a worker
+        """
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Executor kind must be 'thread' or 'process', got '{kind}'")
+
+        self.name = name
+        self.kind = kind
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self._executor: Executor
+        if kind == "process":
+            # spawn: forking a process that runs an event loop and other pools is unsafe
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=name)
+        self.logger = setup_logger(__name__)
+        self._queue_times: deque = deque(maxlen=_SAMPLES)
+        self._run_times: deque = deque(maxlen=_SAMPLES)
+        self.pending = 0  # queued or running
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        _executors.append(self)
+
+    async def run(self, fn: Callable, *args) -> Any:
+        """
+        Run fn(*args) on a worker and wait for the result.
+
+        Args:
+            fn: Blocking function (module-level for process pools)
+            *args: Its arguments
+
+        Returns:
+            fn's return value
+
+        Raises:
+            ExecutorBusyError: If all workers are busy and the queue is full
+            Whatever fn raised
+        """
+        if self.pending >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            self.logger.warning(f"'{self.name}' executor busy ({self.pending} jobs), rejecting")
+            raise ExecutorBusyError(self.name)
+
+        loop = asyncio.get_running_loop()
+        self.pending += 1
+        submitted = time.monotonic()
+        job = self._executor.submit(_timed, fn, *args)
+        # The slot is freed when the job itself ends, not when the caller stops waiting for it
+        job.add_done_callback(lambda job: self._call_soon(loop, job))
+
+        started, result, run_time = await asyncio.wrap_future(job)
+        self._queue_times.append(started - submitted)
+        self._run_times.append(run_time)
+        return result
+
+    def _call_soon(self, loop: asyncio.AbstractEventLoop, job: Future) -> None:
+        """Done callback (runs in a worker or the pool's manager thread): update counters on the loop."""
+        try:
+            loop.call_soon_threadsafe(self._finished, job)
+        except RuntimeError:  # loop already closed
+            pass
+
+    def _finished(self, job: Future) -> None:
+        """Free the job's slot (also when it failed or was cancelled while queued)."""
+        self.pending -= 1
+
+        if job.cancelled():
+            return
+        if job.exception() is not None:
+            self.failed += 1
+        else:
+            self.completed += 1
+
+    def close(self) -> None:
+        """Shut down the workers after the jobs already submitted."""
+        self._executor.shutdown(wait=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return load, outcome counts and recent queue/run time percentiles (ms)."""
+        return {
+            "kind": self.kind,
+            "workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "running": min(self.pending, self.max_workers),
+            "queued": max(0, self.pending - self.max_workers),
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "queue_ms_p50": round(_percentile(self._queue_times, 0.50) * 1000, 2),
+            "queue_ms_p99": round(_percentile(self._queue_times, 0.99) * 1000, 2),
+            "run_ms_p50": round(_percentile(self._run_times, 0.50) * 1000, 2),
+            "run_ms_p99": round(_percentile(self._run_times, 0.99) * 1000, 2)
+        }
+
+
+def bounded_executor_stats() -> Dict[str, Dict[str, Any]]:
+    """Return metrics for all bounded executors."""
+    return {executor.name: executor.stats() for executor in _executors}
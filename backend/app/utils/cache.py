@@ -1,84 +1,431 @@
 """Cache manager for improving response times."""
 
-from typing import Dict, Optional, Any
-from datetime import datetime, timedelta
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+from app.config import settings
+from app.utils.disk_cache import DiskCache
+from app.utils.geo import grid_cell
 from app.utils.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# All cache instances, for metrics
+_caches: List["CacheManager"] = []
+_grid_caches: List["GridCache"] = []
+
+
+def _estimate_size(value: Any) -> int:
+    """Approximate the memory footprint of a cached value in bytes."""
+    size = sys.getsizeof(value)
+
+    if isinstance(value, dict):
+        size += sum(_estimate_size(k) + _estimate_size(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(_estimate_size(item) for item in value)
+
+    return size
+
 
 class CacheManager:
-    """Simple in-memory cache for geocoding and places results."""
-    
-    def __init__(self, ttl_minutes: int = 60):
+    """
+    Bounded in-memory LRU cache with per-entry TTL.
+
+    Entries live in an OrderedDict kept in recency order, so lookups,
+    inserts and LRU evictions are O(1). The cache is bounded both by entry
+    count and by approximate size in bytes. Expired entries are dropped
+    when read and by a sweep that runs at most once per sweep interval,
+    amortised over normal cache operations.
+    """
+
+    def __init__(
+        self,
+        ttl_minutes: float = 60,
+        max_entries: int = 1000,
+        max_bytes: Optional[int] = None,
+        name: str = "cache",
+        sweep_interval: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
         """
         Initialize cache manager.
-        
+
         Args:
-            ttl_minutes: Time-to-live for cached items in minutes
+            ttl_minutes: Default time-to-live for cached items in minutes
+            max_entries: Maximum number of entries before LRU eviction
+            max_bytes: Maximum approximate size of all values (None for no limit)
+            name: Cache name (for logging and metrics)
+            sweep_interval: Seconds between expiry sweeps (defaults to settings)
+            clock: Monotonic time source (injectable for tests)
         """
-        self._cache: Dict[str, Dict[str, Any]] = {}
-        self.ttl = timedelta(minutes=ttl_minutes)
+        # key -> (value, expires_at, size_bytes), least recently used first
+        self._cache: "OrderedDict[str, tuple[Any, float, int]]" = OrderedDict()
+        self.ttl = ttl_minutes * 60
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.name = name
+        self.sweep_interval = settings.cache_sweep_interval if sweep_interval is None else sweep_interval
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._bytes = 0
+        self._last_sweep = clock()
         self.logger = setup_logger(__name__)
         self.hits = 0
         self.misses = 0
-    
-    def _is_expired(self, timestamp: datetime) -> bool:
-        """Check if a cache entry has expired."""
-        return datetime.now() - timestamp > self.ttl
-    
+        self.evictions = 0
+        self.expirations = 0
+        self.disk_hits = 0
+        self._disk: Optional[DiskCache] = None
+        _caches.append(self)
+
+    def _remove(self, key: str) -> None:
+        """Remove an entry and release its size."""
+        _, _, size = self._cache.pop(key)
+        self._bytes -= size
+
+    def _maybe_sweep(self, now: float) -> None:
+        """Drop all expired entries if the sweep interval has elapsed."""
+        if now - self._last_sweep < self.sweep_interval:
+            return
+
+        self._last_sweep = now
+        expired = [key for key, (_, expires_at, _) in self._cache.items() if expires_at <= now]
+
+        for key in expired:
+            self._remove(key)
+
+        if expired:
+            self.expirations += len(expired)
+            self.logger.debug(f"Cache '{self.name}' swept {len(expired)} expired entries")
+
     def get(self, key: str) -> Optional[Any]:
         """
         Get value from cache.
-        
+
         Args:
             key: Cache key
-        
+
         Returns:
             Cached value or None if not found/expired
         """
         key = key.lower()  # Case-insensitive keys
-        
-        if key in self._cache:
-            entry = self._cache[key]
-            
+
+        with self._lock:
+            now = self._clock()
+            self._maybe_sweep(now)
+            entry = self._cache.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at, _ = entry
+
             # Check if expired
-            if self._is_expired(entry["timestamp"]):
+            if expires_at <= now:
                 self.logger.debug(f"Cache expired for key: {key}")
-                del self._cache[key]
+                self._remove(key)
+                self.expirations += 1
                 self.misses += 1
                 return None
-            
+
+            self._cache.move_to_end(key)
             self.hits += 1
             self.logger.debug(f"Cache hit for key: {key}")
-            return entry["value"]
-        
-        self.misses += 1
-        return None
-    
-    def set(self, key: str, value: Any) -> None:
+            return value
+
+    def set(self, key: str, value: Any, ttl_minutes: Optional[float] = None) -> None:
         """
         Store value in cache.
-        
+
         Args:
             key: Cache key
             value: Value to cache
+            ttl_minutes: Time-to-live for this entry (defaults to the cache TTL)
         """
         key = key.lower()  # Case-insensitive keys
-        
-        self._cache[key] = {
-            "value": value,
-            "timestamp": datetime.now()
-        }
-        
+        ttl = self.ttl if ttl_minutes is None else ttl_minutes * 60
+        size = _estimate_size(value)
+
+        if self.max_bytes is not None and size > self.max_bytes:
+            self.logger.warning(f"Value for key '{key}' ({size} bytes) exceeds cache '{self.name}' size limit")
+            return
+
+        with self._lock:
+            now = self._clock()
+            self._maybe_sweep(now)
+
+            if key in self._cache:
+                self._remove(key)
+
+            self._cache[key] = (value, now + ttl, size)
+            self._bytes += size
+
+            # Evict least recently used entries until within limits
+            while len(self._cache) > self.max_entries or (
+                self.max_bytes is not None and self._bytes > self.max_bytes
+            ):
+                oldest_key = next(iter(self._cache))
+                self._remove(oldest_key)
+                self.evictions += 1
+                self.logger.debug(f"Evicted key from cache '{self.name}': {oldest_key}")
+
         self.logger.debug(f"Cached key: {key}")
-    
+
+    def attach_disk_tier(self, disk: DiskCache) -> None:
+        """
+        Put a persistent tier behind this cache.
+
+        Entries are namespaced on disk by cache name. Only the async
+        methods (aget/aset/warm_up) consult the disk tier.
+        """
+        self._disk = disk
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """
+        Get value from memory, falling back to the disk tier.
+
+        Disk hits are promoted into memory with their remaining TTL.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value or None if not found/expired
+        """
+        value = self.get(key)
+        if value is not None or self._disk is None:
+            return value
+
+        key = key.lower()
+        row = await self._disk.get(self.name, key)
+        if row is None:
+            return None
+
+        value, expires_at = row
+        self.disk_hits += 1
+        self.set(key, value, ttl_minutes=(expires_at - time.time()) / 60)
+        self.logger.debug(f"Disk cache hit for key: {key}")
+        return value
+
+    async def aset(self, key: str, value: Any, ttl_minutes: Optional[float] = None) -> None:
+        """
+        Store value in memory and write it through to the disk tier.
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value to cache
+            ttl_minutes: Time-to-live for this entry (defaults to the cache TTL)
+        """
+        self.set(key, value, ttl_minutes)
+
+        if self._disk is not None:
+            ttl = self.ttl if ttl_minutes is None else ttl_minutes * 60
+            await self._disk.set(self.name, key.lower(), value, time.time() + ttl)
+
+    async def warm_up(self) -> int:
+        """
+        Load unexpired entries from the disk tier into memory.
+
+        Returns:
+            Number of entries loaded
+        """
+        if self._disk is None:
+            return 0
+
+        rows = await self._disk.load(self.name, limit=self.max_entries)
+        now = time.time()
+
+        # Insert longest-lived last so they are the most recently used
+        for key, value, expires_at in reversed(rows):
+            self.set(key, value, ttl_minutes=(expires_at - now) / 60)
+
+        self.logger.info(f"Warmed cache '{self.name}' with {len(rows)} entries from disk")
+        return len(rows)
+
+    def delete(self, key: str) -> None:
+        """Remove a key from the cache if present."""
+        key = key.lower()
+
+        with self._lock:
+            if key in self._cache:
+                self._remove(key)
+
     def clear(self) -> None:
         """Clear all cached items."""
-        self._cache.clear()
+        with self._lock:
+            self._cache.clear()
+            self._bytes = 0
+
         self.logger.info("Cache cleared")
 
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return size and hit/miss/eviction counters."""
+        lookups = self.hits + self.misses
+
+        return {
+            "entries": len(self._cache),
+            "max_entries": self.max_entries,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "disk_hits": self.disk_hits
+        }
+
+
+class GridCache:
+    """
+    Cache for coordinate-based lookups keyed on quantised grid cells.
+
+    Lookups anywhere inside the same cell share an entry. Each entry
+    remembers the coordinates that populated it, so hits served to
+    different coordinates ('nearby hits') can be counted when tuning the
+    cell size.
+    """
+
+    def __init__(self, cache: CacheManager, cell_km: float):
+        """
+        Initialize a grid cache.
+
+        Args:
+            cache: Underlying cache storage
+            cell_km: Grid cell edge length in kilometres
+        """
+        self.cache = cache
+        self.cell_km = cell_km
+        self.nearby_hits = 0
+        _grid_caches.append(self)
+
+    def key(self, lat: float, lon: float, suffix: str = "") -> str:
+        """Build the cache key for coordinates (plus optional query parameters)."""
+        key = grid_cell(lat, lon, self.cell_km)
+        return f"{key}:{suffix}" if suffix else key
+
+    def get(self, lat: float, lon: float, suffix: str = "") -> Optional[Any]:
+        """
+        Get the cached value for the cell containing the coordinates.
+
+        Args:
+            lat: Latitude
+            lon: Longitude
+            suffix: Extra key component (e.g. search radius)
+
+        Returns:
+            Cached value or None if not found/expired
+        """
+        return self._unpack(lat, lon, self.cache.get(self.key(lat, lon, suffix)))
+
+    def _unpack(self, lat: float, lon: float, entry: Optional[Any]) -> Optional[Any]:
+        """Return the value from a cell entry, counting hits for other coordinates."""
+        if entry is None:
+            return None
+
+        origin_lat, origin_lon, value = entry
+        if (round(origin_lat, 4), round(origin_lon, 4)) != (round(lat, 4), round(lon, 4)):
+            self.nearby_hits += 1
+
+        return value
+
+    def set(self, lat: float, lon: float, value: Any, suffix: str = "") -> None:
+        """Store a value for the cell containing the coordinates."""
+        self.cache.set(self.key(lat, lon, suffix), (lat, lon, value))
+
+    async def aget(self, lat: float, lon: float, suffix: str = "") -> Optional[Any]:
+        """Like get(), falling back to the disk tier."""
+        return self._unpack(lat, lon, await self.cache.aget(self.key(lat, lon, suffix)))
+
+    async def aset(self, lat: float, lon: float, value: Any, suffix: str = "") -> None:
+        """Like set(), writing through to the disk tier."""
+        await self.cache.aset(self.key(lat, lon, suffix), (lat, lon, value))
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Return metrics for all caches."""
+    stats = {cache.name: cache.stats() for cache in _caches}
+
+    for grid_cache in _grid_caches:
+        stats[grid_cache.cache.name].update({
+            "grid_cell_km": grid_cache.cell_km,
+            "nearby_hits": grid_cache.nearby_hits
+        })
+
+    return stats
+
 
 # Global cache instances
-geocoding_cache = CacheManager(ttl_minutes=1440)  # 24 hours for geocoding
-places_cache = CacheManager(ttl_minutes=60)  # 1 hour for places
+geocoding_cache = CacheManager(
+    ttl_minutes=1440,  # 24 hours for geocoding
+    max_entries=settings.geocoding_cache_max_entries,
+    max_bytes=settings.geocoding_cache_max_bytes,
+    name="geocoding"
+)
+geocoding_negative_cache = CacheManager(
+    ttl_minutes=settings.geocoding_negative_cache_ttl_minutes,  # Short: new places do appear
+    max_entries=settings.geocoding_negative_cache_max_entries,
+    name="geocoding_negative"
+)
+places_cache = GridCache(
+    CacheManager(
+        ttl_minutes=settings.places_cache_ttl_minutes,
+        max_entries=settings.places_cache_max_entries,
+        max_bytes=settings.places_cache_max_bytes,
+        name="places"
+    ),
+    cell_km=settings.cache_grid_cell_km
+)
+weather_cache = GridCache(
+    CacheManager(
+        ttl_minutes=settings.weather_cache_ttl_minutes,
+        max_entries=settings.weather_cache_max_entries,
+        name="weather"
+    ),
+    cell_km=settings.cache_grid_cell_km
+)
+parse_cache = CacheManager(
+    ttl_minutes=1440,  # Parse results only depend on the query text
+    max_entries=settings.parse_cache_max_entries,
+    name="parse_query"
+)
+map_cache = CacheManager(
+    ttl_minutes=settings.map_cache_ttl_minutes,  # Pages are keyed on their full input, TTL only frees memory
+    max_entries=settings.map_cache_max_entries,
+    max_bytes=settings.map_cache_max_bytes,
+    name="map"
+)
+
+# Shared SQLite tier behind the geocoding and places caches (set up in the app lifespan)
+_disk_cache: Optional[DiskCache] = None
+
+
+async def start_disk_tier() -> None:
+    """Attach the persistent disk tier to the geocoding and places caches and warm them up."""
+    global _disk_cache
+
+    if not settings.disk_cache_enabled or _disk_cache is not None:
+        return
+
+    _disk_cache = DiskCache(settings.disk_cache_path, max_workers=settings.disk_cache_workers)
+    purged = await _disk_cache.purge_expired()
+    logger.info(f"Purged {purged} expired disk cache entries")
+
+    for cache in (geocoding_cache, places_cache.cache):
+        cache.attach_disk_tier(_disk_cache)
+        await cache.warm_up()
+
+
+def close_disk_tier() -> None:
+    """Close the persistent disk tier."""
+    global _disk_cache
+
+    if _disk_cache is not None:
+        _disk_cache.close()
+        _disk_cache = None
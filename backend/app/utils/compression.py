@@ -0,0 +1,239 @@
+"""Response compression (gzip, brotli) and precompressed static file variants."""
+
+import os
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.logger import setup_logger
+
+try:
+    import brotli
+except ImportError:  # optional: without it only gzip is offered
+    brotli = None
+
+logger = setup_logger(__name__)
+
+# Preferred first when the client weighs encodings equally
+ENCODINGS: Tuple[str, ...] = ("br", "gzip") if brotli is not None else ("gzip",)
+
+# File suffix of the precompressed variant stored next to a static asset
+SUFFIXES: Dict[str, str] = {"br": ".br", "gzip": ".gz"}
+
+# Media types worth compressing; images, fonts and archives are compressed already
+COMPRESSIBLE_TYPES: Tuple[str, ...] = (
+    "text/", "application/json", "application/geo+json", "application/x-ndjson",
+    "application/javascript", "application/xml", "image/svg+xml",
+)
+
+# Bytes in/out per encoding, for metrics
+_stats: Dict[str, Dict[str, int]] = {encoding: {"responses": 0, "bytes_in": 0, "bytes_out": 0}
+                                     for encoding in ENCODINGS}
+
+
+def is_compressible(content_type: str) -> bool:
+    """Whether a response of this Content-Type is worth compressing."""
+    return content_type.lower().startswith(COMPRESSIBLE_TYPES)
+
+
+def negotiate(accept_encoding: str, available: Sequence[str] = ENCODINGS) -> Optional[str]:
+    """
+    Pick the content coding for a request.
+
+    Args:
+        accept_encoding: Accept-Encoding header value (e.g. "gzip, deflate, br;q=0.9")
+        available: Codings the server can produce, most preferred first
+
+    Returns:
+        The acceptable coding with the highest q-value (ties go to the
+        server's preference), or None for an uncompressed response
+    """
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[coding] = q
+
+    best, best_q = None, 0.0
+    for coding in available:
+        q = weights.get(coding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def precompressed_variant(path: str, accept_encoding: str) -> Optional[Tuple[str, str]]:
+    """
+    Find the stored variant of a static file the client accepts.
+
+    Variants are written by precompress_static.py. One older than its
+    source (the file was edited after the build step) is ignored.
+
+    Args:
+        path: Path of the original file
+        accept_encoding: Accept-Encoding header value
+
+    Returns:
+        (variant path, coding), or None to serve the original
+    """
+    try:
+        source_mtime = os.stat(path).st_mtime
+    except OSError:
+        return None
+
+    available: List[str] = []
+    for coding in ("br", "gzip"):
+        try:
+            if os.stat(path + SUFFIXES[coding]).st_mtime >= source_mtime:
+                available.append(coding)
+        except OSError:
+            continue
+
+    coding = negotiate(accept_encoding, available) if available else None
+    return (path + SUFFIXES[coding], coding) if coding else None
+
+
+def _count(coding: str, bytes_in: int, bytes_out: int, done: bool) -> None:
+    stats = _stats[coding]
+    stats["responses"] += done
+    stats["bytes_in"] += bytes_in
+    stats["bytes_out"] += bytes_out
+
+
+def compression_stats() -> Dict[str, Dict[str, float]]:
+    """Compressed responses and bytes before/after, per coding."""
+    return {
+        coding: {**stats, "ratio": round(stats["bytes_out"] / stats["bytes_in"], 3) if stats["bytes_in"] else None}
+        for coding, stats in _stats.items()
+    }
+
+
+def _vary_on_encoding(headers: MutableHeaders) -> None:
+    """Add Accept-Encoding to Vary unless it is there already."""
+    vary = headers.get("vary", "")
+    if "accept-encoding" not in vary.lower() and vary.strip() != "*":
+        headers.add_vary_header("Accept-Encoding")
+
+
+class _Encoder:
+    """Incremental gzip or brotli stream."""
+
+    def __init__(self, coding: str, gzip_level: int, brotli_quality: int):
+        self.coding = coding
+        if coding == "br":
+            self._brotli = brotli.Compressor(quality=brotli_quality)
+        else:
+            self._zlib = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)  # 31: gzip container
+
+    def chunk(self, data: bytes) -> bytes:
+        """Compress data and flush it, so a streamed chunk reaches the client now."""
+        if self.coding == "br":
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        """Compress the last data and end the stream."""
+        if self.coding == "br":
+            return self._brotli.process(data) + self._brotli.finish()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_FINISH)
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with the best coding the client accepts.
+
+    Only compressible media types are touched, and complete bodies under
+    minimum_size are sent as they are (the headers would eat the saving).
+    Every compressible response carries `Vary: Accept-Encoding`, compressed
+    or not, so shared caches never hand an identity copy to gzip/br clients
+    or the other way round.
+    Streamed responses (NDJSON) are compressed chunk by chunk with a flush
+    after each, so clients still see every line as it is produced.
+    Responses that already carry a Content-Encoding (precompressed static
+    files) pass through. Strong ETags are weakened on compressed responses,
+    since the bytes no longer match the identity representation.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: Wrapped ASGI application
+            minimum_size: Complete bodies smaller than this are not compressed
+            gzip_level: zlib level (1-9)
+            brotli_quality: Brotli quality (0-11); low levels are nearly as fast as gzip
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Uncompressed answers still pass through here: they need Vary too
+        coding = negotiate(Headers(scope=scope).get("accept-encoding", ""))
+        start: Optional[Message] = None
+        encoder: Optional[_Encoder] = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, encoder, passthrough
+
+            if message["type"] == "http.response.start":
+                start = {**message, "headers": list(message.get("headers", []))}
+                return
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if encoder is None:
+                headers = MutableHeaders(raw=start["headers"])
+                negotiable = (start["status"] not in (204, 304) and "content-encoding" not in headers
+                              and is_compressible(headers.get("content-type", "")))
+                if negotiable:
+                    _vary_on_encoding(headers)
+                if not negotiable or coding is None or (not more_body and len(body) < self.minimum_size):
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+
+                encoder = _Encoder(coding, self.gzip_level, self.brotli_quality)
+                headers["Content-Encoding"] = coding
+                etag = headers.get("etag")
+                if etag and not etag.startswith("W/"):
+                    headers["ETag"] = f"W/{etag}"
+                if more_body:
+                    del headers["content-length"]
+                else:
+                    compressed = encoder.finish(body)
+                    headers["Content-Length"] = str(len(compressed))
+                    _count(coding, len(body), len(compressed), done=True)
+                    await send(start)
+                    await send({"type": "http.response.body", "body": compressed})
+                    return
+                await send(start)
+
+            compressed = encoder.chunk(body) if more_body else encoder.finish(body)
+            _count(coding, len(body), len(compressed), done=not more_body)
+            await send({"type": "http.response.body", "body": compressed, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
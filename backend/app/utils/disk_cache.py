@@ -0,0 +1,153 @@
+"""Persistent SQLite cache tier shared by worker processes on one host."""
+
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, List, Optional, Tuple
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class DiskCache:
+    """
+    SQLite-backed key/value store with a per-row expiry time.
+
+    The database runs in WAL mode so several uvicorn worker processes can
+    read and write the same file concurrently. All SQLite calls run on a
+    small thread pool (one connection per thread) so they never block the
+    event loop. Values are stored as JSON; expiry uses wall-clock time so
+    it survives restarts.
+    """
+
+    def __init__(self, path: str, max_workers: int = 2):
+        """
+        Initialize the disk cache.
+
+        Args:
+            path: SQLite database file path
+            max_workers: Number of threads used for database access
+        """
+        self.path = path
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="disk-cache")
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self.logger = setup_logger(__name__)
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._connect().executescript("""
+            CREATE TABLE IF NOT EXISTS cache (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_cache_expires_at ON cache (expires_at);
+        """)
+        self.logger.info(f"Disk cache ready at {path}")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+
+        if conn is None:
+            # Each connection is only used by its own thread; close() runs after the pool stops
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+
+        return conn
+
+    async def _run(self, fn, *args):
+        """Run a blocking database call on the cache thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    def _get(self, namespace: str, key: str) -> Optional[Tuple[Any, float]]:
+        row = self._connect().execute(
+            "SELECT value, expires_at FROM cache WHERE namespace = ? AND key = ? AND expires_at > ?",
+            (namespace, key, time.time())
+        ).fetchone()
+
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def _set(self, namespace: str, key: str, value: Any, expires_at: float) -> None:
+        self._connect().execute(
+            "INSERT OR REPLACE INTO cache (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+            (namespace, key, json.dumps(value), expires_at)
+        )
+
+    def _load(self, namespace: str, limit: int) -> List[Tuple[str, Any, float]]:
+        rows = self._connect().execute(
+            "SELECT key, value, expires_at FROM cache WHERE namespace = ? AND expires_at > ? "
+            "ORDER BY expires_at DESC LIMIT ?",
+            (namespace, time.time(), limit)
+        ).fetchall()
+
+        return [(key, json.loads(value), expires_at) for key, value, expires_at in rows]
+
+    def _purge_expired(self) -> int:
+        return self._connect().execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),)).rowcount
+
+    async def get(self, namespace: str, key: str) -> Optional[Tuple[Any, float]]:
+        """
+        Get a value from disk.
+
+        Args:
+            namespace: Cache namespace (e.g. 'geocoding')
+            key: Cache key
+
+        Returns:
+            Tuple of (value, expires_at) or None if not found/expired
+        """
+        return await self._run(self._get, namespace, key)
+
+    async def set(self, namespace: str, key: str, value: Any, expires_at: float) -> None:
+        """
+        Store a JSON-serializable value on disk.
+
+        Args:
+            namespace: Cache namespace
+            key: Cache key
+            value: Value to store
+            expires_at: Expiry as a Unix timestamp
+        """
+        await self._run(self._set, namespace, key, value, expires_at)
+
+    async def load(self, namespace: str, limit: int) -> List[Tuple[str, Any, float]]:
+        """
+        Load unexpired entries for a namespace, longest-lived first.
+
+        Args:
+            namespace: Cache namespace
+            limit: Maximum number of entries
+
+        Returns:
+            List of (key, value, expires_at) tuples
+        """
+        return await self._run(self._load, namespace, limit)
+
+    async def purge_expired(self) -> int:
+        """Delete expired rows and return how many were removed."""
+        return await self._run(self._purge_expired)
+
+    def close(self) -> None:
+        """Shut down the thread pool and close all connections."""
+        self._executor.shutdown(wait=True)
+
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
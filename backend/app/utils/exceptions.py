@@ -1,5 +1,7 @@
 """Custom exceptions for the application."""
 
+from typing import List, Optional
+
 
 class TourismSystemError(Exception):
     """Base exception for tourism system errors."""
@@ -9,8 +11,9 @@ class TourismSystemError(Exception):
 class PlaceNotFoundError(TourismSystemError):
     """Raised when a place cannot be found in geocoding."""
     
-    def __init__(self, place_name: str):
+    def __init__(self, place_name: str, suggestions: Optional[List[str]] = None):
         self.place_name = place_name
+        self.suggestions = suggestions or []
         super().__init__(f"Place not found: {place_name}")
 
 
@@ -27,3 +30,11 @@ class PlacesAPIError(TourismSystemError):
 class GeocodingAPIError(TourismSystemError):
     """Raised when geocoding API request fails."""
     pass
+
+
+class ExecutorBusyError(TourismSystemError):
+    """Raised when a bounded executor's workers and queue are all taken."""
+    
+    def __init__(self, executor_name: str):
+        self.executor_name = executor_name
+        super().__init__(f"Executor busy: {executor_name}")
@@ -0,0 +1,130 @@
+"""Indexed approximate string matching for place names."""
+
+import heapq
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from difflib import SequenceMatcher
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def _trigrams(text: str) -> set:
+    """Padded, lowercased character trigrams ('  pa', ' par', ...)."""
+    padded = f"  {text.lower()} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class FuzzyIndex:
+    """
+    Trigram inverted index in front of difflib's similarity ratio.
+
+    ``get_close_matches`` scores candidates exactly like
+    ``difflib.get_close_matches`` (same ratio, same cutoff cascade, same
+    tie-breaking), but instead of scoring every name it only scores the
+    names that share the most trigrams with the query and whose length can
+    reach the cutoff. Scoring stays case-sensitive like difflib; trigrams
+    are lowercased so case differences never hide a candidate.
+
+    Names are numbered in length order, so the length window is a slice of
+    each posting list.
+
+    Trigram pruning is a heuristic: a weak match that shares no trigram
+    with the query (e.g. 'Pari' -> 'Madrid' at 0.6) is not suggested. On
+    typo'd city names the best match agrees with difflib in over 99% of
+    lookups; bench_fuzzy_index.py measures agreement and latency.
+
+    Sized for the shipped city lists (a few hundred names, tens of
+    microseconds per lookup). Lookups stay under a millisecond up to about
+    20k names; at 100k names they take about 2.5 ms at the median, because
+    common trigrams ('  sa') have posting lists thousands of names long.
+    Gazetteers that large are out of scope: the offline gazetteer is only
+    used for exact lookups, never for suggestions.
+    """
+
+    def __init__(self, names: Iterable[str], max_candidates: int = 64):
+        """
+        Build the index.
+
+        Args:
+            names: Names to index (duplicates are indexed once)
+            max_candidates: Names scored per lookup, best trigram overlap first
+        """
+        self.names: List[str] = list(dict.fromkeys(names))
+        self.max_candidates = max_candidates
+        self._by_length = sorted(self.names, key=len)
+        self._lengths = [len(name) for name in self._by_length]
+        self._exact: Dict[str, str] = {}
+        self._postings: Dict[str, List[int]] = {}
+
+        for name in self.names:
+            self._exact.setdefault(name.lower(), name)
+        for i, name in enumerate(self._by_length):
+            for gram in _trigrams(name):
+                self._postings.setdefault(gram, []).append(i)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def exact(self, name: str) -> Optional[str]:
+        """Return the indexed spelling of name (case-insensitive), or None."""
+        return self._exact.get(name.lower())
+
+    def search(self, word: str, n: int = 3, cutoff: float = 0.6) -> List[Tuple[float, str]]:
+        """
+        Find the best matches for word with their similarity ratios.
+
+        Args:
+            word: Query string
+            n: Maximum number of matches
+            cutoff: Minimum SequenceMatcher ratio (0.0-1.0)
+
+        Returns:
+            List of (ratio, name), best first
+        """
+        if not word or n <= 0:
+            return []
+
+        # Lengths outside this range cannot reach the cutoff (difflib's real_quick_ratio bound)
+        length = len(word)
+        first = bisect_left(self._lengths, cutoff * length / (2 - cutoff) - 1e-9)
+        end = bisect_right(self._lengths, (2 - cutoff) * length / cutoff + 1e-9) if cutoff else len(self._lengths)
+
+        windows = (ids[bisect_left(ids, first):bisect_left(ids, end)]
+                   for ids in map(self._postings.get, _trigrams(word)) if ids)
+        overlap = Counter(chain.from_iterable(windows))
+        candidates = [i for i, _ in overlap.most_common(self.max_candidates)]
+
+        # Same cascade and ordering as difflib.get_close_matches; once n matches
+        # are kept, the cascade also skips names that cannot beat the worst one
+        matcher = SequenceMatcher()
+        matcher.set_seq2(word)
+        best: List[Tuple[float, str]] = []
+        bar = cutoff
+        for i in candidates:
+            matcher.set_seq1(self._by_length[i])
+            if (matcher.real_quick_ratio() >= bar and
+                    matcher.quick_ratio() >= bar and
+                    matcher.ratio() >= bar):
+                match = (matcher.ratio(), self._by_length[i])
+                if len(best) < n:
+                    heapq.heappush(best, match)
+                else:
+                    heapq.heappushpop(best, match)
+                if len(best) == n:
+                    bar = best[0][0]
+
+        return sorted(best, reverse=True)
+
+    def get_close_matches(self, word: str, n: int = 3, cutoff: float = 0.6) -> List[str]:
+        """
+        Drop-in replacement for difflib.get_close_matches over the indexed names.
+
+        Args:
+            word: Query string
+            n: Maximum number of matches
+            cutoff: Minimum SequenceMatcher ratio (0.0-1.0)
+
+        Returns:
+            Best matching names, best first
+        """
+        return [name for _, name in self.search(word, n, cutoff)]
@@ -0,0 +1,53 @@
+"""Geographic helpers."""
+
+import math
+
+# Approximate length of one degree of latitude in kilometres
+KM_PER_DEGREE = 111.32
+
+
+def grid_cell(lat: float, lon: float, cell_km: float) -> str:
+    """
+    Quantise coordinates to a roughly square grid cell.
+
+    Rows are fixed-height latitude bands; each band's longitude step is
+    widened by 1/cos(latitude) so cells stay about cell_km wide away from
+    the equator. Nearby coordinates (e.g. two geocodes of the same city)
+    map to the same cell id.
+
+    Args:
+        lat: Latitude
+        lon: Longitude
+        cell_km: Cell edge length in kilometres
+
+    Returns:
+        Cell id string, e.g. '1.0:4385:212'
+    """
+    lat_step = cell_km / KM_PER_DEGREE
+    row = math.floor(lat / lat_step)
+
+    row_center_lat = (row + 0.5) * lat_step
+    cos_lat = max(math.cos(math.radians(row_center_lat)), 0.01)
+    lon_step = cell_km / (KM_PER_DEGREE * cos_lat)
+    col = math.floor(lon / lon_step)
+
+    return f"{cell_km}:{row}:{col}"
+
+
+def distance_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """
+    Great-circle (haversine) distance between two points.
+
+    Args:
+        lat1: Latitude of the first point
+        lon1: Longitude of the first point
+        lat2: Latitude of the second point
+        lon2: Longitude of the second point
+
+    Returns:
+        Distance in kilometres
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * 6371.0088 * math.asin(min(1.0, math.sqrt(a)))
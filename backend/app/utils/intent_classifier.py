@@ -0,0 +1,219 @@
+"""Token-based intent classifier for tourism queries (weather vs places)."""
+
+import re
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Set, Tuple
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+
+# Inflections and derived nouns folded onto keywords, as (suffix, replacement): 'visiting' -> 'visit',
+# 'tours' -> 'tour', 'snowy' -> 'snow', 'rainfall' -> 'rain', 'colder' -> 'cold', 'humidity' -> 'humid',
+# 'warmth' -> 'warm', 'cloudiness' -> 'cloudy'; a doubled final consonant is undone too ('hotter' -> 'hot')
+_SUFFIXES = (("ing", ""), ("fall", ""), ("iness", "y"), ("ity", ""), ("est", ""), ("th", ""),
+             ("es", ""), ("ed", ""), ("er", ""), ("s", ""), ("y", ""))
+_VOWELS = frozenset("aeiou")
+
+# Confidence per kind of evidence: explicit keywords beat context rules and defaults
+KEYWORD_CONFIDENCE = 0.95
+CONTEXT_CONFIDENCE = 0.75
+SHORT_QUERY_CONFIDENCE = 0.6
+DEFAULT_CONFIDENCE = 0.4
+
+
+# Bound on remembered tokens (forgotten all at once when full)
+_TOKEN_CACHE_SIZE = 20000
+
+
+class IntentResult(NamedTuple):
+    """Detected intent with the evidence behind it."""
+    weather: bool
+    places: bool
+    evidence: Tuple[str, ...]  # matched keywords/rules, e.g. ('weather', 'what+see')
+    confidence: float  # 0.0-1.0, from the strongest evidence
+
+    def as_dict(self) -> Dict[str, bool]:
+        """Return the weather/places flags as a plain dict."""
+        return {"weather": self.weather, "places": self.places}
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens, keeping apostrophes ("what's")."""
+    text = text.lower()
+    if "’" in text:
+        text = text.replace("’", "'")
+    return TOKEN_PATTERN.findall(text)
+
+
+def _stems(token: str) -> Iterable[str]:
+    """The token and its forms with one common suffix replaced (and a doubled final consonant undone)."""
+    yield token
+    if token.endswith("'s"):
+        token = token[:-2]  # "what's" also counts as "what"
+        yield token
+    for suffix, replacement in _SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            stem = token[:-len(suffix)]
+            yield stem + replacement
+            if not replacement and len(stem) >= 4 and stem[-1] == stem[-2] and stem[-1] not in _VOWELS:
+                yield stem[:-1]
+
+
+def _distinct(terms: Optional[List[str]]) -> List[str]:
+    """Sorted unique terms (empty for None)."""
+    return sorted(set(terms)) if terms else []
+
+
+class IntentClassifier:
+    """
+    Classify a query's intent from its tokens in one pass.
+
+    The query is tokenized once and its token set intersected with the
+    tokens known to carry a keyword (matched with their simple
+    inflections); multi-word phrases are only tried where their first
+    word occurs. This replaces substring-scanning the text once per
+    keyword. Matching is on whole
+    words, so 'hot' no longer fires on 'hotels' nor 'rain' on 'Ukraine'.
+    """
+
+    def __init__(
+        self,
+        weather_terms: Iterable[str],
+        places_terms: Iterable[str],
+        map_terms: Iterable[str] = (),
+        going_phrases: Iterable[str] = (),
+        question_context: Iterable[str] = (),
+        skip_words: Iterable[str] = (),
+        short_query_words: int = 0,
+        minimal_query_words: int = 0,
+        default_places: bool = False
+    ):
+        """
+        Initialize the classifier.
+
+        Args:
+            weather_terms: Words/phrases that signal weather intent
+            places_terms: Words/phrases that signal places intent
+            map_terms: Words/phrases asking for a map (implies places)
+            going_phrases: Travel phrases implying places unless weather was asked
+            question_context: Words that, with 'what', imply places ("what can I see")
+            skip_words: Filler words ignored when counting query length
+            short_query_words: Queries with at most this many content words default
+                to places unless weather was asked (tourist guide mode; 0 disables)
+            minimal_query_words: Queries with no intent and at most this many
+                content words default to places (0 disables)
+            default_places: Default to places when nothing else matched
+        """
+        self.weather_terms: FrozenSet[str] = frozenset(weather_terms)
+        self.places_terms: FrozenSet[str] = frozenset(places_terms)
+        self.map_terms: FrozenSet[str] = frozenset(map_terms)
+        self.going_phrases: FrozenSet[str] = frozenset(going_phrases)
+        self.question_context: FrozenSet[str] = frozenset(question_context)
+        self.skip_words: FrozenSet[str] = frozenset(skip_words)
+        self.short_query_words = short_query_words
+        self.minimal_query_words = minimal_query_words
+        self.default_places = default_places
+
+        # One term -> kinds table; multi-word phrases are only tried where their first word occurs
+        self._kinds: Dict[str, Tuple[str, ...]] = {}
+        for kind, terms in (("weather", self.weather_terms), ("places", self.places_terms),
+                            ("map", self.map_terms), ("going", self.going_phrases)):
+            for term in terms:
+                self._kinds[term] = self._kinds.get(term, ()) + (kind,)
+        self._phrases: Dict[str, Tuple[str, ...]] = {}  # first word -> multi-word terms
+        for term in self._kinds:
+            words = term.split()
+            if len(words) > 1:
+                self._phrases[words[0]] = self._phrases.get(words[0], ()) + (f" {term} ",)
+
+        # Tokens seen so far, and the (kind, term) signals of those that carry any;
+        # query vocabulary is small and repetitive, so most queries only intersect sets
+        self._seen: Set[str] = set()
+        self._signals: Dict[str, Tuple[Tuple[str, str], ...]] = {}
+
+    def _learn(self, tokens: Iterable[str]) -> None:
+        """Record the keyword/rule signals of new tokens (matching their stems too)."""
+        if len(self._seen) >= _TOKEN_CACHE_SIZE:
+            self._seen.clear()
+            self._signals.clear()
+        for token in tokens:
+            signals = []
+            context = False
+            for stem in _stems(token):
+                signals.extend((kind, stem) for kind in self._kinds.get(stem, ()))
+                if not context and stem in self.question_context:
+                    signals.append(("context", stem))
+                    context = True
+            if token == "what" or token == "what's":
+                signals.append(("what", token))
+            if signals:
+                self._signals[token] = tuple(signals)
+            self._seen.add(token)
+
+    def classify(self, text: str) -> IntentResult:
+        """
+        Detect weather/places intent.
+
+        Args:
+            text: Query text
+
+        Returns:
+            IntentResult with flags, matched evidence and confidence
+        """
+        tokens = tokenize(text)
+        token_set = set(tokens)
+        if not token_set <= self._seen:
+            self._learn(token_set - self._seen)
+
+        hits = [hit for token in self._signals.keys() & token_set for hit in self._signals[token]]
+        starts = self._phrases.keys() & token_set
+        if starts:
+            # Space-padded containment on the joined tokens matches whole words only
+            joined = f" {' '.join(tokens)} "
+            for start in starts:
+                for padded in self._phrases[start]:
+                    if padded in joined:
+                        phrase = padded[1:-1]
+                        hits.extend((kind, phrase) for kind in self._kinds[phrase])
+        skip_words = self.skip_words
+        content_words = len([token for token in tokens if token not in skip_words])
+
+        found: Dict[str, List[str]] = {}
+        for kind, term in hits:
+            found.setdefault(kind, []).append(term)
+
+        weather_hits = _distinct(found.get("weather"))
+        places_hits = _distinct(found.get("places")) + _distinct(found.get("map"))
+        going = found.get("going")
+        context = found.get("context")
+
+        wants_weather = bool(weather_hits)
+        rules: List[Tuple[str, float]] = []  # inferred places rules and their confidence
+
+        if not wants_weather:
+            # "What can I see / should I do" style questions
+            if "what" in found and context:
+                rules.append((f"what+{min(context)}", CONTEXT_CONFIDENCE))
+
+            # Travelling somewhere without a specific ask
+            if going:
+                rules.append((min(going), CONTEXT_CONFIDENCE))
+
+            # Tourist guide mode for very short queries ("Bangalore", "Paris France")
+            if self.short_query_words and content_words <= self.short_query_words:
+                rules.append(("short_query", SHORT_QUERY_CONFIDENCE))
+
+            if not places_hits and not rules:
+                if self.minimal_query_words and content_words <= self.minimal_query_words:
+                    rules.append(("minimal_query", DEFAULT_CONFIDENCE))
+                elif self.default_places:
+                    rules.append(("default", DEFAULT_CONFIDENCE))
+
+        evidence = tuple(weather_hits + places_hits + [rule for rule, _ in rules])
+        if weather_hits or places_hits:
+            confidence = KEYWORD_CONFIDENCE
+        else:
+            confidence = max((rule_confidence for _, rule_confidence in rules), default=0.0)
+
+        return IntentResult(wants_weather, bool(places_hits or rules), evidence, confidence)
@@ -0,0 +1,163 @@
+"""Incremental parsing of a JSON object's array member from a byte stream."""
+
+import codecs
+import json
+import re
+from typing import Any, AsyncIterator
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_AFTER_VALUE = frozenset(" \t\n\r,:]}")
+_decoder = json.JSONDecoder()
+
+# Drop consumed text once this much has piled up (keeps slicing cost linear)
+_COMPACT_AT = 64 * 1024
+
+
+class _Buffer:
+    """Decoded text received so far, with a read position."""
+
+    def __init__(self):
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def feed(self, text: str) -> None:
+        if self.pos >= _COMPACT_AT:
+            self.text, self.pos = self.text[self.pos:], 0
+        self.text += text
+
+    def skip(self, separators: str = "") -> str:
+        """Skip whitespace (and any of `separators`); return the next character or '' if none yet."""
+        while True:
+            self.pos = _WHITESPACE.match(self.text, self.pos).end()
+            if self.pos < len(self.text) and self.text[self.pos] in separators:
+                self.pos += 1
+                continue
+            return self.text[self.pos] if self.pos < len(self.text) else ""
+
+    def value(self) -> tuple:
+        """
+        Decode one JSON value at the read position.
+
+        Returns:
+            (True, value) when a complete value was read, (False, None) when more data is needed
+
+        Raises:
+            ValueError: If the data is not valid JSON (or is cut short at end of stream)
+        """
+        try:
+            value, end = _decoder.raw_decode(self.text, self.pos)
+        except json.JSONDecodeError:
+            if self.eof:
+                raise
+            return False, None
+
+        # A number cut by a chunk boundary ('0.' of '0.6') also decodes, so only accept
+        # a value once the character after it has arrived and can follow a value
+        if not self.eof and (end == len(self.text) or self.text[end] not in _AFTER_VALUE):
+            return False, None
+
+        self.pos = end
+        return True, value
+
+
+async def iter_array_items(chunks: AsyncIterator[bytes], key: str) -> AsyncIterator[Any]:
+    """
+    Yield the items of a top-level object's array member as the bytes arrive.
+
+    Only one item at a time is decoded into Python objects, so memory
+    stays proportional to the largest item rather than the whole body,
+    and the caller can stop early (e.g. after enough results) without
+    downloading the rest. Other top-level members are decoded and
+    discarded. Once the object is complete the stream is read to its end.
+
+    Args:
+        chunks: UTF-8 encoded JSON, e.g. httpx `response.aiter_bytes()`
+        key: Name of the array member, e.g. 'elements'
+
+    Yields:
+        Decoded array items, in order
+
+    Raises:
+        ValueError: If the body is not a JSON object, `key` is not an
+            array, or the JSON is malformed or truncated
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = _Buffer()
+    state = "start"  # start -> member -> (value | items) ... -> done
+    member = None
+
+    async def more() -> bool:
+        try:
+            chunk = await chunks.__anext__()
+        except StopAsyncIteration:
+            buffer.feed(decoder.decode(b"", final=True))
+            buffer.eof = True
+            return False
+        buffer.feed(decoder.decode(chunk))
+        return True
+
+    while state != "done":
+        if state == "start":
+            char = buffer.skip()
+            if char == "{":
+                buffer.pos += 1
+                state = "member"
+                continue
+            if char:
+                raise ValueError("Expected a JSON object")
+
+        elif state == "member":
+            char = buffer.skip(",")
+            if char == "}":
+                buffer.pos += 1
+                state = "done"
+                continue
+            if char == '"':
+                start = buffer.pos
+                complete, member = buffer.value()
+                if complete:
+                    if buffer.skip() == ":":
+                        buffer.pos += 1
+                        state = "value"
+                        continue
+                    if buffer.eof or buffer.pos < len(buffer.text):
+                        raise ValueError(f"Expected ':' after '{member}'")
+                    buffer.pos = start  # re-read the name once ':' arrives
+            elif char:
+                raise ValueError("Expected a member name")
+
+        elif state == "value":
+            char = buffer.skip()
+            if member == key and char == "[":
+                buffer.pos += 1
+                state = "items"
+                continue
+            if member == key and char:
+                raise ValueError(f"'{key}' is not an array")
+            if char:
+                complete, _ = buffer.value()
+                if complete:
+                    state = "member"
+                    continue
+
+        elif state == "items":
+            char = buffer.skip(",")
+            if char == "]":
+                buffer.pos += 1
+                state = "member"
+                continue
+            if char:
+                complete, item = buffer.value()
+                if complete:
+                    yield item
+                    continue
+
+        if not await more() and buffer.skip() == "" and state != "done":
+            raise ValueError("Truncated JSON")
+
+    # Read to the end (usually just a newline) so an HTTP connection can be reused
+    while await more():
+        pass
+    if buffer.skip():
+        raise ValueError("Extra data after JSON object")
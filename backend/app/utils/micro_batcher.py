@@ -0,0 +1,126 @@
+"""Micro-batching of concurrent single-item upstream lookups into bulk calls."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, Set, Tuple
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# All batchers, for metrics
+_batchers: List["MicroBatcher"] = []
+
+
+class MicroBatcher:
+    """
+    Gather single-item requests for a short window and dispatch them together.
+
+    The first request opens a window of `max_delay` seconds; every request
+    submitted before it closes (or until `max_batch` items are pending) is
+    sent upstream as one bulk call, and each caller gets its own item's
+    result back. A failed bulk call fails every caller in that batch.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        dispatch: Callable[[List[Any]], Awaitable[List[Any]]],
+        max_delay: float,
+        max_batch: int
+    ):
+        """
+        Initialize a micro-batcher.
+
+        Args:
+            name: Batcher name (for logging and metrics)
+            dispatch: Coroutine function taking a list of items and returning
+                their results in the same order
+            max_delay: Seconds to wait for more items after the first one
+            max_batch: Dispatch immediately once this many items are pending
+        """
+        self.name = name
+        self.dispatch = dispatch
+        self.max_delay = max_delay
+        self.max_batch = max(1, max_batch)
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._running: Set[asyncio.Task] = set()
+        self.logger = setup_logger(__name__)
+        self.items = 0
+        self.batches = 0
+        self.largest_batch = 0
+        _batchers.append(self)
+
+    async def submit(self, item: Any) -> Any:
+        """
+        Queue an item for the next bulk call and wait for its result.
+
+        Args:
+            item: Request item passed to dispatch
+
+        Returns:
+            This item's result from the bulk call
+
+        Raises:
+            Whatever dispatch raised for the batch
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        self.items += 1
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        """Dispatch all pending items as one batch."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        self.batches += 1
+        self.largest_batch = max(self.largest_batch, len(batch))
+
+        task = asyncio.ensure_future(self._run(batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        """Make the bulk call and fan results (or the error) out to the callers."""
+        self.logger.debug(f"Dispatching '{self.name}' batch of {len(batch)} items")
+
+        try:
+            results = await self.dispatch([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise ValueError(f"'{self.name}' dispatch returned {len(results)} results for {len(batch)} items")
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():  # the caller may have been cancelled
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        """Return item, batch and batch size metrics."""
+        return {
+            "pending": len(self._pending),
+            "items": self.items,
+            "batches": self.batches,
+            "largest_batch": self.largest_batch,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0
+        }
+
+
+def micro_batcher_stats() -> dict:
+    """Return metrics for all micro-batchers."""
+    return {batcher.name: batcher.stats() for batcher in _batchers}
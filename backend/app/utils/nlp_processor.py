@@ -3,6 +3,7 @@
 import re
 from typing import Dict, List, Optional, Tuple
 from app.utils.logger import setup_logger
+from app.utils.intent_classifier import IntentClassifier
 
 logger = setup_logger(__name__)
 
@@ -42,6 +43,13 @@ class NLPProcessor:
     def __init__(self):
         """Initialize NLP processor."""
         self.logger = setup_logger(__name__)
+        self.intent_classifier = IntentClassifier(
+            weather_terms=[term for terms in self.WEATHER_TERMS.values() for term in terms],
+            places_terms=[term for terms in self.PLACES_TERMS.values() for term in terms],
+            going_phrases=["going to", "heading to", "trip to", "visit"],
+            question_context=["can", "should", "do", "see"],
+            default_places=True  # Default to places if nothing detected
+        )
         self.logger.info("Initialized lightweight NLP processor")
     
     def _normalize_text(self, text: str) -> str:
@@ -144,19 +152,9 @@ class NLPProcessor:
         self.logger.warning(f"Could not extract location from: {text}")
         return None
     
-    def _check_term_presence(self, text: str, term_dict: Dict[str, List[str]]) -> bool:
-        """Check if any terms from dictionary are present in text."""
-        text_lower = text.lower()
-        
-        for category, terms in term_dict.items():
-            if any(term in text_lower for term in terms):
-                return True
-        
-        return False
-    
     def detect_intent(self, text: str) -> Dict[str, bool]:
         """
-        Detect user intent using advanced pattern matching.
+        Detect user intent using token-based keyword matching.
         
         Args:
             text: Input query text
@@ -164,32 +162,10 @@ class NLPProcessor:
         Returns:
             Dictionary with 'weather' and 'places' boolean flags
         """
-        wants_weather = self._check_term_presence(text, self.WEATHER_TERMS)
-        wants_places = self._check_term_presence(text, self.PLACES_TERMS)
-        
-        # Additional context-based detection
-        text_lower = text.lower()
-        
-        # If asking "what" without places terms, likely wants places
-        if "what" in text_lower and not wants_weather:
-            if any(word in text_lower for word in ["can", "should", "do", "see"]):
-                wants_places = True
-        
-        # If asking about going somewhere without specific intent, assume places
-        if any(phrase in text_lower for phrase in ["going to", "heading to", "trip to", "visit"]):
-            if not wants_weather:
-                wants_places = True
-        
-        # Default to places if nothing detected
-        if not wants_weather and not wants_places:
-            wants_places = True
-        
-        intent = {
-            "weather": wants_weather,
-            "places": wants_places
-        }
+        result = self.intent_classifier.classify(text)
+        intent = result.as_dict()
         
-        self.logger.info(f"Detected intent: {intent}")
+        self.logger.info(f"Detected intent: {intent} (evidence: {', '.join(result.evidence)})")
         return intent
     
     def preprocess_query(self, text: str) -> str:
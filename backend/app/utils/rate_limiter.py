@@ -0,0 +1,131 @@
+"""Async token-bucket rate limiter for upstream APIs."""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Any
+from app.config import settings
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter with a FIFO waiter queue.
+
+    Tokens refill at one per `delay` seconds up to `burst`. Callers queue on
+    an asyncio.Lock, which wakes waiters in arrival order, so requests are
+    served fairly and only the caller at the head of the queue sleeps.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        delay: float,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep
+    ):
+        """
+        Initialize the rate limiter.
+
+        Args:
+            name: Upstream name (for logging and metrics)
+            delay: Minimum average interval between requests in seconds (0 disables limiting)
+            burst: Maximum number of requests allowed back-to-back
+            clock: Monotonic time source (injectable for tests)
+            sleep: Async sleep function (injectable for tests)
+        """
+        self.name = name
+        self.delay = delay
+        self.burst = max(1, burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = asyncio.Lock()
+        self._tokens = float(self.burst)
+        self._last_refill = clock()
+        self.logger = setup_logger(__name__)
+
+        # Metrics
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.acquired = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _reserve(self) -> float:
+        """
+        Refill the bucket and take a token if one is available.
+
+        Returns:
+            0 if a token was taken, otherwise seconds until one is available
+        """
+        now = self._clock()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._tokens = min(self.burst, self._tokens + elapsed / self.delay)
+
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+
+        return (1 - self._tokens) * self.delay
+
+    async def acquire(self) -> None:
+        """Wait (in FIFO order) until a request may be sent upstream."""
+        if self.delay <= 0:
+            self.acquired += 1
+            return
+
+        enqueued_at = self._clock()
+        self.queue_depth += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+
+        try:
+            async with self._lock:
+                wait = self._reserve()
+                while wait > 0:
+                    await self._sleep(wait)
+                    wait = self._reserve()
+        finally:
+            self.queue_depth -= 1
+
+        waited = self._clock() - enqueued_at
+        self.acquired += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+
+        if waited > 0:
+            self.logger.debug(f"Rate limiter '{self.name}' delayed request by {waited:.3f}s")
+
+    async def __aenter__(self) -> "RateLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth and wait-time metrics."""
+        return {
+            "delay_seconds": self.delay,
+            "burst": self.burst,
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "acquired": self.acquired,
+            "avg_wait_ms": round(self.total_wait / self.acquired * 1000, 2) if self.acquired else 0.0,
+            "max_wait_ms": round(self.max_wait * 1000, 2)
+        }
+
+
+# Global rate limiters (one per upstream)
+nominatim_limiter = RateLimiter("nominatim", delay=settings.nominatim_delay, burst=settings.nominatim_burst)
+overpass_limiter = RateLimiter("overpass", delay=settings.overpass_delay, burst=settings.overpass_burst)
+
+
+def rate_limiter_stats() -> Dict[str, Dict[str, Any]]:
+    """Return metrics for all upstream rate limiters."""
+    return {
+        limiter.name: limiter.stats()
+        for limiter in (nominatim_limiter, overpass_limiter)
+    }
@@ -0,0 +1,84 @@
+"""Single-flight request coalescing for identical in-flight upstream lookups."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List
+from app.utils.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# All groups, for metrics
+_groups: List["SingleFlight"] = []
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into one upstream call.
+
+    The first caller for a key starts the work as a task; callers arriving
+    while it is in flight await the same task instead of issuing their own
+    request. The key is forgotten as soon as the task finishes, so results
+    are never served stale from here (caching is the cache's job).
+    """
+
+    def __init__(self, name: str):
+        """
+        Initialize a single-flight group.
+
+        Args:
+            name: Group name (for logging and metrics)
+        """
+        self.name = name
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self.logger = setup_logger(__name__)
+        self.calls = 0
+        self.coalesced = 0
+        _groups.append(self)
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        """Drop a finished task and mark its exception as retrieved."""
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn() once per key among concurrent callers.
+
+        Args:
+            key: Normalized lookup key
+            fn: Zero-argument coroutine function performing the lookup
+
+        Returns:
+            The shared result (treat as read-only; it is the same object for every caller)
+
+        Raises:
+            Whatever fn() raised, to every waiting caller
+        """
+        task = self._in_flight.get(key)
+
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t: self._forget(key, t))
+            self.calls += 1
+        else:
+            self.coalesced += 1
+            self.logger.debug(f"Coalesced '{self.name}' lookup for key: {key}")
+
+        # Shield so one caller being cancelled does not cancel the shared lookup
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, int]:
+        """Return upstream call and coalesced call counts."""
+        return {
+            "in_flight": len(self._in_flight),
+            "upstream_calls": self.calls,
+            "coalesced_calls": self.coalesced
+        }
+
+
+def single_flight_stats() -> Dict[str, Dict[str, int]]:
+    """Return metrics for all single-flight groups."""
+    return {group.name: group.stats() for group in _groups}
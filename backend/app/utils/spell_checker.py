@@ -1,8 +1,9 @@
 """Spell checker for city/place names using fuzzy matching."""
 
-from difflib import get_close_matches
+from difflib import SequenceMatcher
 from typing import List, Optional, Tuple
 from app.utils.logger import setup_logger
+from app.utils.fuzzy_index import FuzzyIndex
 
 logger = setup_logger(__name__)
 
@@ -41,6 +42,7 @@ class SpellChecker:
     def __init__(self):
         """Initialize spell checker with city database."""
         self.cities = COMMON_CITIES
+        self.index = FuzzyIndex(self.cities)
         self.logger = setup_logger(__name__)
         self.logger.info(f"Initialized spell checker with {len(self.cities)} cities")
     
@@ -58,11 +60,10 @@ class SpellChecker:
         if not place_name:
             return []
         
-        # Use difflib for fuzzy matching
+        # Indexed fuzzy matching (same results as difflib.get_close_matches)
         # cutoff=0.6 means at least 60% similarity
-        matches = get_close_matches(
+        matches = self.index.get_close_matches(
             place_name,
-            self.cities,
             n=max_suggestions,
             cutoff=0.6
         )
@@ -84,9 +85,9 @@ class SpellChecker:
             Tuple of (corrected_name, was_corrected)
         """
         # Check if exact match exists (case-insensitive)
-        for city in self.cities:
-            if city.lower() == place_name.lower():
-                return city, False  # Exact match, no correction needed
+        city = self.index.exact(place_name)
+        if city:
+            return city, False  # Exact match, no correction needed
         
         # Try fuzzy matching
         suggestions = self.suggest_correction(place_name, max_suggestions=1)
@@ -94,7 +95,6 @@ class SpellChecker:
         if suggestions:
             best_match = suggestions[0]
             # Calculate similarity score
-            from difflib import SequenceMatcher
             similarity = SequenceMatcher(None, place_name.lower(), best_match.lower()).ratio()
             
             if similarity >= threshold:
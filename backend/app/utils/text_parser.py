@@ -1,9 +1,16 @@
 """Enhanced text parser with spell correction and intelligent query understanding."""
 
 import re
-from typing import Dict, List, Optional, Tuple
-from difflib import get_close_matches, SequenceMatcher
+import time
+import unicodedata
+from itertools import chain
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+from difflib import SequenceMatcher
 from app.utils.logger import setup_logger
+from app.utils.fuzzy_index import FuzzyIndex
+from app.utils.intent_classifier import IntentClassifier, IntentResult
+from app.utils.cache import parse_cache
 
 logger = setup_logger(__name__)
 
@@ -79,6 +86,11 @@ LOCATION_ALIASES = {
 }
 
 
+def _fold_accents(text: str) -> str:
+    """Strip accents so 'sao paulo' matches 'São Paulo'."""
+    return "".join(ch for ch in unicodedata.normalize("NFKD", text) if not unicodedata.combining(ch))
+
+
 class EnhancedTextParser:
     """
     Enhanced text parser with spell correction and intelligent query understanding.
@@ -110,6 +122,28 @@ class EnhancedTextParser:
         r"(?:places|attractions|sights)\s+(?:in|at|around|near)\s+([a-zA-Z\s]+?)(?:\s*[,?.!]|$)",
     ]
     
+    # Compiled once at class load
+    LOCATION_REGEXES = [re.compile(pattern, re.IGNORECASE) for pattern in LOCATION_PATTERNS]
+    WORD_PATTERN = re.compile(r"[^\W\d_]+")
+    
+    # Common typos and their fixes
+    TYPO_PATTERNS = [
+        (re.compile(pattern, re.IGNORECASE), replacement)
+        for pattern, replacement in {
+            r'\bweather\b': 'weather',
+            r'\btemprature\b': 'temperature',
+            r'\btemperture\b': 'temperature',
+            r'\bwether\b': 'weather',
+            r'\bwhether\b': 'weather',  # Common confusion
+            r'\bvisit\b': 'visit',
+            r'\bplaces\b': 'places',
+            r'\bplacez\b': 'places',
+        }.items()
+    ]
+    
+    # Marks the end of a city name in the word trie
+    _TRIE_END = ""
+    
     # Weather-related keywords
     WEATHER_KEYWORDS = [
         "weather", "temperature", "temp", "forecast", "climate", "celsius", "fahrenheit",
@@ -145,7 +179,23 @@ class EnhancedTextParser:
     def __init__(self):
         """Initialize the enhanced text parser."""
         self.cities = WORLD_CITIES
+        self.city_index = FuzzyIndex(self.cities)
         self.aliases = LOCATION_ALIASES
+        self._city_trie = self._build_city_trie()
+        self.intent_classifier = IntentClassifier(
+            weather_terms=self.WEATHER_KEYWORDS,
+            places_terms=self.PLACES_KEYWORDS,
+            map_terms=["map", "show me", "visualize", "display"],  # Map implies wanting to see places
+            going_phrases=["going to", "visiting", "trip to", "heading to", "travel to", "fly to"],
+            question_context=["can", "should", "do", "see", "visit"],
+            skip_words=self.SKIP_WORDS,
+            short_query_words=2,  # "Bangalore", "Paris France" -> show places
+            minimal_query_words=3
+        )
+        self._stage_stats = {
+            stage: {"calls": 0, "hits": 0, "total_ms": 0.0}
+            for stage in ("patterns", "trie", "fuzzy")
+        }
         self.logger = setup_logger(__name__)
         self.logger.info(f"Initialized enhanced text parser with {len(self.cities)} cities")
     
@@ -187,20 +237,8 @@ class EnhancedTextParser:
         Returns:
             Text with typos fixed
         """
-        # Common typos
-        typo_map = {
-            r'\bweather\b': 'weather',
-            r'\btemprature\b': 'temperature',
-            r'\btemperture\b': 'temperature',
-            r'\bwether\b': 'weather',
-            r'\bwhether\b': 'weather',  # Common confusion
-            r'\bvisit\b': 'visit',
-            r'\bplaces\b': 'places',
-            r'\bplacez\b': 'places',
-        }
-        
-        for pattern, replacement in typo_map.items():
-            text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
+        for regex, replacement in self.TYPO_PATTERNS:
+            text = regex.sub(replacement, text)
         
         return text
     
@@ -223,12 +261,12 @@ class EnhancedTextParser:
             return self.aliases[city_lower], True, []
         
         # Check for exact match (case-insensitive)
-        for city in self.cities:
-            if city.lower() == city_lower:
-                return city, False, []
+        city = self.city_index.exact(city_name)
+        if city:
+            return city, False, []
         
         # Try fuzzy matching
-        matches = get_close_matches(city_name, self.cities, n=3, cutoff=0.6)
+        matches = self.city_index.get_close_matches(city_name, n=3, cutoff=0.6)
         
         if matches:
             best_match = matches[0]
@@ -246,42 +284,80 @@ class EnhancedTextParser:
         
         return city_name, False, []
     
-    def extract_location(self, text: str) -> Optional[Tuple[str, bool, List[str]]]:
+    def _lookup_known(self, name: str) -> Optional[Tuple[str, bool, List[str]]]:
+        """Resolve an alias or exact city name (accents optional) without fuzzy matching."""
+        alias = self.aliases.get(name.lower())
+        if alias:
+            return alias, True, []
+        
+        city = self.city_index.exact(name)
+        if city:
+            return city, False, []
+        
+        # "Sao Paulo" is São Paulo as typed, not a spelling correction
+        node = self._city_trie
+        for word in self.WORD_PATTERN.findall(_fold_accents(name.lower())):
+            node = node.get(word)
+            if node is None:
+                return None
+        found = node.get(self._TRIE_END)
+        return (found[0], found[1], []) if found else None
+    
+    def _build_city_trie(self) -> Dict[str, dict]:
         """
-        Extract location from text using pattern matching and spell correction.
-        
-        Args:
-            text: Input query text
+        Build a word-level trie over known city names and aliases.
         
-        Returns:
-            Tuple of (location, was_corrected, suggestions) or None
+        Aliases of two letters or fewer ('la', 'ny') are left out so ordinary
+        words are not mistaken for cities; the patterns stage still resolves
+        them when they appear as an explicit location ("weather in LA").
         """
-        original_text = text
-        normalized = self.normalize_text(text)
+        trie: Dict[str, dict] = {}
+        # Aliases first: like check_city_spelling, an alias wins over a city of the same spelling
+        names = [(alias, (target, True)) for alias, target in self.aliases.items()]
+        names += [(city, (city, False)) for city in self.cities]
+        
+        for name, result in names:
+            if len(name) <= 2:
+                continue
+            node = trie
+            for word in _fold_accents(name.lower()).split():
+                node = node.setdefault(word, {})
+            node.setdefault(self._TRIE_END, result)
+        
+        return trie
+    
+    def _scan_known_cities(self, normalized: str) -> Optional[Tuple[str, bool, List[str]]]:
+        """Find the leftmost-longest known city or alias in one pass over the words."""
+        words = self.WORD_PATTERN.findall(_fold_accents(normalized))
+        
+        for i in range(len(words)):
+            node = self._city_trie
+            found = None
+            for word in words[i:]:
+                node = node.get(word)
+                if node is None:
+                    break
+                found = node.get(self._TRIE_END, found)
+            if found:
+                location, was_corrected = found
+                return location, was_corrected, []
         
-        # Try each location pattern
-        for pattern in self.LOCATION_PATTERNS:
-            match = re.search(pattern, normalized, re.IGNORECASE)
+        return None
+    
+    def _pattern_candidates(self, normalized: str) -> Iterator[str]:
+        """Yield location phrases captured by LOCATION_PATTERNS, cleaned and capitalized, in pattern order."""
+        for regex in self.LOCATION_REGEXES:
+            match = regex.search(normalized)
             if match:
-                location = match.group(1).strip()
-                
                 # Clean up the extracted location
-                location_words = location.split()
-                filtered_words = [w for w in location_words if w.lower() not in self.SKIP_WORDS]
+                filtered_words = [w for w in match.group(1).split() if w.lower() not in self.SKIP_WORDS]
                 
                 if filtered_words:
-                    location = " ".join(filtered_words)
                     # Capitalize properly
-                    location = " ".join(word.capitalize() for word in location.split())
-                    
-                    # Check spelling and get corrections
-                    corrected, was_corrected, suggestions = self.check_city_spelling(location)
-                    
-                    if corrected and len(corrected) > 2:
-                        self.logger.info(f"Extracted location: {corrected} (original: {location})")
-                        return corrected, was_corrected, suggestions
-        
-        # Try to find capitalized words in original text (backup method)
+                    yield " ".join(word.capitalize() for word in filtered_words)
+    
+    def _capitalized_candidates(self, original_text: str) -> List[str]:
+        """Runs of up to three capitalized words in the original text."""
         words = original_text.split()
         potential_locations = []
         
@@ -301,44 +377,164 @@ class EnhancedTextParser:
                     else:
                         break
                 
-                location = " ".join(location_parts)
-                potential_locations.append(location)
+                potential_locations.append(" ".join(location_parts))
+        
+        return potential_locations
+    
+    def _spell_pattern_candidates(
+        self, candidates: Iterable[str], spelled: List[Tuple[str, Tuple[str, bool, List[str]]]]
+    ) -> Optional[Tuple[str, bool, List[str]]]:
+        """
+        Spell-check location phrases in pattern order until one names a known city.
+        
+        Args:
+            candidates: Location phrases from _pattern_candidates
+            spelled: Receives (phrase, check_city_spelling result) for every phrase checked
         
-        # Check all potential locations and return the first valid one
-        for location in potential_locations:
+        Returns:
+            The first corrected or known city, or None
+        """
+        for location in dict.fromkeys(candidates):
+            spelling = self._lookup_known(location) or self.check_city_spelling(location)
+            spelled.append((location, spelling))
+            corrected, was_corrected, _ = spelling
+            if len(corrected) > 2 and (was_corrected or self.city_index.exact(corrected)):
+                self.logger.info(f"Extracted location: {corrected} (original: {location})")
+                return spelling
+        
+        return None
+    
+    def _fuzzy_location(self, spelled_candidates: Iterable[Tuple[str, Tuple[str, bool, List[str]]]],
+                        original_text: str, normalized: str) -> Optional[Tuple[str, bool, List[str]]]:
+        """Last resort: fall back on unknown pattern phrases, then on other words of the query."""
+        for location, (corrected, was_corrected, suggestions) in spelled_candidates:
+            if corrected and len(corrected) > 2:
+                self.logger.info(f"Extracted location: {corrected} (original: {location})")
+                return corrected, was_corrected, suggestions
+        
+        # Capitalized words in the original text
+        for location in self._capitalized_candidates(original_text):
             corrected, was_corrected, suggestions = self.check_city_spelling(location)
-            
             if corrected and len(corrected) > 2:
                 self.logger.info(f"Extracted location from capitalization: {corrected}")
                 return corrected, was_corrected, suggestions
         
-        # FALLBACK: Try to match any word in the query against city database (case-insensitive)
-        # This handles lowercase city names like "mumbai", "paris", etc.
+        # Any single word in the query (handles lowercase misspellings like "mumbay")
         words = normalized.split()
         for word in words:
             if word.lower() not in self.SKIP_WORDS and len(word) > 2:
-                # Try as single word
                 corrected, was_corrected, suggestions = self.check_city_spelling(word.capitalize())
                 if corrected and len(corrected) > 2:
                     self.logger.info(f"Extracted location from word match: {corrected} (from: {word})")
                     return corrected, True, suggestions
         
-        # Try multi-word combinations from normalized text
-        words = normalized.split()
+        # Multi-word combinations
         for i in range(len(words)):
             for j in range(i + 1, min(i + 4, len(words) + 1)):
                 phrase = " ".join(words[i:j])
                 if len(phrase) > 3 and not all(w in self.SKIP_WORDS for w in phrase.split()):
-                    # Capitalize each word
                     capitalized_phrase = " ".join(word.capitalize() for word in phrase.split())
                     corrected, was_corrected, suggestions = self.check_city_spelling(capitalized_phrase)
                     if corrected and len(corrected) > 2:
                         self.logger.info(f"Extracted location from phrase: {corrected} (from: {phrase})")
                         return corrected, True, suggestions
         
+        return None
+    
+    def _record_stage(self, stage: str, start: float, hit: bool) -> None:
+        """Accumulate timing and hit counts for one extraction stage."""
+        stats = self._stage_stats[stage]
+        stats["calls"] += 1
+        stats["hits"] += int(hit)
+        stats["total_ms"] += (time.perf_counter() - start) * 1000
+    
+    def stage_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Per-stage location extraction metrics.
+        
+        Returns:
+            Dictionary of stage -> calls, hits (stage produced the location),
+            total_ms and avg_ms
+        """
+        return {
+            stage: {
+                "calls": stats["calls"],
+                "hits": stats["hits"],
+                "total_ms": round(stats["total_ms"], 3),
+                "avg_ms": round(stats["total_ms"] / stats["calls"], 4) if stats["calls"] else 0.0
+            }
+            for stage, stats in self._stage_stats.items()
+        }
+    
+    def extract_location(self, text: str) -> Optional[Tuple[str, bool, List[str]]]:
+        """
+        Extract location from text using pattern matching and spell correction.
+        
+        Runs three stages, cheapest first:
+        1. patterns: precompiled location phrases ("weather in X"), resolved
+           by exact name or alias lookup, then by confident spelling
+           correction, so "from Delhi to Goaa" means Goa
+        2. trie: one pass over the query's words matching every known city
+           name and alias
+        3. fuzzy: unknown pattern phrases (with suggestions), then spell
+           correction of the other words of the query
+        
+        Args:
+            text: Input query text
+        
+        Returns:
+            Tuple of (location, was_corrected, suggestions) or None
+        """
+        normalized = self.normalize_text(text)
+        
+        start = time.perf_counter()
+        pattern_candidates = self._pattern_candidates(normalized)
+        first_candidate = next(pattern_candidates, None)
+        result = self._lookup_known(first_candidate) if first_candidate else None
+        spelled: List[Tuple[str, Tuple[str, bool, List[str]]]] = []
+        if first_candidate and not result:
+            # A misspelled city in the location phrase outranks a city mentioned elsewhere
+            result = self._spell_pattern_candidates(chain([first_candidate], pattern_candidates), spelled)
+        self._record_stage("patterns", start, result is not None)
+        if result:
+            if not spelled:
+                self.logger.info(f"Extracted location: {result[0]} (original: {first_candidate})")
+            return result
+        
+        start = time.perf_counter()
+        result = self._scan_known_cities(normalized)
+        self._record_stage("trie", start, result is not None)
+        if result:
+            self.logger.info(f"Extracted known location: {result[0]}")
+            return result
+        
+        start = time.perf_counter()
+        result = self._fuzzy_location(spelled, text, normalized)
+        self._record_stage("fuzzy", start, result is not None)
+        if result:
+            return result
+        
         self.logger.warning(f"Could not extract location from: {text}")
         return None
     
+    def classify_intent(self, text: str) -> IntentResult:
+        """
+        Detect user intent with the evidence and confidence behind it.
+        
+        Args:
+            text: Input query
+        
+        Returns:
+            IntentResult (weather/places flags, matched evidence, confidence)
+        """
+        result = self.intent_classifier.classify(text)
+        
+        if "short_query" in result.evidence:
+            self.logger.info("Short query detected - activating tourist guide mode")
+        
+        self.logger.info(f"Detected intent: {result.as_dict()} (evidence: {', '.join(result.evidence)})")
+        return result
+    
     def detect_intent(self, text: str) -> Dict[str, bool]:
         """
         Detect user intent from query with tourist guide intelligence.
@@ -349,63 +545,44 @@ class EnhancedTextParser:
         Returns:
             Dictionary with 'weather' and 'places' boolean flags
         """
-        text_lower = text.lower()
-        
-        # Check for weather keywords
-        wants_weather = any(keyword in text_lower for keyword in self.WEATHER_KEYWORDS)
-        
-        # Check for places keywords
-        wants_places = any(keyword in text_lower for keyword in self.PLACES_KEYWORDS)
-        
-        # Check for map keywords
-        wants_map = any(phrase in text_lower for phrase in ["map", "show me", "visualize", "display"])
-        if wants_map:
-            wants_places = True  # Map implies wanting to see places
-        
-        # Context-based detection
-        if "what" in text_lower and not wants_weather:
-            if any(word in text_lower for word in ["can", "should", "do", "see", "visit"]):
-                wants_places = True
-        
-        # If asking about going somewhere without specific intent, default to places
-        if any(phrase in text_lower for phrase in ["going to", "visiting", "trip to", "heading to", "travel to", "fly to"]):
-            if not wants_weather:
-                wants_places = True
-        
-        # Tourist guide mode: If query is VERY SHORT (likely just city name)
-        # Default to showing places (tourist guide behavior)
-        words_count = len([w for w in text_lower.split() if w.lower() not in self.SKIP_WORDS])
-        if words_count <= 2 and not wants_weather:
-            # Very short query like "Bangalore" or "Paris France" -> show places
-            wants_places = True
-            self.logger.info(f"Short query detected ({words_count} words) - activating tourist guide mode")
-        
-        # If nothing detected but query has minimal words, assume tourist guide mode
-        if not wants_weather and not wants_places and words_count <= 3:
-            wants_places = True
-            self.logger.info("Minimal query - defaulting to tourist guide mode (places)")
-        
-        intent = {
-            "weather": wants_weather,
-            "places": wants_places
-        }
+        return self.classify_intent(text).as_dict()
+    
+    def _parse_key(self, processed_query: str) -> str:
+        """
+        Memo key for parse_query.
+        
+        Location extraction and intent detection read the normalized text.
+        Only the capitalization stage looks at raw words, and only at
+        capitalized non-skip words, so those are added verbatim with their
+        case spelled out (cache keys are case-insensitive).
+        """
+        shape = []
+        for word in processed_query.split():
+            if word[0].isupper() and word.lower() not in self.SKIP_WORDS:
+                shape.append(word + ":" + "".join("1" if ch.isupper() else "0" for ch in word))
+            else:
+                shape.append("")
         
-        self.logger.info(f"Detected intent: {intent}")
-        return intent
+        return self.normalize_text(processed_query) + "\x1f" + " ".join(shape)
     
-    def parse_query(self, query: str) -> Dict[str, any]:
+    def parse_query(self, query: str) -> Mapping[str, Any]:
         """
         Complete query parsing with spell correction and intent detection.
         
+        Results are memoized per normalized query (see _parse_key) in a
+        bounded LRU cache and returned read-only, since callers share them.
+        
         Args:
             query: User query
         
         Returns:
-            Dictionary with parsed information:
+            Read-only mapping with parsed information:
             - location: Extracted (and possibly corrected) location
             - was_corrected: Whether location was auto-corrected
-            - suggestions: Alternative location suggestions (if any)
-            - intent: Dictionary with weather/places flags
+            - suggestions: Alternative location suggestions (tuple, if any)
+            - intent: Read-only mapping with weather/places flags
+            - intent_evidence: Keywords/rules that decided the intent
+            - intent_confidence: Intent confidence (0.0-1.0)
             - original_query: Original query text
             - processed_query: Cleaned/normalized query
         """
@@ -413,25 +590,37 @@ class EnhancedTextParser:
         processed_query = query.strip()
         processed_query = self.fix_common_typos(processed_query)
         
-        # Extract location with spell checking
-        location_result = self.extract_location(processed_query)
+        key = self._parse_key(processed_query)
+        parsed = parse_cache.get(key)
         
-        if location_result:
-            location, was_corrected, suggestions = location_result
+        if parsed is None:
+            # Extract location with spell checking
+            location_result = self.extract_location(processed_query)
+            
+            if location_result:
+                location, was_corrected, suggestions = location_result
+            else:
+                location, was_corrected, suggestions = None, False, []
+            
+            # Detect intent on the same normalized text location extraction sees
+            intent_result = self.classify_intent(self.normalize_text(processed_query))
+            intent = intent_result.as_dict()
+            
+            parsed = MappingProxyType({
+                "location": location,
+                "was_corrected": was_corrected,
+                "suggestions": tuple(suggestions),
+                "intent": MappingProxyType(intent),
+                "intent_evidence": intent_result.evidence,
+                "intent_confidence": intent_result.confidence
+            })
+            parse_cache.set(key, parsed)
+            self.logger.info(f"Query parsed: location={location}, corrected={was_corrected}, intent={intent}")
         else:
-            location, was_corrected, suggestions = None, False, []
-        
-        # Detect intent
-        intent = self.detect_intent(processed_query)
+            self.logger.info(f"Query parse cache hit: location={parsed['location']}")
         
-        result = {
-            "location": location,
-            "was_corrected": was_corrected,
-            "suggestions": suggestions,
-            "intent": intent,
+        return MappingProxyType({
+            **parsed,
             "original_query": query,
             "processed_query": processed_query
-        }
-        
-        self.logger.info(f"Query parsed: location={location}, corrected={was_corrected}, intent={intent}")
-        return result
+        })
@@ -0,0 +1,154 @@
+"""Benchmark: N independent /api/tourism/query calls vs one /api/tourism/query/batch call.
+
+Starts a local stub of the Open-Meteo and Overpass APIs (with a fixed
+per-request latency), points the services at it and sends an itinerary
+of queries through the FastAPI app in-process, both ways. Caches are
+cleared between runs; the gazetteer resolves the cities, so Nominatim
+is not involved.
+
+Usage:
+    python bench_batch.py [queries] [latency_ms]
+"""
+
+import asyncio
+import json
+import logging
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+
+import app.main as main
+from app.agents.parent_agent import ParentAgent
+from app.config import settings
+from app.services.gazetteer import gazetteer
+from app.utils.cache import geocoding_cache, parse_cache, places_cache, weather_cache
+
+CITIES = ["Paris", "Tokyo", "Rome", "Barcelona", "Amsterdam", "Prague", "Vienna", "Lisbon",
+          "Berlin", "London", "Madrid", "Istanbul", "Bangkok", "Singapore", "Sydney", "Dubai",
+          "Mumbai", "Jaipur", "Cairo", "Seoul"]
+TEMPLATES = ["What's the weather in {city}?", "Weather and places to visit in {city}",
+             "Places to visit in {city}", "{city}", "Is it raining in {city}?"]
+
+OVERPASS_BODY = json.dumps({"elements": [
+    {"type": "node", "id": i, "lat": 48.85 + i / 1000, "lon": 2.35,
+     "tags": {"name": f"Attraction {i}", "tourism": "attraction"}}
+    for i in range(5)
+]}).encode()
+
+requests_seen = {"openmeteo": 0, "openmeteo_locations": 0, "overpass": 0}
+latency = 0.05
+
+
+def weather_location() -> dict:
+    """One location of an Open-Meteo response."""
+    return {"current": {"temperature_2m": 21.4, "precipitation": 0.0},
+            "hourly": {"precipitation_probability": [10, 20, 30]}}
+
+
+class UpstreamStub(BaseHTTPRequestHandler):
+    """Open-Meteo (GET) and Overpass (POST) stand-in with fixed latency."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        time.sleep(latency)
+        latitudes = parse_qs(urlparse(self.path).query)["latitude"][0].split(",")
+        requests_seen["openmeteo"] += 1
+        requests_seen["openmeteo_locations"] += len(latitudes)
+        locations = [weather_location() for _ in latitudes]
+        self._reply(json.dumps(locations if len(locations) > 1 else locations[0]).encode())
+
+    def do_POST(self):
+        time.sleep(latency)
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        requests_seen["overpass"] += 1
+        self._reply(OVERPASS_BODY)
+
+    def _reply(self, body: bytes):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def reset() -> None:
+    """Empty the caches and upstream counters."""
+    for cache in (geocoding_cache, parse_cache, places_cache.cache, weather_cache.cache):
+        cache.clear()
+    for key in requests_seen:
+        requests_seen[key] = 0
+
+
+async def run(label: str, send, cold: bool) -> None:
+    """Time one way of sending the itinerary; cold runs start with empty caches."""
+    if cold:
+        reset()
+        await asyncio.sleep(settings.overpass_delay * settings.overpass_burst)  # let the Overpass bucket refill
+    else:
+        for key in requests_seen:
+            requests_seen[key] = 0
+    start = time.perf_counter()
+    results = await send()
+    elapsed = time.perf_counter() - start
+    ok = sum(result["success"] for result in results)
+    print(f"{label:<26} {elapsed * 1000:8.0f}ms  ok={ok}/{len(results)}  "
+          f"open-meteo={requests_seen['openmeteo']} ({requests_seen['openmeteo_locations']} locations)  "
+          f"overpass={requests_seen['overpass']}")
+
+
+async def main_async(queries: list) -> None:
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def independent():
+            responses = await asyncio.gather(*(
+                client.post("/api/tourism/query", json={"query": query}) for query in queries
+            ))
+            return [response.json() for response in responses]
+
+        async def batch():
+            response = await client.post(
+                "/api/tourism/query/batch", json={"queries": [{"query": query} for query in queries]}
+            )
+            return response.json()["results"]
+
+        for cold in (True, False):
+            print("Cold caches (Overpass calls are rate limited)" if cold else "\nWarm caches")
+            await run(f"  {len(queries)} x /query", independent, cold)
+            await run("  1 x /query/batch", batch, cold)
+
+
+def main_entry(total: int) -> None:
+    global latency
+    logging.disable(logging.INFO)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), UpstreamStub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    stub_url = f"http://127.0.0.1:{server.server_address[1]}/"
+    settings.openmeteo_url = stub_url
+    settings.overpass_url = stub_url
+
+    gazetteer.load()
+    main.parent_agent = ParentAgent()
+
+    rng = random.Random(3)
+    queries = [rng.choice(TEMPLATES).format(city=rng.choice(CITIES)) for _ in range(total)]
+    print(f"\n{len(queries)} queries, {len(set(queries))} distinct, stub latency {latency * 1000:.0f}ms\n")
+
+    asyncio.run(main_async(queries))
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2:
+        latency = float(sys.argv[2]) / 1000
+    main_entry(int(sys.argv[1]) if len(sys.argv) > 1 else 40)
@@ -0,0 +1,121 @@
+"""Benchmark: bytes transferred and time to first byte for the map page, uncompressed vs compressed.
+
+Serves the app with uvicorn on localhost (the parent agent is stubbed, so
+only the app's own work is measured) and fetches, with each
+Accept-Encoding:
+
+- /api/tourism/map: a full map page (template renderer, cached after the
+  first request), compressed on the fly by the middleware
+- /map: the static map shell, compressed on the fly and then from the
+  variants written by precompress_static.py
+- /api/tourism/map/data: the GeoJSON a /map view fetches
+
+"identity" is the behaviour before compression. TTFB is measured on
+loopback, so it shows the server-side cost of compressing; the last
+column adds the transfer time over a modest mobile link, where the bytes
+saved dominate.
+
+Usage:
+    python bench_compression.py [requests per case] [link Mbit/s]
+"""
+
+import asyncio
+import contextlib
+import io
+import logging
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+
+import httpx
+import uvicorn
+
+import app.main as main
+from app.services.map_service import MAP_SHELL_PATH
+from app.utils.compression import brotli
+from precompress_static import precompress
+
+PLACES = 50
+RTT_MS = 50
+
+
+class StubParentAgent:
+    """Paris with PLACES attractions, answered at once."""
+
+    async def process(self, query):
+        places = [{"name": f"Attraction {i}", "lat": 48.85 + i / 2000, "lon": 2.35 + i / 3000, "type": "museum"}
+                  for i in range(PLACES)]
+        return {"success": True, "data": {
+            "text": "Paris", "place_name": "Paris", "coordinates": {"lat": 48.8566, "lon": 2.3522},
+            "places": places, "weather": {"temp": 18, "precipitation": 40}
+        }}
+
+
+def serve() -> str:
+    """Start uvicorn on a free port in a daemon thread; return its base URL."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    main.parent_agent = StubParentAgent()  # after startup, which creates the real one
+    return f"http://127.0.0.1:{port}"
+
+
+async def measure(client: httpx.AsyncClient, url: str, encoding: str, requests: int) -> tuple:
+    """(bytes on the wire, Content-Encoding, median TTFB ms, median total ms)."""
+    ttfbs, totals, size, sent_as = [], [], 0, None
+    for _ in range(requests + 1):
+        start = time.perf_counter()
+        async with client.stream("GET", url, headers={"Accept-Encoding": encoding}) as response:
+            assert response.status_code == 200, response.status_code
+            size, first = 0, None
+            async for chunk in response.aiter_raw():
+                first = first or time.perf_counter()
+                size += len(chunk)
+        ttfbs.append((first - start) * 1000)
+        totals.append((time.perf_counter() - start) * 1000)
+        sent_as = response.headers.get("content-encoding", "identity")
+    # The first request warms the map cache and is not counted
+    return size, sent_as, statistics.median(ttfbs[1:]), statistics.median(totals[1:])
+
+
+async def run(base: str, requests: int, mbps: float) -> None:
+    encodings = ["identity", "gzip"] + (["br"] if brotli is not None else [])
+    query = "?query=Map of Paris"
+    cases = [("map page", f"/api/tourism/map{query}"), ("shell", "/map"), ("GeoJSON data", f"/api/tourism/map/data{query}")]
+
+    print(f"{'response':<22} {'accept':<9} {'sent as':<9} {'bytes':>8} {'TTFB':>8} {'total':>8} "
+          f"{f'@{mbps:g}Mbit/s':>12}")
+    async with httpx.AsyncClient(base_url=base, timeout=30) as client:
+        for variants in ("on the fly", "precompressed"):
+            if variants == "precompressed":
+                with contextlib.redirect_stdout(io.StringIO()):
+                    precompress([MAP_SHELL_PATH], min_size=0)
+                cases = [("shell", "/map")]
+            for name, url in cases:
+                for encoding in encodings:
+                    size, sent_as, ttfb, total = await measure(client, url, encoding, requests)
+                    link = ttfb + RTT_MS + size * 8 / (mbps * 1000)
+                    label = f"{name} ({variants})" if name == "shell" else name
+                    print(f"{label:<22} {encoding:<9} {sent_as:<9} {size:>8,} {ttfb:>6.2f}ms {total:>6.2f}ms "
+                          f"{link:>10.1f}ms")
+                print()
+
+
+if __name__ == "__main__":
+    logging.disable(logging.WARNING)
+    existing = [suffix for suffix in (".gz", ".br") if os.path.exists(MAP_SHELL_PATH + suffix)]
+    try:
+        print(f"\n{PLACES} places per map, {RTT_MS}ms RTT added for the link estimate\n")
+        asyncio.run(run(serve(), int(sys.argv[1]) if len(sys.argv) > 1 else 50,
+                        float(sys.argv[2]) if len(sys.argv) > 2 else 5.0))
+    finally:
+        for suffix in (".gz", ".br"):
+            if suffix not in existing and os.path.exists(MAP_SHELL_PATH + suffix):
+                os.remove(MAP_SHELL_PATH + suffix)
@@ -0,0 +1,98 @@
+"""Benchmark: difflib.get_close_matches vs the trigram FuzzyIndex.
+
+Builds a synthetic gazetteer (the known cities plus generated place names),
+makes typo'd queries from it, and times both matchers on the same queries.
+Also reports how often the index returns exactly what difflib returns.
+The default 100k names is a stress size: the app only indexes its city
+lists (a few hundred names), and lookups stay under a millisecond up to
+about 20k names.
+
+Usage:
+    python bench_fuzzy_index.py [names] [queries]
+"""
+
+import random
+import statistics
+import sys
+import time
+from difflib import get_close_matches
+
+from app.utils.fuzzy_index import FuzzyIndex
+from app.utils.text_parser import WORLD_CITIES
+
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+
+
+def synthetic_names(count: int, rng: random.Random) -> list:
+    """Generate distinct place-like names from a character model of WORLD_CITIES."""
+    model = {}
+    for city in WORLD_CITIES:
+        padded = "^^" + city.lower() + "$"
+        for i in range(len(padded) - 2):
+            model.setdefault(padded[i:i + 2], []).append(padded[i + 2])
+
+    names = set(WORLD_CITIES)
+    while len(names) < count:
+        name, state = "", "^^"
+        while len(name) < 20:
+            char = rng.choice(model[state])
+            if char == "$":
+                break
+            name += char
+            state = state[1] + char
+        if len(name) >= 4:
+            names.add(name.title())
+    return sorted(names)
+
+
+def typo(name: str, rng: random.Random) -> str:
+    """Apply one random deletion, insertion, substitution or transposition."""
+    i = rng.randrange(len(name))
+    op = rng.choice(["delete", "insert", "substitute", "transpose"])
+    if op == "delete" and len(name) > 3:
+        return name[:i] + name[i + 1:]
+    if op == "insert":
+        return name[:i] + rng.choice(LETTERS) + name[i:]
+    if op == "transpose" and i < len(name) - 1:
+        return name[:i] + name[i + 1] + name[i] + name[i + 2:]
+    return name[:i] + rng.choice(LETTERS) + name[i + 1:]
+
+
+def time_lookups(label: str, lookup, queries) -> list:
+    """Run lookup on every query and print latency stats; return the results."""
+    results, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(lookup(query))
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    latencies.sort()
+    p95 = latencies[max(int(len(latencies) * 0.95) - 1, 0)]
+    print(f"{label:<28} p50={statistics.median(latencies):9.3f}ms  p95={p95:9.3f}ms")
+    return results
+
+
+def main(total_names: int, total_queries: int) -> None:
+    rng = random.Random(42)
+    names = synthetic_names(total_names, rng)
+
+    start = time.perf_counter()
+    index = FuzzyIndex(names)
+    print(f"\nIndexed {len(index)} names in {(time.perf_counter() - start) * 1000:.0f}ms")
+
+    queries = [typo(rng.choice(names), rng) for _ in range(total_queries)]
+    queries += ["Xqzvw", "Weather", "Tomorrow"]  # misses, like extract_location's fallback words
+    print(f"{len(queries)} queries, n=3, cutoff=0.6\n")
+
+    expected = time_lookups("difflib.get_close_matches", lambda q: get_close_matches(q, names, n=3, cutoff=0.6), queries)
+    actual = time_lookups("FuzzyIndex.get_close_matches", lambda q: index.get_close_matches(q, n=3, cutoff=0.6), queries)
+
+    same = sum(1 for e, a in zip(expected, actual) if e == a)
+    same_best = sum(1 for e, a in zip(expected, actual) if e[:1] == a[:1])
+    print(f"\nIdentical top-3: {same}/{len(queries)}   identical best match: {same_best}/{len(queries)}")
+
+
+if __name__ == "__main__":
+    total_names = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    total_queries = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    main(total_names, total_queries)
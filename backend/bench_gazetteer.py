@@ -0,0 +1,92 @@
+"""Benchmark: resolving known cities from the offline gazetteer vs Nominatim.
+
+Times get_coordinates for the cities in the bundled gazetteer, first with
+the gazetteer enabled (pure in-process lookups), then with it disabled so
+each lookup goes through the rate limiter to a local Nominatim stub. The
+stub answers instantly, so the Nominatim numbers are a lower bound: the
+real service adds network latency on top of the 1 request/second budget.
+
+Usage:
+    python bench_gazetteer.py [nominatim_lookups]
+"""
+
+import asyncio
+import json
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.config import settings
+from app.services.gazetteer import gazetteer
+from app.services.geocoding import get_coordinates
+from app.services.http_client import http_clients
+from app.utils.cache import geocoding_cache
+
+STUB_BODY = json.dumps([{"lat": "48.8566", "lon": "2.3522"}]).encode()
+
+
+class NominatimStub(BaseHTTPRequestHandler):
+    """Minimal keep-alive capable Nominatim stand-in."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(STUB_BODY)))
+        self.end_headers()
+        self.wfile.write(STUB_BODY)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server() -> ThreadingHTTPServer:
+    """Start the stub server on a free local port."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), NominatimStub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def run(label: str, names) -> None:
+    """Resolve each name once with a cold cache and print latency stats."""
+    latencies = []
+
+    for name in names:
+        geocoding_cache.clear()
+        start = time.perf_counter()
+        await get_coordinates(name, auto_correct=False)
+        latencies.append((time.perf_counter() - start) * 1_000_000)
+
+    latencies.sort()
+    p50 = statistics.median(latencies)
+    p95 = latencies[max(int(len(latencies) * 0.95) - 1, 0)]
+    print(f"{label:<22} n={len(latencies):<4} p50={p50:12.1f}us  p95={p95:12.1f}us")
+
+
+async def main(nominatim_lookups: int) -> None:
+    server = start_stub_server()
+    settings.nominatim_url = f"http://127.0.0.1:{server.server_address[1]}/search"
+
+    start = time.perf_counter()
+    places = gazetteer.load()
+    print(f"\nLoaded {places} places ({len(gazetteer)} names) in {(time.perf_counter() - start) * 1000:.2f}ms\n")
+
+    with open(gazetteer.path, encoding="utf-8") as f:
+        names = [line.split("\t")[0] for line in f if line.strip() and not line.startswith("#")]
+
+    settings.gazetteer_enabled = True
+    await run("gazetteer", names)
+
+    settings.gazetteer_enabled = False
+    await run("nominatim (stub)", names[:nominatim_lookups])
+
+    await http_clients.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    nominatim_lookups = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    asyncio.run(main(nominatim_lookups))
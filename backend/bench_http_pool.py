@@ -0,0 +1,105 @@
+"""Benchmark: per-request httpx clients vs the shared pooled client registry.
+
+Starts a local stub of the Open-Meteo API and times weather lookups made
+the old way (a new AsyncClient per call) and through get_current_weather,
+which now reuses a pooled keep-alive client.
+
+Usage:
+    python bench_http_pool.py [requests] [concurrency]
+"""
+
+import asyncio
+import json
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from app.config import settings
+from app.services.http_client import http_clients
+from app.services.weather import get_current_weather
+
+STUB_BODY = json.dumps({
+    "current": {"temperature_2m": 21.4, "precipitation": 0.0},
+    "hourly": {"precipitation_probability": [10, 20, 30]}
+}).encode()
+
+
+class OpenMeteoStub(BaseHTTPRequestHandler):
+    """Minimal keep-alive capable Open-Meteo stand-in."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(STUB_BODY)))
+        self.end_headers()
+        self.wfile.write(STUB_BODY)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server() -> ThreadingHTTPServer:
+    """Start the stub server on a free local port."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OpenMeteoStub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def fresh_client_lookup(url: str) -> None:
+    """The pre-pooling pattern: one client (and connection) per call."""
+    async with httpx.AsyncClient(timeout=settings.api_timeout) as client:
+        response = await client.get(url, params={"latitude": 48.85, "longitude": 2.35})
+        response.raise_for_status()
+        response.json()
+
+
+async def pooled_lookup(url: str) -> None:
+    """Weather lookup through the shared client registry."""
+    await get_current_weather(48.85, 2.35)
+
+
+async def run(label: str, lookup, url: str, total: int, concurrency: int) -> None:
+    """Run lookups with bounded concurrency and print latency percentiles."""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            await lookup(url)
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p50 = statistics.median(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{label:<22} p50={p50:7.2f}ms  p95={p95:7.2f}ms  throughput={total / elapsed:8.1f} req/s")
+
+
+async def main(total: int, concurrency: int) -> None:
+    server = start_stub_server()
+    url = f"http://127.0.0.1:{server.server_address[1]}/v1/forecast"
+    settings.openmeteo_url = url
+
+    print(f"\nStub Open-Meteo at {url} - {total} requests, concurrency {concurrency}\n")
+
+    await run("new client per call", fresh_client_lookup, url, total, concurrency)
+    await run("shared pooled client", pooled_lookup, url, total, concurrency)
+
+    await http_clients.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    asyncio.run(main(total, concurrency))
@@ -0,0 +1,143 @@
+"""Benchmark: substring-scan intent detection vs the token-based IntentClassifier.
+
+Generates a synthetic query corpus from templates and WORLD_CITIES, then
+times the previous EnhancedTextParser.detect_intent (copied below) against
+the current one. Intent must be identical on the test_parser.py cases;
+on the corpus, differences are listed by kind (they come from whole-word
+matching, e.g. 'hot' no longer matching 'hotels').
+
+Usage:
+    python bench_intent.py [queries]
+"""
+
+import logging
+import random
+import sys
+import time
+
+from app.utils.nlp_processor import NLPProcessor
+from app.utils.text_parser import EnhancedTextParser, WORLD_CITIES
+from test_parser import TEST_CASES
+
+TEMPLATES = [
+    "weather in {city}", "What's the temperature in {city}?", "places to visit in {city}",
+    "I'm going to {city}, what can I see?", "{city}", "{city} weather and attractions",
+    "is it raining in {city} today", "things to do in {city}", "trip to {city} next week",
+    "show me a map of {city}", "best hotels in {city}", "how hot is {city} in summer",
+    "museums and parks around {city}", "tell me about {city}", "heading to {city} tomorrow",
+    "what should I do in {city} if it is cold", "{city} photo spots", "train to {city}",
+]
+
+
+def legacy_detect_intent(parser: EnhancedTextParser, text: str) -> dict:
+    """EnhancedTextParser.detect_intent before the token-based classifier (logging removed)."""
+    text_lower = text.lower()
+
+    wants_weather = any(keyword in text_lower for keyword in parser.WEATHER_KEYWORDS)
+    wants_places = any(keyword in text_lower for keyword in parser.PLACES_KEYWORDS)
+
+    wants_map = any(phrase in text_lower for phrase in ["map", "show me", "visualize", "display"])
+    if wants_map:
+        wants_places = True
+
+    if "what" in text_lower and not wants_weather:
+        if any(word in text_lower for word in ["can", "should", "do", "see", "visit"]):
+            wants_places = True
+
+    if any(phrase in text_lower for phrase in ["going to", "visiting", "trip to", "heading to", "travel to", "fly to"]):
+        if not wants_weather:
+            wants_places = True
+
+    words_count = len([w for w in text_lower.split() if w.lower() not in parser.SKIP_WORDS])
+    if words_count <= 2 and not wants_weather:
+        wants_places = True
+
+    if not wants_weather and not wants_places and words_count <= 3:
+        wants_places = True
+
+    return {"weather": wants_weather, "places": wants_places}
+
+
+def legacy_nlp_detect_intent(nlp: NLPProcessor, text: str) -> dict:
+    """NLPProcessor.detect_intent before the token-based classifier (logging removed)."""
+    def check_term_presence(term_dict):
+        text_lower = text.lower()
+        for category, terms in term_dict.items():
+            if any(term in text_lower for term in terms):
+                return True
+        return False
+
+    wants_weather = check_term_presence(nlp.WEATHER_TERMS)
+    wants_places = check_term_presence(nlp.PLACES_TERMS)
+
+    text_lower = text.lower()
+
+    if "what" in text_lower and not wants_weather:
+        if any(word in text_lower for word in ["can", "should", "do", "see"]):
+            wants_places = True
+
+    if any(phrase in text_lower for phrase in ["going to", "heading to", "trip to", "visit"]):
+        if not wants_weather:
+            wants_places = True
+
+    if not wants_weather and not wants_places:
+        wants_places = True
+
+    return {"weather": wants_weather, "places": wants_places}
+
+
+def timed(label: str, fn, corpus, repeats: int = 5) -> list:
+    """Run fn over the corpus and print the best per-query cost of several runs."""
+    elapsed = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        results = [fn(query) for query in corpus]
+        elapsed = min(elapsed, time.perf_counter() - start)
+    print(f"{label:<28} {elapsed * 1000:9.1f}ms total  {elapsed / len(corpus) * 1e6:7.2f}us/query")
+    return results
+
+
+def main(total: int) -> None:
+    logging.disable(logging.INFO)
+    parser = EnhancedTextParser()
+    rng = random.Random(7)
+
+    # Same input detect_intent receives from parse_query
+    test_inputs = [parser.normalize_text(parser.fix_common_typos(q)) for q, _, _ in TEST_CASES]
+    mismatches = [q for q in test_inputs if legacy_detect_intent(parser, q) != parser.detect_intent(q)]
+    print(f"\ntest_parser.py cases: {len(test_inputs) - len(mismatches)}/{len(test_inputs)} identical")
+    for query in mismatches:
+        print(f"  MISMATCH: {query}")
+
+    corpus = [
+        parser.normalize_text(rng.choice(TEMPLATES).format(city=rng.choice(WORLD_CITIES)))
+        for _ in range(total)
+    ]
+    print(f"Corpus: {len(corpus)} queries\n")
+
+    print("EnhancedTextParser")
+    legacy = timed("  substring scan (legacy)", lambda q: legacy_detect_intent(parser, q), corpus)
+    current = timed("  IntentClassifier", lambda q: parser.intent_classifier.classify(q).as_dict(), corpus)
+
+    nlp = NLPProcessor()
+    print("NLPProcessor")
+    nlp_legacy = timed("  substring scan (legacy)", lambda q: legacy_nlp_detect_intent(nlp, q), corpus)
+    nlp_current = timed("  IntentClassifier", lambda q: nlp.intent_classifier.classify(q).as_dict(), corpus)
+    nlp_agree = sum(old == new for old, new in zip(nlp_legacy, nlp_current))
+    print(f"  agreement: {nlp_agree}/{total}")
+
+    agree = sum(old == new for old, new in zip(legacy, current))
+    print(f"\nEnhancedTextParser corpus agreement: {agree}/{total}")
+    examples = {}
+    for query, old, new in zip(corpus, legacy, current):
+        if old != new:
+            examples.setdefault((str(old), str(new)), query)
+    for (old, new), query in examples.items():
+        print(f"  {query!r}: {old} -> {new}")
+
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,60 @@
+"""Benchmark: bytes over the wire per map view, full pages vs shell + GeoJSON.
+
+For 5, 50 and 500 attractions compares one map view as a full page
+(Folium or template renderer) with the /api/tourism/map/data GeoJSON the
+cached /map shell fetches, raw and gzipped. Also totals a session of
+several map views, where the shell is downloaded only once.
+
+Usage:
+    python bench_map_data.py [views per session]
+"""
+
+import gzip
+import json
+import logging
+import random
+import sys
+
+from app.services.map_service import MAP_SHELL_PATH, create_enhanced_map_html, create_map_page_html, map_geojson
+
+TYPES = ["museum", "attraction", "monument", "castle", "park", "viewpoint", "theme_park"]
+WEATHER = {"temp": 18, "precipitation": 40}
+
+
+def places(count: int, seed: int = 11) -> list:
+    rng = random.Random(seed)
+    return [
+        {"name": f"Attraction {i}", "lat": 48.8566 + rng.uniform(-0.09, 0.09),
+         "lon": 2.3522 + rng.uniform(-0.13, 0.13), "type": rng.choice(TYPES)}
+        for i in range(count)
+    ]
+
+
+def sizes(body: str) -> tuple:
+    encoded = body.encode("utf-8")
+    return len(encoded), len(gzip.compress(encoded))
+
+
+def main(views: int) -> None:
+    logging.disable(logging.INFO)
+    with open(MAP_SHELL_PATH, encoding="utf-8") as f:
+        shell = sizes(f.read())
+    print(f"\nshell (/map, cached): {shell[0]:,} bytes, {shell[1]:,} gzipped\n")
+
+    print(f"{'markers':>7}  {'response':<16}  {'bytes':>10}  {'gzipped':>9}  {f'{views} views gzipped':>18}")
+    for count in (5, 50, 500):
+        attractions = places(count)
+        data = json.dumps(map_geojson("Paris", 48.8566, 2.3522, attractions, WEATHER),
+                          ensure_ascii=False, separators=(",", ":"))
+        rows = [
+            ("folium page", sizes(create_enhanced_map_html("Paris", 48.8566, 2.3522, attractions, WEATHER)), 0),
+            ("template page", sizes(create_map_page_html("Paris", 48.8566, 2.3522, attractions, WEATHER)), 0),
+            ("GeoJSON data", sizes(data), shell[1]),
+        ]
+        for name, (size, gzipped), once in rows:
+            print(f"{count:>7}  {name:<16}  {size:>10,}  {gzipped:>9,}  {once + views * gzipped:>18,}")
+        print()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10)
@@ -0,0 +1,125 @@
+"""Benchmark: query latency while map pages are being rendered.
+
+Drives the ASGI app in-process (one event loop, like a uvicorn worker)
+with a steady stream of /api/tourism/query requests and, in parallel,
+map requests for ever-new cities (so every one is a cache miss and a
+render). The parent agent is stubbed so only the app's own work is
+measured. Query latency is compared with no map traffic, with renders run
+inline on the event loop (the old behaviour) and with the thread and
+process render pools.
+
+Both pools use MAP_RENDER_WORKERS / MAP_RENDER_QUEUE.
+
+Usage:
+    [MAP_RENDERER=template] [MAP_RENDER_WORKERS=n] python bench_map_offload.py [seconds per scenario]
+"""
+
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+
+# Before the app is imported, so render worker processes (which read the environment) use it too
+os.environ.setdefault("MAP_RENDERER", "folium")
+
+import httpx
+
+import app.main as main
+import app.services.map_service as map_service
+from app.config import settings
+from app.utils.bounded_executor import BoundedExecutor
+from app.utils.cache import map_cache
+
+QUERY_CLIENTS = 8
+MAP_CLIENTS = 2
+PLACES = 50
+
+
+class StubParentAgent:
+    """Answers like the real agent after a short simulated upstream wait."""
+
+    def __init__(self):
+        self.cities = 0
+
+    async def process(self, query):
+        await asyncio.sleep(0.002)
+        self.cities += 1
+        lat, lon = 48.0 + self.cities / 1000, 2.0
+        places = [{"name": f"Attraction {i}", "lat": lat + i / 2000, "lon": lon + i / 3000, "type": "museum"}
+                  for i in range(PLACES)]
+        return {"success": True, "data": {
+            "text": f"City {self.cities}", "place_name": f"City {self.cities}",
+            "coordinates": {"lat": lat, "lon": lon}, "places": places, "weather": {"temp": 18, "precipitation": 40}
+        }}
+
+
+class InlineExecutor:
+    """Old behaviour: render on the event loop."""
+
+    async def run(self, fn, *args):
+        return fn(*args)
+
+
+async def scenario(name: str, executor, maps: bool, seconds: float) -> None:
+    map_service.render_executor = executor
+    map_cache.clear()
+    latencies, map_latencies, rejected = [], [], 0
+    deadline = time.perf_counter() + seconds
+
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        async def query_client():
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                response = await client.post("/api/tourism/query", json={"query": "Weather in Paris"})
+                assert response.status_code == 200, response.text
+                latencies.append(time.perf_counter() - start)
+
+        async def map_client():
+            nonlocal rejected
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                response = await client.get("/api/tourism/map", params={"query": "Map of Paris"})
+                if response.status_code == 503:
+                    rejected += 1
+                    await asyncio.sleep(0.05)
+                    continue
+                assert response.status_code == 200, response.text
+                map_latencies.append(time.perf_counter() - start)
+
+        await asyncio.gather(*[query_client() for _ in range(QUERY_CLIENTS)],
+                             *[map_client() for _ in range(MAP_CLIENTS if maps else 0)])
+
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    maps_done = f"{len(map_latencies):5} maps, p50 {statistics.median(map_latencies) * 1000:7.1f}ms" \
+        if map_latencies else f"{'':>27}"
+    print(f"{name:<16} queries {len(latencies):6}  p50 {statistics.median(latencies) * 1000:6.1f}ms  "
+          f"p99 {p99 * 1000:7.1f}ms   {maps_done}" + (f"  ({rejected} rejected)" if rejected else ""))
+
+
+async def run(seconds: float) -> None:
+    workers, queue = settings.map_render_workers, settings.map_render_queue
+    threads = BoundedExecutor("bench_threads", max_workers=workers, max_queue=queue)
+    processes = BoundedExecutor("bench_processes", kind="process", max_workers=workers, max_queue=queue)
+    # Start the worker processes (and their imports) before timing
+    await asyncio.gather(*[processes.run(map_service.render_map_page, "Warm-up", 0.0, 0.0, [])
+                           for _ in range(workers)])
+
+    await scenario("no maps", InlineExecutor(), False, seconds)
+    await scenario("inline render", InlineExecutor(), True, seconds)
+    await scenario("thread pool", threads, True, seconds)
+    await scenario("process pool", processes, True, seconds)
+
+    threads.close()
+    processes.close()
+
+
+if __name__ == "__main__":
+    logging.disable(logging.WARNING)
+    main.parent_agent = StubParentAgent()
+    print(f"\n{QUERY_CLIENTS} query clients, {MAP_CLIENTS} map clients, {settings.map_renderer} renderer, "
+          f"{PLACES} places per map, {settings.map_render_workers} render workers, {os.cpu_count()} CPUs\n")
+    asyncio.run(run(float(sys.argv[1]) if len(sys.argv) > 1 else 3.0))
@@ -0,0 +1,60 @@
+"""Benchmark: map page rendering, Folium object graph vs page template.
+
+Renders the /api/tourism/map page for 5, 50 and 500 attractions with
+both renderers and reports render time and page size (raw and gzipped,
+since the Folium page embeds its map as an escaped iframe document).
+
+Usage:
+    python bench_map_render.py [repeats]
+"""
+
+import gzip
+import logging
+import random
+import statistics
+import sys
+import time
+
+from app.services.map_service import create_enhanced_map_html, create_map_page_html
+
+TYPES = ["museum", "attraction", "monument", "castle", "park", "viewpoint", "theme_park"]
+WEATHER = {"temp": 18, "precipitation": 40}
+
+
+def places(count: int, seed: int = 11) -> list:
+    rng = random.Random(seed)
+    return [
+        {"name": f"Attraction {i}", "lat": 48.8566 + rng.uniform(-0.09, 0.09),
+         "lon": 2.3522 + rng.uniform(-0.13, 0.13), "type": rng.choice(TYPES)}
+        for i in range(count)
+    ]
+
+
+def measure(render, count: int, repeats: int):
+    """Median render time (ms), page bytes, gzipped bytes."""
+    attractions = places(count)
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        page = render("Paris", 48.8566, 2.3522, attractions, WEATHER)
+        timings.append(time.perf_counter() - start)
+    encoded = page.encode("utf-8")
+    return statistics.median(timings) * 1000, len(encoded), len(gzip.compress(encoded))
+
+
+def main(repeats: int) -> None:
+    logging.disable(logging.INFO)  # per-render log lines would skew the timings
+
+    print(f"\n{'markers':>7}  {'renderer':<8}  {'render':>10}  {'bytes':>10}  {'gzipped':>9}")
+    for count in (5, 50, 500):
+        results = {}
+        for name, render in (("folium", create_enhanced_map_html), ("template", create_map_page_html)):
+            results[name] = measure(render, count, max(1, repeats // 10) if count == 500 and name == "folium" else repeats)
+            ms, size, gzipped = results[name]
+            print(f"{count:>7}  {name:<8}  {ms:>8.2f}ms  {size:>10,}  {gzipped:>9,}")
+        print(f"{'':>7}  speedup {results['folium'][0] / results['template'][0]:.0f}x, "
+              f"{results['folium'][1] / results['template'][1]:.1f}x smaller\n")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
@@ -0,0 +1,92 @@
+"""Benchmark: legacy 11-clause Overpass query vs the capped per-key query.
+
+Runs both queries against the local Overpass stub (synthetic city of
+OSM-like elements) over HTTP and reports response size, elements
+returned, request time and JSON decode time. The stub scans every
+element per clause, so 'scanned' is a rough stand-in for the work the
+real Overpass server does per query.
+
+Usage:
+    python bench_overpass_query.py [elements] [radius_m]
+"""
+
+import json
+import statistics
+import sys
+import time
+
+import httpx
+
+from app.config import settings
+from app.services.overpass_query import build_attractions_query, parse_categories
+from overpass_stub import OverpassStub, synthetic_city
+
+LAT, LON = 48.8566, 2.3522
+RUNS = 5
+
+
+def legacy_query(lat: float, lon: float, radius: int) -> str:
+    """The query the places service sent before (one clause per key/value and element type)."""
+    return f"""
+    [out:json][timeout:25];
+    (
+      node["tourism"="attraction"](around:{radius},{lat},{lon});
+      node["tourism"="museum"](around:{radius},{lat},{lon});
+      node["tourism"="viewpoint"](around:{radius},{lat},{lon});
+      node["tourism"="theme_park"](around:{radius},{lat},{lon});
+      node["historic"="monument"](around:{radius},{lat},{lon});
+      node["historic"="castle"](around:{radius},{lat},{lon});
+      node["leisure"="park"](around:{radius},{lat},{lon});
+      way["tourism"="attraction"](around:{radius},{lat},{lon});
+      way["tourism"="museum"](around:{radius},{lat},{lon});
+      way["leisure"="park"](around:{radius},{lat},{lon});
+      way["historic"="monument"](around:{radius},{lat},{lon});
+    );
+    out tags center;
+    """
+
+
+def measure(client: httpx.Client, url: str, stub: OverpassStub, label: str, query: str) -> None:
+    sizes, requests, decodes, scanned = [], [], [], []
+    elements = []
+    for _ in range(RUNS):
+        before = stub.elements_scanned
+        start = time.perf_counter()
+        response = client.post(url, data={"data": query})
+        requests.append(time.perf_counter() - start)
+        response.raise_for_status()
+        scanned.append(stub.elements_scanned - before)
+
+        start = time.perf_counter()
+        elements = json.loads(response.content)["elements"]
+        decodes.append(time.perf_counter() - start)
+        sizes.append(len(response.content))
+
+    print(f"{label:<10} bytes={statistics.median(sizes):9,.0f}  elements={len(elements):5d}  "
+          f"scanned={statistics.median(scanned):7,.0f}  "
+          f"request={statistics.median(requests) * 1000:7.1f}ms  "
+          f"decode={statistics.median(decodes) * 1000:6.2f}ms")
+
+
+def main(count: int, radius: int) -> None:
+    stub = OverpassStub(synthetic_city(LAT, LON, count=count))
+    server = stub.serve()
+    url = f"http://127.0.0.1:{server.server_address[1]}/api/interpreter"
+
+    new_query = build_attractions_query(
+        LAT, LON, radius,
+        categories=parse_categories(settings.places_categories),
+        max_elements=settings.overpass_max_elements
+    )
+    print(f"\n{count} elements in the synthetic city, radius {radius}m, median of {RUNS}\n")
+
+    with httpx.Client(timeout=60) as client:
+        measure(client, url, stub, "legacy", legacy_query(LAT, LON, radius))
+        measure(client, url, stub, "capped", new_query)
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 10000)
@@ -0,0 +1,144 @@
+"""Benchmark: buffered `response.json()` vs streamed parsing of Overpass responses.
+
+Builds a London-sized fixture with the Overpass stub (all elements the
+pre-user-017 query matched within 10 km, several MB of JSON) and serves
+it in chunks at a fixed bandwidth. Compares the old buffered fetch
+(download everything, `response.json()`, then filter) with the places
+service's streamed fetch, which parses elements as they arrive and stops
+at OVERPASS_MAX_ELEMENTS. The capped response the service normally gets
+is measured too. Reports time to result and peak Python memory
+(tracemalloc, in a separate run so it doesn't skew the timings).
+
+Usage:
+    python bench_places_stream.py [elements] [bandwidth_mb_s]
+"""
+
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import app.services.places as places
+from app.config import settings
+from app.services.http_client import http_clients
+from app.services.overpass_query import build_attractions_query
+from app.utils.cache import places_cache
+from app.utils.rate_limiter import overpass_limiter
+from bench_overpass_query import legacy_query
+from overpass_stub import OverpassStub, synthetic_city
+
+LAT, LON = 51.5074, -0.1278  # London
+RADIUS = 10000
+RUNS = 5
+CHUNK = 16384
+
+bandwidth = 20 * 1024 * 1024
+body = b""
+
+
+class FixtureServer(BaseHTTPRequestHandler):
+    """Serves the recorded body in chunks at a fixed bandwidth."""
+
+    protocol_version = "HTTP/1.1"
+    wbufsize = 65536
+    disable_nagle_algorithm = True  # chunks are flushed one by one
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            for start in range(0, len(body), CHUNK):
+                self.wfile.write(body[start:start + CHUNK])
+                self.wfile.flush()
+                time.sleep(CHUNK / bandwidth)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client stopped reading
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureHTTPServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        pass  # the streamed fetch hangs up early on purpose
+
+
+async def buffered_fetch(lat: float, lon: float) -> list:
+    """The places fetch before streaming: whole body, response.json(), first five named places."""
+    response = await http_clients.get("overpass").post(settings.overpass_url, data={"data": "fixture"})
+    response.raise_for_status()
+    elements = response.json().get("elements", [])
+
+    results, seen = [], set()
+    for element in elements:
+        candidate = places._candidate(element, lat, lon, RADIUS / 1000)
+        if candidate and candidate[1] not in seen:
+            results.append(candidate[2])
+            seen.add(candidate[1])
+            if len(results) >= settings.places_max_results:
+                break
+    return results
+
+
+async def streamed_fetch(lat: float, lon: float) -> list:
+    """The places service as it is now."""
+    places_cache.cache.clear()
+    return await places.get_tourist_attractions(lat, lon, RADIUS)
+
+
+async def measure(label: str, fetch) -> None:
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        result = await fetch(LAT, LON)
+        timings.append(time.perf_counter() - start)
+        assert len(result) == settings.places_max_results
+
+    tracemalloc.start()
+    await fetch(LAT, LON)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    print(f"{label:<26} time={statistics.median(timings) * 1000:7.1f}ms  peak={peak / 1024 / 1024:6.2f} MB")
+
+
+async def run_all(stub: OverpassStub) -> None:
+    global body
+    body = json.dumps(stub.evaluate(legacy_query(LAT, LON, RADIUS))).encode() + b"\n"
+    print(f"\nLondon fixture: {len(body) / 1024 / 1024:.1f} MB uncapped, "
+          f"served at {bandwidth / 1024 / 1024:g} MB/s, median of {RUNS}\n")
+    await measure("uncapped, buffered", buffered_fetch)
+    await measure("uncapped, streamed", streamed_fetch)
+
+    capped = build_attractions_query(LAT, LON, RADIUS, places.PLACE_CATEGORIES, settings.overpass_max_elements)
+    body = json.dumps(stub.evaluate(capped)).encode() + b"\n"
+    print(f"\nCapped response: {len(body) / 1024:.0f} KB\n")
+    await measure("capped, buffered", buffered_fetch)
+    await measure("capped, streamed", streamed_fetch)
+
+
+def main(count: int) -> None:
+    logging.disable(logging.WARNING)
+    overpass_limiter.burst = overpass_limiter._tokens = 10 ** 6  # no pacing against the local stub
+
+    stub = OverpassStub(synthetic_city(LAT, LON, count=count))
+    server = FixtureHTTPServer(("127.0.0.1", 0), FixtureServer)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    settings.overpass_url = f"http://127.0.0.1:{server.server_address[1]}/api/interpreter"
+
+    asyncio.run(run_all(stub))
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2:
+        bandwidth = float(sys.argv[2]) * 1024 * 1024
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 40000)
@@ -0,0 +1,109 @@
+"""Benchmark: radius queries on the local POI index with a 1M-POI dataset.
+
+Generates POIs clustered around real city centers (like an extract of
+several metro areas) plus a sparse worldwide background, writes and
+loads the index, then times radius queries at city centers for a few
+radii. A full scan of the same arrays is timed as a baseline.
+
+Usage:
+    python bench_poi_index.py [pois] [queries]
+"""
+
+import math
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from app.services.gazetteer import gazetteer
+from app.services.poi_index import SCALE, Coverage, PoiIndex, PoiRecord, write_index
+from app.utils.geo import distance_km
+
+CATEGORIES = ["tourism=attraction", "tourism=museum", "tourism=viewpoint", "tourism=theme_park",
+              "historic=monument", "historic=castle", "leisure=park"]
+
+
+def city_centers(count: int) -> list:
+    gazetteer.load()
+    seen, centers = set(), []
+    for entry in sorted(gazetteer._index.values(), key=lambda e: -e.population):
+        if entry.name not in seen:
+            seen.add(entry.name)
+            centers.append((entry.lat, entry.lon))
+    return centers[:count]
+
+
+def generate(count: int, centers: list, seed: int = 7) -> list:
+    """Most POIs within ~15 km of a city center, the rest anywhere."""
+    rng = random.Random(seed)
+    records = []
+    for i in range(count):
+        if rng.random() < 0.9:
+            lat, lon = rng.choice(centers)
+            lat += rng.gauss(0, 0.08)
+            lon += rng.gauss(0, 0.08 / max(math.cos(math.radians(lat)), 0.1))
+        else:
+            lat, lon = rng.uniform(-60, 70), rng.uniform(-180, 180)
+        tags = {"name": f"POI {i}"}
+        if i % 9 == 0:
+            tags["wikidata"] = f"Q{i}"
+        records.append(PoiRecord(max(-89.9, min(89.9, lat)), lon, rng.choice(CATEGORIES), tags))
+    return records
+
+
+def full_scan(index: PoiIndex, lat: float, lon: float, radius: int) -> int:
+    """Baseline: distance check against every POI."""
+    radius_km = radius / 1000
+    return sum(
+        1 for point_lat, point_lon in zip(index._lats, index._lons)
+        if distance_km(lat, lon, point_lat / SCALE, point_lon / SCALE) <= radius_km
+    )
+
+
+def main(count: int, queries: int) -> None:
+    centers = city_centers(60)
+    started = time.perf_counter()
+    records = generate(count, centers)
+    print(f"\nGenerated {count:,} POIs around {len(centers)} cities in {time.perf_counter() - started:.1f}s")
+
+    path = os.path.join(tempfile.mkdtemp(), "pois.bin")
+    started = time.perf_counter()
+    write_index(path, records, [Coverage(-90, -180, 90, 180)])
+    print(f"write_index: {time.perf_counter() - started:.1f}s, {os.path.getsize(path) / 1024 / 1024:.1f} MB")
+    del records
+
+    index = PoiIndex(path)
+    tracemalloc.start()
+    started = time.perf_counter()
+    index.load()
+    load_time = time.perf_counter() - started
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"load: {load_time * 1000:.0f}ms, {memory / 1024 / 1024:.1f} MB in memory, {len(index._cells):,} cells\n")
+
+    rng = random.Random(3)
+    for radius in (1000, 5000, 10000):
+        timings, found = [], []
+        for _ in range(queries):
+            lat, lon = rng.choice(centers)
+            start = time.perf_counter()
+            found.append(len(index.query(lat, lon, radius)))
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        print(f"radius {radius / 1000:4.0f} km  p50={statistics.median(timings) * 1000:7.2f}ms  "
+              f"p99={timings[int(len(timings) * 0.99) - 1] * 1000:7.2f}ms  "
+              f"median results={statistics.median(found):7,.0f}")
+
+    lat, lon = centers[0]
+    start = time.perf_counter()
+    scanned = full_scan(index, lat, lon, 10000)
+    print(f"\nfull scan baseline (10 km, 1 query): {(time.perf_counter() - start) * 1000:.0f}ms "
+          f"({scanned:,} results)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 200)
@@ -0,0 +1,146 @@
+"""Benchmark: time to first result for /api/tourism/query vs /api/tourism/query/stream.
+
+Starts a local Open-Meteo/Overpass stub where weather answers quickly
+and places slowly (like the real Overpass API), runs the app under
+uvicorn and measures, per query, when the first byte, the weather and
+the final answer arrive. Caches are cleared before every query.
+
+Usage:
+    python bench_stream.py [queries] [weather_ms] [places_ms]
+"""
+
+import asyncio
+import json
+import logging
+import socket
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import uvicorn
+
+from app.config import settings
+from app.utils.cache import geocoding_cache, parse_cache, places_cache, weather_cache
+
+CITIES = ["Paris", "Tokyo", "Rome", "Barcelona", "Amsterdam", "Prague", "Vienna", "Lisbon"]
+
+WEATHER_BODY = json.dumps({"current": {"temperature_2m": 21.4, "precipitation": 0.0},
+                           "hourly": {"precipitation_probability": [10, 20, 30]}}).encode()
+OVERPASS_BODY = json.dumps({"elements": [
+    {"type": "node", "id": i, "lat": 48.85 + i / 1000, "lon": 2.35,
+     "tags": {"name": f"Attraction {i}", "tourism": "attraction"}}
+    for i in range(5)
+]}).encode()
+
+weather_latency = 0.2
+places_latency = 3.0
+
+
+class UpstreamStub(BaseHTTPRequestHandler):
+    """Fast Open-Meteo (GET) and slow Overpass (POST) stand-in."""
+
+    protocol_version = "HTTP/1.1"
+    wbufsize = 65536  # headers and body in one send
+
+    def do_GET(self):
+        time.sleep(weather_latency)
+        self._reply(WEATHER_BODY)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(places_latency)
+        self._reply(OVERPASS_BODY)
+
+    def _reply(self, body: bytes):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def reset() -> None:
+    """Empty the caches so every query goes upstream."""
+    for cache in (geocoding_cache, parse_cache, places_cache.cache, weather_cache.cache):
+        cache.clear()
+
+
+async def buffered(client: httpx.AsyncClient, query: str) -> dict:
+    """Plain endpoint: everything arrives with the full response."""
+    start = time.perf_counter()
+    response = await client.post("/api/tourism/query", json={"query": query})
+    response.raise_for_status()
+    elapsed = time.perf_counter() - start
+    return {"first_byte": elapsed, "weather": elapsed, "done": elapsed}
+
+
+async def streamed(client: httpx.AsyncClient, query: str) -> dict:
+    """Streaming endpoint: record when each stage's line arrives."""
+    timings = {}
+    start = time.perf_counter()
+    async with client.stream("POST", "/api/tourism/query/stream", json={"query": query}) as response:
+        async for line in response.aiter_lines():
+            now = time.perf_counter() - start
+            timings.setdefault("first_byte", now)
+            if line:
+                timings.setdefault(json.loads(line)["event"], now)
+    return timings
+
+
+async def measure(base_url: str, queries: list) -> None:
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        for label, run in (("/query", buffered), ("/query/stream", streamed)):
+            results = []
+            for query in queries:
+                reset()
+                await asyncio.sleep(settings.overpass_delay * settings.overpass_burst)  # Overpass bucket refills
+                results.append(await run(client, query))
+            row = "  ".join(
+                f"{stage}={statistics.median(r[stage] for r in results) * 1000:6.0f}ms"
+                for stage in ("first_byte", "weather", "done")
+            )
+            print(f"{label:<15} {row}")
+
+
+def main(total: int) -> None:
+    logging.disable(logging.INFO)
+
+    stub = ThreadingHTTPServer(("127.0.0.1", 0), UpstreamStub)
+    threading.Thread(target=stub.serve_forever, daemon=True).start()
+    settings.openmeteo_url = f"http://127.0.0.1:{stub.server_address[1]}/"
+    settings.overpass_url = settings.openmeteo_url
+    settings.disk_cache_enabled = False
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config("app.main:app", host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+    queries = [f"Weather and places to visit in {CITIES[i % len(CITIES)]}" for i in range(total)]
+    print(f"\n{total} queries (median), weather {weather_latency * 1000:.0f}ms, "
+          f"places {places_latency * 1000:.0f}ms upstream latency\n")
+
+    asyncio.run(measure(f"http://127.0.0.1:{port}", queries))
+    server.should_exit = True
+    stub.shutdown()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2:
+        weather_latency = float(sys.argv[2]) / 1000
+    if len(sys.argv) > 3:
+        places_latency = float(sys.argv[3]) / 1000
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
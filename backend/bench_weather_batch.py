@@ -0,0 +1,116 @@
+"""Benchmark: one Open-Meteo call per weather lookup vs micro-batched lookups.
+
+Starts a local Open-Meteo stub (fixed per-request latency), then fires
+weather lookups for random distinct coordinates at a steady arrival rate,
+with micro-batching disabled and with a few batching windows. Reports
+upstream requests and caller latency.
+
+Usage:
+    python bench_weather_batch.py [lookups] [rate_per_s] [latency_ms]
+"""
+
+import asyncio
+import json
+import logging
+import random
+import statistics
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import app.services.weather as weather
+from app.config import settings
+from app.utils.cache import weather_cache
+
+LOCATION = {"current": {"temperature_2m": 21.4, "precipitation": 0.0},
+            "hourly": {"precipitation_probability": [10, 20, 30]}}
+
+upstream_requests = 0
+latency = 0.03
+
+
+class OpenMeteoStub(BaseHTTPRequestHandler):
+    """Open-Meteo stand-in answering single and multi-location requests."""
+
+    protocol_version = "HTTP/1.1"
+    wbufsize = 65536  # headers and body in one send (avoids Nagle/delayed-ACK stalls)
+
+    def do_GET(self):
+        global upstream_requests
+        upstream_requests += 1
+        time.sleep(latency)
+        count = len(parse_qs(urlparse(self.path).query)["latitude"][0].split(","))
+        body = json.dumps([LOCATION] * count if count > 1 else LOCATION).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+async def run(window_ms: float, coords: list, rate: float) -> None:
+    """Fire lookups at a steady rate and report upstream calls and latency."""
+    global upstream_requests
+    weather_cache.cache.clear()
+    upstream_requests = 0
+    settings.weather_batch_window_ms = window_ms
+    weather._weather_batcher.max_delay = window_ms / 1000
+
+    latencies = []
+    failures = []
+
+    async def lookup(lat, lon):
+        start = time.perf_counter()
+        try:
+            await weather.get_current_weather(lat, lon)
+        except Exception as e:
+            failures.append(e)
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    tasks = []
+    for i, (lat, lon) in enumerate(coords):
+        delay = start + i / rate - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.ensure_future(lookup(lat, lon)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    label = "no batching" if window_ms <= 0 else f"{window_ms:g}ms window"
+    print(f"{label:<14} upstream={upstream_requests:5d}  "
+          f"p50={statistics.median(latencies) * 1000:6.1f}ms  "
+          f"p99={latencies[int(len(latencies) * 0.99) - 1] * 1000:6.1f}ms  total={elapsed:5.2f}s  "
+          f"failed={len(failures)}")
+
+
+def main(total: int, rate: float) -> None:
+    logging.disable(logging.ERROR)
+    ThreadingHTTPServer.request_queue_size = 256  # the default backlog of 5 refuses bursts
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OpenMeteoStub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    settings.openmeteo_url = f"http://127.0.0.1:{server.server_address[1]}/"
+
+    rng = random.Random(11)
+    coords = [(round(rng.uniform(-60, 70), 4), round(rng.uniform(-180, 180), 4)) for _ in range(total)]
+    print(f"\n{total} lookups of distinct cells at {rate:g}/s, stub latency {latency * 1000:.0f}ms\n")
+
+    async def all_runs():
+        for window_ms in (10, 5, 2, 0):  # unbatched last: it can overload the stub
+            await run(window_ms, coords, rate)
+
+    asyncio.run(all_runs())
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 3:
+        latency = float(sys.argv[3]) / 1000
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000,
+         float(sys.argv[2]) if len(sys.argv) > 2 else 800)
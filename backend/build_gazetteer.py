@@ -0,0 +1,126 @@
+"""Build app/data/gazetteer.tsv from a local GeoNames dump.
+
+Reads a GeoNames cities file (e.g. cities15000.txt from
+https://download.geonames.org/export/dump/) and writes the compact
+gazetteer used by app.services.gazetteer. By default it keeps the cities
+the parser and spell checker already know (WORLD_CITIES, COMMON_CITIES);
+--min-population adds every other city at least that large.
+
+Places missing from the dump (regions such as Goa or Kerala) and the
+hand-maintained aliases in the current gazetteer are carried over, so
+rebuilding never drops an entry.
+
+Usage:
+    python build_gazetteer.py cities15000.txt [--min-population N] [--output PATH]
+"""
+
+import argparse
+import os
+import sys
+
+from app.services.gazetteer import DEFAULT_GAZETTEER_PATH, normalize_name
+from app.utils.spell_checker import COMMON_CITIES
+from app.utils.text_parser import WORLD_CITIES, LOCATION_ALIASES
+
+HEADER = "# name\taliases\tlat\tlon\tcountry\tpopulation\n"
+
+# GeoNames dump column positions
+NAME, ASCIINAME, LAT, LON, FEATURE_CLASS, COUNTRY, POPULATION = 1, 2, 4, 5, 6, 8, 14
+
+
+def read_existing(path):
+    """Read the current gazetteer as {normalized name: row fields}."""
+    rows = {}
+
+    if not os.path.exists(path):
+        return rows
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip() and not line.startswith("#"):
+                fields = line.rstrip("\n").split("\t")
+                rows[normalize_name(fields[0])] = fields
+
+    return rows
+
+
+def read_dump(path, wanted, min_population):
+    """
+    Pick one row per wanted name (the most populous) plus large cities.
+
+    Returns:
+        Dict of normalized name -> [name, aliases, lat, lon, country, population]
+    """
+    best = {}
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            cols = line.rstrip("\n").split("\t")
+            if len(cols) <= POPULATION or cols[FEATURE_CLASS] != "P":
+                continue
+
+            population = int(cols[POPULATION] or 0)
+            keys = {normalize_name(cols[NAME]), normalize_name(cols[ASCIINAME])}
+            matched = keys & wanted
+
+            if not matched and population < min_population:
+                continue
+
+            key = next(iter(matched)) if matched else normalize_name(cols[ASCIINAME])
+            if key in best and int(best[key][5]) >= population:
+                continue
+
+            aliases = cols[ASCIINAME] if cols[ASCIINAME] != cols[NAME] else ""
+            best[key] = [cols[NAME], aliases, f"{float(cols[LAT]):.4f}", f"{float(cols[LON]):.4f}",
+                         cols[COUNTRY], str(population)]
+
+    return best
+
+
+def build(dump_path, output_path, min_population):
+    """Merge the dump with the existing gazetteer and write the result."""
+    wanted = {normalize_name(c) for c in set(WORLD_CITIES) | set(COMMON_CITIES)}
+    existing = read_existing(output_path)
+    rows = read_dump(dump_path, wanted, min_population)
+
+    # Keep curated display names and aliases for places found in the dump
+    for key, fields in existing.items():
+        if key in rows:
+            rows[key][0] = fields[0]
+            aliases = {a for a in fields[1].split(";") + rows[key][1].split(";") if a}
+            rows[key][1] = ";".join(sorted(aliases))
+        else:
+            rows[key] = fields
+
+    for alias, target in LOCATION_ALIASES.items():
+        row = rows.get(normalize_name(target))
+        if row and normalize_name(alias) not in {normalize_name(a) for a in row[1].split(";")}:
+            row[1] = ";".join(a for a in (row[1], alias) if a)
+
+    known = {normalize_name(n) for row in rows.values() for n in [row[0], *row[1].split(";")] if n}
+    missing = sorted(wanted - known)
+    if missing:
+        print(f"Warning: {len(missing)} known cities not found: {', '.join(missing)}")
+
+    ordered = sorted(rows.values(), key=lambda r: -int(r[5]))
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write(HEADER)
+        for row in ordered:
+            f.write("\t".join(row) + "\n")
+
+    print(f"Wrote {len(ordered)} places to {output_path} ({os.path.getsize(output_path)} bytes)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the offline gazetteer from a GeoNames dump")
+    parser.add_argument("dump", help="GeoNames cities file (tab-separated)")
+    parser.add_argument("--output", default=DEFAULT_GAZETTEER_PATH, help="Gazetteer file to write")
+    parser.add_argument("--min-population", type=int, default=sys.maxsize,
+                        help="Also include every city with at least this population")
+    args = parser.parse_args()
+
+    build(args.dump, args.output, args.min_population)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""Build a local POI index (app.services.poi_index) from OSM extracts.
+
+Reads attractions from pre-filtered GeoJSON (a FeatureCollection, or one
+feature per line as written by `osmium export -f geojsonseq`) or straight
+from an OSM PBF extract (needs the optional `osmium` package). Keeps named
+features in the configured place categories and writes the compact,
+grid-bucketed index the places service queries before Overpass.
+
+Searches are answered locally only inside the covered areas, so give the
+extract's bounds with --coverage (PBF files usually carry them in their
+header). Without it the bounding box of the POIs found is used, which is
+only right for extracts that are not clipped to an area.
+
+A pre-filtered GeoJSON extract can be made with osmium-tool:
+    osmium tags-filter city.osm.pbf nwr/tourism nwr/historic nwr/leisure=park -o pois.osm.pbf
+    osmium export pois.osm.pbf -f geojsonseq -o pois.geojsonseq
+
+Usage:
+    python build_poi_index.py pois.geojsonseq [more inputs...] --output poi_index.bin
+        [--coverage MIN_LON,MIN_LAT,MAX_LON,MAX_LAT ...] [--categories SPEC] [--cell-deg 0.05]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+from app.config import settings
+from app.services.overpass_query import parse_categories
+from app.services.poi_index import KEPT_TAGS, NAME_TAGS, Coverage, PoiRecord, write_index
+
+
+def category_of(tags, categories):
+    """Return the first configured 'key=value' category the tags match, or None."""
+    for key, values in categories.items():
+        if tags.get(key) in values:
+            return f"{key}={tags[key]}"
+    return None
+
+
+def center_of(geometry):
+    """Point coordinates, or the bounding box center of any other geometry (like Overpass 'center')."""
+    if geometry["type"] == "Point":
+        lon, lat = geometry["coordinates"][:2]
+        return lat, lon
+
+    lons, lats = [], []
+    stack = [geometry.get("coordinates") or [g["coordinates"] for g in geometry.get("geometries", [])]]
+    while stack:
+        item = stack.pop()
+        if item and isinstance(item[0], (int, float)):
+            lons.append(item[0])
+            lats.append(item[1])
+        else:
+            stack.extend(item)
+
+    if not lats:
+        return None
+    return (min(lats) + max(lats)) / 2, (min(lons) + max(lons)) / 2
+
+
+def read_features(path):
+    """Yield GeoJSON features from a FeatureCollection or a line-per-feature file."""
+    with open(path, encoding="utf-8") as f:
+        first = f.read(1)
+        while first.isspace():
+            first = f.read(1)
+        f.seek(0)
+
+        if first == "{" and not path.endswith((".geojsonseq", ".geojsonl", ".ndjson", ".jsonl")):
+            data = json.load(f)
+            yield from data.get("features", [data] if data.get("type") == "Feature" else [])
+            return
+
+        for line in f:
+            line = line.strip().lstrip("\x1e")  # RFC 8142 record separators
+            if line:
+                yield json.loads(line)
+
+
+def records_from_geojson(path, categories):
+    """Yield POI records for the named, categorized features of a GeoJSON file."""
+    for feature in read_features(path):
+        properties = feature.get("properties") or {}
+        tags = properties["tags"] if isinstance(properties.get("tags"), dict) else properties
+
+        category = category_of(tags, categories)
+        center = center_of(feature["geometry"]) if feature.get("geometry") else None
+        if category and center and any(tags.get(key) for key in NAME_TAGS):
+            yield PoiRecord(center[0], center[1], category, {key: str(tags[key]) for key in KEPT_TAGS if key in tags})
+
+
+def records_from_pbf(path, categories):
+    """
+    Read POI records (nodes, and ways at their bounding box center) from an OSM PBF file.
+
+    Returns:
+        (records, coverage) where coverage is the header bounding box or None
+    """
+    try:
+        import osmium
+    except ImportError:
+        sys.exit("Reading .pbf files needs the 'osmium' package (pip install osmium), "
+                 "or convert the extract to GeoJSON with osmium-tool first (see --help)")
+
+    records = []
+
+    class Handler(osmium.SimpleHandler):
+        def add(self, tags, lat, lon):
+            tags = {tag.k: tag.v for tag in tags}
+            category = category_of(tags, categories)
+            if category and any(tags.get(key) for key in NAME_TAGS):
+                records.append(PoiRecord(lat, lon, category, {key: tags[key] for key in KEPT_TAGS if key in tags}))
+
+        def node(self, node):
+            if node.tags and node.location.valid():
+                self.add(node.tags, node.location.lat, node.location.lon)
+
+        def way(self, way):
+            if not way.tags:
+                return
+            points = [(n.location.lat, n.location.lon) for n in way.nodes if n.location.valid()]
+            if points:
+                lats, lons = zip(*points)
+                self.add(way.tags, (min(lats) + max(lats)) / 2, (min(lons) + max(lons)) / 2)
+
+    Handler().apply_file(path, locations=True)
+
+    box = osmium.io.Reader(path, osmium.osm.osm_entity_bits.NOTHING).header().box()
+    coverage = None
+    if box.valid():
+        coverage = Coverage(box.bottom_left.lat, box.bottom_left.lon, box.top_right.lat, box.top_right.lon)
+    return records, coverage
+
+
+def parse_coverage(text):
+    """'min_lon,min_lat,max_lon,max_lat' (GeoJSON bbox order) -> Coverage."""
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(value) for value in text.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected MIN_LON,MIN_LAT,MAX_LON,MAX_LAT, got '{text}'")
+    if not (min_lat < max_lat and min_lon < max_lon):
+        raise argparse.ArgumentTypeError(f"empty coverage box '{text}'")
+    return Coverage(min_lat, min_lon, max_lat, max_lon)
+
+
+def bounds_of(records):
+    """Bounding box of records as Coverage, or None if there are none."""
+    if not records:
+        return None
+    lats = [record.lat for record in records]
+    lons = [record.lon for record in records]
+    return Coverage(min(lats), min(lons), max(lats), max(lons))
+
+
+def build(inputs, output, coverage, categories, cell_deg):
+    """Read every input and write the index."""
+    started = time.perf_counter()
+    records = []
+    areas = list(coverage)
+
+    for path in inputs:
+        if path.endswith(".pbf"):
+            found, header_box = records_from_pbf(path, categories)
+        else:
+            found, header_box = list(records_from_geojson(path, categories)), None
+
+        print(f"{path}: {len(found)} POIs")
+        records.extend(found)
+
+        if not coverage:
+            box = header_box or bounds_of(found)
+            if box:
+                if not header_box:
+                    print(f"Warning: no --coverage given, using the POI bounding box of {path}")
+                areas.append(box)
+
+    count = write_index(output, records, areas, cell_deg)
+    print(f"Wrote {count} POIs covering {len(areas)} areas to {output} "
+          f"({os.path.getsize(output)} bytes) in {time.perf_counter() - started:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the local POI index from OSM extracts")
+    parser.add_argument("inputs", nargs="+", help="GeoJSON / GeoJSON sequence / OSM PBF files")
+    parser.add_argument("--output", required=True, help="Index file to write (point POI_INDEX_PATH at it)")
+    parser.add_argument("--coverage", type=parse_coverage, action="append", default=[],
+                        help="Area the inputs fully cover, MIN_LON,MIN_LAT,MAX_LON,MAX_LAT (repeatable)")
+    parser.add_argument("--categories", default=settings.places_categories,
+                        help="Place categories to keep (default: PLACES_CATEGORIES)")
+    parser.add_argument("--cell-deg", type=float, default=0.05, help="Grid cell size in degrees")
+    args = parser.parse_args()
+
+    build(args.inputs, args.output, args.coverage, parse_categories(args.categories), args.cell_deg)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""Local Overpass API stand-in for tests and benchmarks (no network).
+
+Evaluates the subset of Overpass QL used by the places service against
+an in-memory element list: unions of `node`/`way`/`rel`/`nwr` clauses
+with `["k"]`, `["k"="v"]` and `["k"~"regex"]` filters and an
+`(around:radius,lat,lon)` filter, optionally stored in a named set
+(`->.name`), set differences `(.a; - .b;);` and
+`[.set] out tags center [qt] [limit];`. Elements are plain Overpass JSON
+dicts.
+
+    stub = OverpassStub(synthetic_city(48.8566, 2.3522))
+    data = stub.evaluate(query)               # in process
+    server = stub.serve()                     # or over HTTP on 127.0.0.1
+    url = f"http://127.0.0.1:{server.server_address[1]}/api/interpreter"
+"""
+
+import json
+import math
+import random
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+from urllib.parse import parse_qs
+
+CLAUSE_PATTERN = re.compile(r"\b(node|way|rel|relation|nwr)((?:\[[^\]]*\])*)\(around:([\d.]+),([-\d.]+),([-\d.]+)\)")
+FILTER_PATTERN = re.compile(r'\[\s*"([^"]+)"\s*(?:(=|~)\s*"([^"]*)")?\s*\]')
+STATEMENT_PATTERN = re.compile(
+    r"(?P<union>\(\s*(?P<clauses>(?:(?:node|way|rel|relation|nwr)[^;]*;\s*)+)\)(?:->\.(?P<union_set>\w+))?\s*;)"
+    r"|(?P<difference>\(\s*\.(?P<left>\w+)\s*;\s*-\s*\.(?P<right>\w+)\s*;\s*\)(?:->\.(?P<difference_set>\w+))?\s*;)"
+    r"|(?P<out>(?:\.(?P<out_set>\w+)\s+)?\bout\s+(?P<modifiers>[a-z ]*?)\s*(?P<limit>\d+)?\s*;)"
+)
+
+TYPE_NAMES = {"node": {"node"}, "way": {"way"}, "rel": {"relation"}, "relation": {"relation"},
+              "nwr": {"node", "way", "relation"}}
+
+CATEGORIES = [("tourism", "attraction"), ("tourism", "museum"), ("tourism", "viewpoint"),
+              ("tourism", "theme_park"), ("historic", "monument"), ("historic", "castle"),
+              ("leisure", "park"), ("tourism", "hotel"), ("amenity", "cafe"), ("shop", "bakery")]
+
+
+def _distance_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in metres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    a = (math.sin((phi2 - phi1) / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(math.radians(lon2 - lon1) / 2) ** 2)
+    return 2 * 6371000 * math.asin(math.sqrt(a))
+
+
+def _position(element: dict) -> Tuple[float, float]:
+    """Node position, or the center of a way/relation."""
+    if "lat" in element:
+        return element["lat"], element["lon"]
+    return element["center"]["lat"], element["center"]["lon"]
+
+
+def _quadtile(lat: float, lon: float) -> int:
+    """Interleave 16 bits of latitude and longitude (Overpass 'qt' order)."""
+    y = int((lat + 90) / 180 * 0xFFFF)
+    x = int((lon + 180) / 360 * 0xFFFF)
+    index = 0
+    for bit in range(16):
+        index |= ((x >> bit) & 1) << (2 * bit) | ((y >> bit) & 1) << (2 * bit + 1)
+    return index
+
+
+def synthetic_city(lat: float, lon: float, count: int = 4000, radius_km: float = 15, seed: int = 1) -> List[dict]:
+    """
+    Generate OSM-like elements around a point.
+
+    A mix of attraction categories and unrelated ones, nodes and ways, with
+    some unnamed elements and some non-Latin names, roughly like a big city.
+    """
+    rng = random.Random(seed)
+    elements = []
+
+    for i in range(count):
+        key, value = rng.choice(CATEGORIES)
+        distance = radius_km * 1000 * math.sqrt(rng.random())
+        bearing = rng.uniform(0, 2 * math.pi)
+        point_lat = lat + distance * math.cos(bearing) / 111320
+        point_lon = lon + distance * math.sin(bearing) / (111320 * math.cos(math.radians(lat)))
+
+        tags = {key: value}
+        roll = rng.random()
+        if roll < 0.55:
+            tags["name"] = f"{value.replace('_', ' ').title()} {i}"
+        elif roll < 0.65:
+            tags["name"] = f"博物館 {i}"
+            tags["name:en"] = f"Museum {i}"
+        elif roll < 0.7:
+            tags["name"] = f"名所 {i}"
+        # else unnamed
+        tags.update({"opening_hours": "Mo-Su 09:00-18:00", "website": f"https://example.org/{i}",
+                     "wheelchair": "yes"})
+        if rng.random() < 0.3:
+            tags["wikidata"] = f"Q{100000 + i}"
+
+        if rng.random() < 0.7:
+            elements.append({"type": "node", "id": 1000 + i, "lat": round(point_lat, 7),
+                             "lon": round(point_lon, 7), "tags": tags})
+        else:
+            elements.append({"type": "way", "id": 500000 + i, "tags": tags,
+                             "center": {"lat": round(point_lat, 7), "lon": round(point_lon, 7)}})
+
+    return elements
+
+
+class OverpassStub:
+    """In-memory Overpass interpreter for the query subset the places service uses."""
+
+    def __init__(self, elements: List[dict]):
+        """
+        Initialize the stub.
+
+        Args:
+            elements: Overpass JSON elements (nodes with lat/lon, ways/relations with center)
+        """
+        self.elements = elements
+        self.queries: List[str] = []
+        self.elements_scanned = 0
+
+    def _matches(self, element: dict, types: set, filters: List[Tuple[str, str, str]],
+                 radius: float, lat: float, lon: float) -> bool:
+        if element["type"] not in types:
+            return False
+
+        tags = element.get("tags", {})
+        for key, op, value in filters:
+            if key not in tags:
+                return False
+            if op == "=" and tags[key] != value:
+                return False
+            if op == "~" and not re.search(value, tags[key]):
+                return False
+
+        return _distance_m(lat, lon, *_position(element)) <= radius
+
+    def _union(self, clauses: str) -> Dict[Tuple[str, int], dict]:
+        """Elements matching any of the clauses, keyed by (type, id)."""
+        found: Dict[Tuple[str, int], dict] = {}
+        for kind, filter_text, radius, lat, lon in CLAUSE_PATTERN.findall(clauses):
+            filters = [(key, op, value) for key, op, value in FILTER_PATTERN.findall(filter_text)]
+            for element in self.elements:
+                self.elements_scanned += 1
+                if self._matches(element, TYPE_NAMES[kind], filters, float(radius), float(lat), float(lon)):
+                    found[(element["type"], element["id"])] = element
+        return found
+
+    @staticmethod
+    def _output(found: Dict[Tuple[str, int], dict], modifiers: List[str], limit: str) -> List[dict]:
+        """Elements of a set as `out` prints them: sorted, capped and trimmed to the requested parts."""
+        type_order = {"node": 0, "way": 1, "relation": 2}
+        if "qt" in modifiers:
+            results = sorted(found.values(), key=lambda e: _quadtile(*_position(e)))
+        else:
+            results = sorted(found.values(), key=lambda e: (type_order[e["type"]], e["id"]))
+        if limit:
+            results = results[:int(limit)]
+
+        elements = []
+        for element in results:
+            item = {"type": element["type"], "id": element["id"]}
+            if element["type"] == "node":
+                item.update(lat=element["lat"], lon=element["lon"])
+            elif "center" in modifiers:
+                item["center"] = element["center"]
+            if "tags" in modifiers or "body" in modifiers or not modifiers:
+                item["tags"] = element.get("tags", {})
+            elements.append(item)
+        return elements
+
+    def evaluate(self, query: str) -> Dict:
+        """
+        Run a query and return the Overpass JSON response.
+
+        Raises:
+            ValueError: If the query uses syntax the stub does not understand
+        """
+        self.queries.append(query)
+        sets: Dict[str, Dict[Tuple[str, int], dict]] = {}
+        elements: List[dict] = []
+        printed = False
+
+        for statement in STATEMENT_PATTERN.finditer(query):
+            if statement.group("union"):
+                sets[statement.group("union_set") or "_"] = self._union(statement.group("clauses"))
+            elif statement.group("difference"):
+                left, right = sets.get(statement.group("left"), {}), sets.get(statement.group("right"), {})
+                sets[statement.group("difference_set") or "_"] = {
+                    key: element for key, element in left.items() if key not in right
+                }
+            else:
+                found = sets.get(statement.group("out_set") or "_", {})
+                elements += self._output(found, statement.group("modifiers").split(), statement.group("limit"))
+                printed = True
+
+        if not sets or not printed:
+            raise ValueError(f"Unsupported Overpass query: {query!r}")
+
+        return {"version": 0.6, "generator": "Overpass stub", "elements": elements}
+
+    def serve(self) -> ThreadingHTTPServer:
+        """Serve the stub over HTTP on a free local port (POST form field 'data', like Overpass)."""
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            wbufsize = 65536
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode()
+                try:
+                    payload = json.dumps(stub.evaluate(parse_qs(body)["data"][0])).encode()
+                    status = 200
+                except (KeyError, ValueError) as e:
+                    payload, status = str(e).encode(), 400
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
@@ -0,0 +1,94 @@
+"""Store precompressed variants of static assets (build step).
+
+Writes `<file>.gz` (gzip level 9) and, when the optional `brotli` package
+is installed, `<file>.br` (quality 11) next to every compressible file
+(HTML, CSS, JS, JSON, SVG, ...) in the given directories. The backend
+sends these as they are to clients accepting the encoding (see /map), so
+static pages get the strongest compression without spending any CPU on
+it per request. The same files suit any server or CDN that serves
+precompressed siblings (e.g. nginx `gzip_static` / `brotli_static`), such
+as the frontend's static host.
+
+Output is reproducible (no timestamps in the gzip header). A variant is
+only kept when it is smaller than the original; stale variants of files
+that no longer qualify are removed. Variants older than their source are
+ignored by the server, so re-run this after editing a static file.
+
+Usage:
+    python precompress_static.py [directories or files...]   (default: app/static)
+        [--min-size BYTES]
+"""
+
+import argparse
+import gzip
+import os
+
+from app.config import settings
+from app.utils.compression import SUFFIXES, brotli
+
+DEFAULT_PATHS = [os.path.join(os.path.dirname(os.path.abspath(__file__)), "app", "static")]
+EXTENSIONS = {".html", ".htm", ".css", ".js", ".mjs", ".json", ".geojson", ".svg", ".txt", ".xml", ".map"}
+
+
+def compressors():
+    """(coding, compress function) for every coding available here, strongest settings."""
+    result = [("gzip", lambda data: gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        result.append(("br", lambda data: brotli.compress(data, quality=11)))
+    return result
+
+
+def static_files(paths):
+    """Compressible files under the given directories (or the files themselves)."""
+    for path in paths:
+        if os.path.isfile(path):
+            candidates = [path]
+        else:
+            candidates = sorted(os.path.join(root, name) for root, _, names in os.walk(path) for name in names)
+        for candidate in candidates:
+            if os.path.splitext(candidate)[1].lower() in EXTENSIONS:
+                yield candidate
+
+
+def precompress(paths, min_size):
+    """Write the variants and report the sizes per file."""
+    codings = compressors()
+    total_in = 0
+    total_out = {coding: 0 for coding, _ in codings}
+
+    for path in static_files(paths):
+        with open(path, "rb") as f:
+            data = f.read()
+        total_in += len(data)
+
+        sizes = []
+        for coding, compress in codings:
+            variant = path + SUFFIXES[coding]
+            compressed = compress(data) if len(data) >= min_size else data
+            if len(compressed) < len(data):
+                with open(variant, "wb") as f:
+                    f.write(compressed)
+                sizes.append(f"{coding} {len(compressed):,}")
+            elif os.path.exists(variant):
+                os.remove(variant)
+            total_out[coding] += min(len(compressed), len(data))
+
+        print(f"{path}: {len(data):,} bytes" + (f" -> {', '.join(sizes)}" if sizes else " (kept as is)"))
+
+    print(f"\ntotal {total_in:,} bytes -> " + ", ".join(f"{coding} {size:,}" for coding, size in total_out.items()))
+    if brotli is None:
+        print("brotli not installed: only gzip variants written (pip install brotli)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write precompressed variants of static assets")
+    parser.add_argument("paths", nargs="*", default=DEFAULT_PATHS, help="Directories or files (default: app/static)")
+    parser.add_argument("--min-size", type=int, default=settings.compression_min_size,
+                        help="Smaller files are left alone (default: COMPRESSION_MIN_SIZE)")
+    args = parser.parse_args()
+
+    precompress(args.paths, args.min_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""Test script for batch tourism queries and bulk weather lookups (no network)."""
+
+import asyncio
+import httpx
+
+import app.agents.parent_agent as parent_module
+from app.agents.parent_agent import ParentAgent
+from app.services.http_client import http_clients
+from app.services.weather import get_current_weather_bulk
+from app.utils.cache import weather_cache
+from app.utils.exceptions import PlaceNotFoundError
+from testkit import run_tests
+
+LOCATION = {"current": {"temperature_2m": 18.26}, "hourly": {"precipitation_probability": [20, 40]}}
+
+
+def test_bulk_weather_is_one_request_per_chunk():
+    """Uncached cells are deduplicated and fetched together; results are cached."""
+    weather_cache.cache.clear()
+    requests = []
+
+    def handler(request):
+        latitudes = request.url.params["latitude"].split(",")
+        requests.append(latitudes)
+        return httpx.Response(200, json=[LOCATION] * len(latitudes) if len(latitudes) > 1 else LOCATION)
+
+    async def run():
+        http_clients._clients["openmeteo"] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            # Paris twice (same grid cell), Tokyo once
+            first = await get_current_weather_bulk([(48.8566, 2.3522), (35.6762, 139.6503), (48.8566, 2.3522)])
+            second = await get_current_weather_bulk([(35.6762, 139.6503)])
+        finally:
+            await http_clients._clients.pop("openmeteo").aclose()
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert requests == [["48.8566", "35.6762"]]
+    assert first[0] == first[1] == first[2] == {"temperature": 18.3, "precipitation_probability": 30}
+    assert second == [first[1]]
+
+
+def test_bulk_weather_failure_leaves_gaps():
+    """A failed bulk request yields None entries instead of raising."""
+    weather_cache.cache.clear()
+
+    async def run():
+        http_clients._clients["openmeteo"] = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(503))
+        )
+        try:
+            return await get_current_weather_bulk([(41.9028, 12.4964)])
+        finally:
+            await http_clients._clients.pop("openmeteo").aclose()
+
+    assert asyncio.run(run()) == [None]
+
+
+def test_batch_geocodes_each_location_once():
+    """Repeated locations share a geocode; answers keep request order."""
+    agent = ParentAgent()
+    geocoded = []
+    bulk_points = []
+
+    async def fake_get_coordinates(location):
+        geocoded.append(location)
+        known = {"Paris": {"lat": 48.8566, "lon": 2.3522}, "Rome": {"lat": 41.9028, "lon": 12.4964}}
+        if location not in known:
+            raise PlaceNotFoundError(f"Place not found: {location}")
+        return known[location]
+
+    async def fake_bulk(points):
+        bulk_points.extend(points)
+        return [None] * len(points)
+
+    async def fake_weather(lat, lon, place_name):
+        return agent.weather_agent.format_response(success=True, data={"text": f"Sunny in {place_name}."})
+
+    async def fake_places(lat, lon, place_name):
+        return agent.places_agent.format_response(success=True, data={"text": f"Visit {place_name}.", "places": []})
+
+    original = parent_module.get_coordinates, parent_module.get_current_weather_bulk
+    parent_module.get_coordinates, parent_module.get_current_weather_bulk = fake_get_coordinates, fake_bulk
+    agent.weather_agent.process = fake_weather
+    agent.places_agent.process = fake_places
+    try:
+        results = asyncio.run(agent.process_batch([
+            "Weather in Paris", "Places to visit in Rome", "What's the weather in Paris?", "Zzyzx"
+        ]))
+    finally:
+        parent_module.get_coordinates, parent_module.get_current_weather_bulk = original
+
+    assert geocoded == ["Paris", "Rome", "Zzyzx"]
+    assert bulk_points == [(48.8566, 2.3522), (48.8566, 2.3522)]
+    assert [result["success"] for result in results] == [True, True, True, False]
+    assert results[0]["data"]["place_name"] == "Paris"
+    assert results[1]["data"]["place_name"] == "Rome"
+
+
+if __name__ == "__main__":
+    run_tests([
+        test_bulk_weather_is_one_request_per_chunk,
+        test_bulk_weather_failure_leaves_gaps,
+        test_batch_geocodes_each_location_once,
+    ])
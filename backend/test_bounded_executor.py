@@ -0,0 +1,137 @@
+"""Test script for the bounded render executor and map render offloading (no network)."""
+
+import asyncio
+import threading
+import time
+
+import httpx
+
+import app.main as main
+import app.services.map_service as map_service
+from app.utils.bounded_executor import BoundedExecutor, bounded_executor_stats
+from app.utils.cache import map_cache
+from app.utils.exceptions import ExecutorBusyError
+from testkit import FakeParentAgent, run_tests
+
+
+def test_blocking_work_leaves_loop_responsive():
+    """The loop keeps ticking during a 200ms blocking job; process pools work too."""
+    threads = BoundedExecutor("test_threads", max_workers=1, max_queue=0)
+    processes = BoundedExecutor("test_processes", kind="process", max_workers=1, max_queue=0)
+
+    async def run():
+        gaps = []
+
+        async def ticker():
+            last = time.perf_counter()
+            for _ in range(20):
+                await asyncio.sleep(0.01)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        ticks = asyncio.create_task(ticker())
+        slept = await threads.run(time.sleep, 0.2)
+        await ticks
+        return slept, max(gaps), await processes.run(sum, range(1_000_000))
+
+    try:
+        slept, worst_gap, total = asyncio.run(run())
+    finally:
+        threads.close()
+        processes.close()
+
+    assert slept is None
+    assert worst_gap < 0.06
+    assert total == 499999500000
+    assert threads.stats()["completed"] == 1 and threads.stats()["run_ms_p50"] >= 190
+    assert processes.stats()["completed"] == 1 and processes.stats()["kind"] == "process"
+
+
+def test_backpressure_rejects_and_cancel_frees_slot():
+    """Beyond workers + queue a job is rejected at once; a cancelled queued job never runs."""
+    executor = BoundedExecutor("test_bounded", max_workers=1, max_queue=1)
+    release = threading.Event()
+    ran = []
+
+    def job(name):
+        release.wait(5)
+        ran.append(name)
+        return name
+
+    async def run():
+        first = asyncio.create_task(executor.run(job, "first"))
+        second = asyncio.create_task(executor.run(job, "second"))
+        await asyncio.sleep(0.05)
+
+        try:
+            await executor.run(job, "third")
+            rejected = False
+        except ExecutorBusyError:
+            rejected = True
+        busy = executor.stats()
+
+        second.cancel()
+        await asyncio.sleep(0.05)
+        after_cancel = executor.pending
+        release.set()
+        return rejected, busy, after_cancel, await first, await executor.run(job, "fourth")
+
+    try:
+        rejected, busy, after_cancel, first, fourth = asyncio.run(run())
+    finally:
+        release.set()
+        executor.close()
+
+    assert rejected
+    assert busy["running"] == 1 and busy["queued"] == 1 and busy["rejected"] == 1
+    assert after_cancel == 1
+    assert (first, fourth) == ("first", "fourth")
+    assert ran == ["first", "fourth"]
+    assert executor.pending == 0 and executor.stats()["completed"] == 2
+    assert executor.stats()["queue_ms_p99"] >= 0
+
+
+def test_saturated_map_renders_answer_503():
+    """A map that cannot be queued gets 503 with Retry-After; queries keep working meanwhile."""
+    map_cache.clear()
+    release = threading.Event()
+    saturated = BoundedExecutor("test_map_render", max_workers=1, max_queue=0)
+    original_executor, map_service.render_executor = map_service.render_executor, saturated
+    original_agent = main.parent_agent
+    main.parent_agent = FakeParentAgent([{"name": "Louvre", "lat": 48.8606, "lon": 2.3376, "type": "museum"}])
+
+    async def run():
+        blocker = asyncio.create_task(saturated.run(release.wait, 5))
+        await asyncio.sleep(0.05)
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            busy = await client.get("/api/tourism/map", params={"query": "Paris"})
+            query = await client.post("/api/tourism/query", json={"query": "Paris"})
+            release.set()
+            await blocker
+            rendered = await client.get("/api/tourism/map", params={"query": "Paris"})
+        stats = bounded_executor_stats()
+        return busy, query, rendered, stats
+
+    try:
+        busy, query, rendered, stats = asyncio.run(run())
+    finally:
+        release.set()
+        saturated.close()
+        map_service.render_executor = original_executor
+        main.parent_agent = original_agent
+
+    assert busy.status_code == 503 and busy.headers["retry-after"] == "1"
+    assert query.status_code == 200
+    assert rendered.status_code == 200 and "Louvre" in rendered.text
+    assert stats["test_map_render"]["rejected"] == 1 and stats["test_map_render"]["completed"] == 2
+    assert "map_render" in stats
+
+
+if __name__ == "__main__":
+    run_tests([
+        test_blocking_work_leaves_loop_responsive,
+        test_backpressure_rejects_and_cancel_frees_slot,
+        test_saturated_map_renders_answer_503,
+    ])
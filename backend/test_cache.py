@@ -0,0 +1,82 @@
+"""Test script for the bounded LRU cache (no network)."""
+
+from app.utils.cache import CacheManager
+from testkit import FakeClock, run_tests
+
+
+def test_lru_eviction_by_entries():
+    """The least recently used entry is evicted first."""
+    cache = CacheManager(max_entries=3, name="test-lru")
+    for key in ("a", "b", "c"):
+        cache.set(key, key.upper())
+
+    cache.get("a")  # 'b' is now least recently used
+    cache.set("d", "D")
+
+    assert cache.get("b") is None
+    assert [cache.get(key) for key in ("a", "c", "d")] == ["A", "C", "D"]
+    assert cache.stats()["evictions"] == 1
+
+
+def test_max_bytes_limit():
+    """Entries are evicted to stay within the byte budget."""
+    cache = CacheManager(max_entries=1000, max_bytes=2000, name="test-bytes")
+    for i in range(100):
+        cache.set(f"key{i}", "x" * 100)
+
+    stats = cache.stats()
+    assert stats["bytes"] <= 2000
+    assert 0 < stats["entries"] < 100
+    assert cache.get("key99") is not None
+
+
+def test_ttl_and_per_entry_override():
+    """Entries expire after the default TTL or their own TTL."""
+    clock = FakeClock()
+    cache = CacheManager(ttl_minutes=10, name="test-ttl", clock=clock.time)
+    cache.set("default", 1)
+    cache.set("short", 2, ttl_minutes=1)
+
+    clock.now = 120  # 2 minutes
+    assert cache.get("short") is None
+    assert cache.get("default") == 1
+
+    clock.now = 601  # just over 10 minutes
+    assert cache.get("default") is None
+    assert cache.stats()["expirations"] == 2
+
+
+def test_sweep_drops_unread_expired_entries():
+    """Expired entries are removed even if never read again."""
+    clock = FakeClock()
+    cache = CacheManager(ttl_minutes=1, sweep_interval=30, name="test-sweep", clock=clock.time)
+    for i in range(50):
+        cache.set(f"city{i}", i)
+
+    clock.now = 61
+    cache.set("fresh", 1)  # Triggers the amortised sweep
+
+    assert len(cache) == 1
+    assert cache.stats()["bytes"] > 0
+
+
+def test_counters_and_case_insensitive_keys():
+    """Hits and misses are counted; keys are case-insensitive."""
+    cache = CacheManager(name="test-counters")
+    cache.set("Paris", {"lat": 48.85})
+
+    assert cache.get("PARIS") == {"lat": 48.85}
+    assert cache.get("London") is None
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+
+if __name__ == "__main__":
+    run_tests([
+        test_lru_eviction_by_entries,
+        test_max_bytes_limit,
+        test_ttl_and_per_entry_override,
+        test_sweep_drops_unread_expired_entries,
+        test_counters_and_case_insensitive_keys,
+    ])
@@ -0,0 +1,173 @@
+"""Test script for response compression and precompressed static assets (no network)."""
+
+import asyncio
+import contextlib
+import gzip
+import io
+import os
+import shutil
+import tempfile
+import zlib
+
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+
+import app.main as main
+from app.services.map_service import MAP_SHELL_PATH
+from app.utils.compression import CompressionMiddleware, brotli, negotiate, precompressed_variant
+from precompress_static import precompress
+from testkit import run_tests
+
+BIG = "Eiffel Tower, Louvre, Notre-Dame. " * 100
+
+
+def _app():
+    """Small app with one response of each kind, behind the middleware."""
+    app = FastAPI()
+
+    @app.get("/big")
+    async def big():
+        return PlainTextResponse(BIG, headers={"ETag": '"v1"'})
+
+    @app.get("/small")
+    async def small():
+        return JSONResponse({"ok": True})
+
+    @app.get("/image")
+    async def image():
+        return Response(b"\x89PNG" + b"\0" * 5000, media_type="image/png")
+
+    @app.get("/stream")
+    async def stream():
+        async def lines():
+            for i in range(3):
+                yield f'{{"line": {i}}}\n'
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+    return app
+
+
+def _get(app, *calls):
+    """Send GET (url, headers) requests; bodies are left encoded."""
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            responses = []
+            for url, headers in calls:
+                async with client.stream("GET", url, headers=headers) as response:
+                    responses.append((response, b"".join([chunk async for chunk in response.aiter_raw()])))
+            return responses
+
+    return asyncio.run(run())
+
+
+def test_negotiation_and_thresholds():
+    """Best accepted coding by q-value; small and already-compressed types go out as they are."""
+    assert negotiate("gzip, deflate") == "gzip"
+    assert negotiate("br;q=0, gzip;q=0.5") == "gzip"
+    assert negotiate("identity") is None and negotiate("") is None and negotiate("gzip;q=0") is None
+    assert negotiate("*", ["br", "gzip"]) == "br"
+    assert negotiate("gzip;q=1, br;q=0.8", ["br", "gzip"]) == "gzip"
+
+    (big, big_body), (small, small_body), (image, image_body), (plain, plain_body) = _get(
+        _app(), ("/big", {"Accept-Encoding": "gzip"}), ("/small", {"Accept-Encoding": "gzip"}),
+        ("/image", {"Accept-Encoding": "gzip"}), ("/big", {"Accept-Encoding": "identity"}))
+
+    assert big.headers["content-encoding"] == "gzip" and "accept-encoding" in big.headers["vary"].lower()
+    assert gzip.decompress(big_body).decode() == BIG
+    assert int(big.headers["content-length"]) == len(big_body) < len(BIG) / 10
+    assert big.headers["etag"] == 'W/"v1"'
+    assert "content-encoding" not in small.headers and small_body == b'{"ok":true}'
+    assert "content-encoding" not in image.headers and len(image_body) == 5004 and "vary" not in image.headers
+    assert "content-encoding" not in plain.headers and plain_body.decode() == BIG and plain.headers["etag"] == '"v1"'
+    # Negotiable responses sent as they are still vary on Accept-Encoding, for shared caches
+    (bare, _), = _get(_app(), ("/big", {"Accept-Encoding": ""}))
+    assert plain.headers["vary"] == small.headers["vary"] == bare.headers["vary"] == "Accept-Encoding"
+
+    if brotli is not None:
+        (br, br_body), = _get(_app(), ("/big", {"Accept-Encoding": "gzip, br"}))
+        assert br.headers["content-encoding"] == "br" and brotli.decompress(br_body).decode() == BIG
+
+
+def test_streams_stay_incremental():
+    """NDJSON is compressed chunk by chunk: each line can be decoded as soon as it is sent."""
+    messages = []
+
+    async def run():
+        requests = [{"type": "http.request", "body": b"", "more_body": False}]
+
+        async def receive():
+            if requests:
+                return requests.pop()
+            await asyncio.Event().wait()  # the client never disconnects
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {"type": "http", "method": "GET", "path": "/stream", "raw_path": b"/stream", "root_path": "",
+                 "scheme": "http", "query_string": b"", "server": ("test", 80), "client": ("test", 1234),
+                 "http_version": "1.1", "headers": [(b"accept-encoding", b"gzip")]}
+        await _app()(scope, receive, send)
+
+    asyncio.run(run())
+    headers = dict(messages[0]["headers"])
+    decoder = zlib.decompressobj(31)
+    lines = [decoder.decompress(message["body"]).decode() for message in messages[1:]]
+
+    assert headers[b"content-encoding"] == b"gzip" and b"content-length" not in headers
+    assert lines[:3] == ['{"line": 0}\n', '{"line": 1}\n', '{"line": 2}\n']
+    assert decoder.eof and not messages[-1].get("more_body")
+
+
+def test_precompressed_map_shell():
+    """/map is sent from its stored variant as-is; stale or missing variants fall back."""
+    workdir = tempfile.mkdtemp()
+    try:
+        page = os.path.join(workdir, "page.html")
+        with open(page, "w", encoding="utf-8") as f:
+            f.write(BIG)
+        with contextlib.redirect_stdout(io.StringIO()):
+            precompress([workdir], min_size=1024)
+            with open(page + ".gz", "rb") as f:
+                first = f.read()
+            precompress([workdir], min_size=1024)
+        with open(page + ".gz", "rb") as f:
+            assert f.read() == first  # reproducible
+
+        assert precompressed_variant(page, "gzip") == (page + ".gz", "gzip")
+        assert precompressed_variant(page, "identity") is None
+        os.utime(page, (os.stat(page).st_atime, os.stat(page + ".gz").st_mtime + 10))
+        assert precompressed_variant(page, "gzip") is None  # source edited after the build step
+    finally:
+        shutil.rmtree(workdir)
+
+    original = os.path.exists(MAP_SHELL_PATH + ".gz")
+    if not original:
+        with contextlib.redirect_stdout(io.StringIO()):
+            precompress([MAP_SHELL_PATH], min_size=1024)
+    try:
+        (zipped, zipped_body), (plain, plain_body) = _get(
+            main.app, ("/map", {"Accept-Encoding": "gzip"}), ("/map", {"Accept-Encoding": "identity"}))
+    finally:
+        if not original:
+            for suffix in (".gz", ".br"):
+                if os.path.exists(MAP_SHELL_PATH + suffix):
+                    os.remove(MAP_SHELL_PATH + suffix)
+
+    with open(MAP_SHELL_PATH, "rb") as f:
+        source = f.read()
+    assert zipped.headers["content-encoding"] == "gzip" and zipped.headers["content-type"].startswith("text/html")
+    assert gzip.decompress(zipped_body) == source and len(zipped_body) < len(source) / 3
+    assert "Accept-Encoding" in zipped.headers["vary"] and zipped.headers["cache-control"].startswith("public")
+    assert "content-encoding" not in plain.headers and plain_body == source
+    assert plain.headers["vary"].lower().count("accept-encoding") == 1
+
+
+if __name__ == "__main__":
+    run_tests([
+        test_negotiation_and_thresholds,
+        test_streams_stay_incremental,
+        test_precompressed_map_shell,
+    ])
@@ -0,0 +1,91 @@
+"""Test script for the persistent SQLite cache tier (no network)."""
+
+import asyncio
+import os
+import tempfile
+import time
+from app.utils.cache import CacheManager, GridCache
+from app.utils.disk_cache import DiskCache
+from testkit import run_tests
+
+
+def _db_path() -> str:
+    return os.path.join(tempfile.mkdtemp(), "cache.sqlite3")
+
+
+def test_disk_roundtrip_and_expiry():
+    """Values round-trip through SQLite and expired rows are not returned."""
+    async def run():
+        disk = DiskCache(_db_path())
+        await disk.set("geocoding", "paris", {"lat": 48.85, "lon": 2.35}, time.time() + 60)
+        await disk.set("geocoding", "old", {"lat": 0, "lon": 0}, time.time() - 1)
+
+        fresh = await disk.get("geocoding", "paris")
+        stale = await disk.get("geocoding", "old")
+        other_namespace = await disk.get("places", "paris")
+        purged = await disk.purge_expired()
+        disk.close()
+        return fresh, stale, other_namespace, purged
+
+    fresh, stale, other_namespace, purged = asyncio.run(run())
+
+    assert fresh[0] == {"lat": 48.85, "lon": 2.35}
+    assert stale is None
+    assert other_namespace is None
+    assert purged == 1
+
+
+def test_memory_miss_falls_back_to_disk():
+    """A memory miss is served from disk and promoted into memory."""
+    async def run():
+        disk = DiskCache(_db_path())
+        writer = CacheManager(name="geocoding")
+        writer.attach_disk_tier(disk)
+        await writer.aset("Paris", {"lat": 48.85, "lon": 2.35})
+
+        reader = CacheManager(name="geocoding")  # e.g. another worker process
+        reader.attach_disk_tier(disk)
+        value = await reader.aget("paris")
+        promoted = reader.get("paris")
+        disk.close()
+        return value, promoted, reader.stats()
+
+    value, promoted, stats = asyncio.run(run())
+
+    assert value == {"lat": 48.85, "lon": 2.35}
+    assert promoted == value
+    assert stats["disk_hits"] == 1
+
+
+def test_warm_up_after_restart():
+    """A fresh cache process starts warm from the shared database file."""
+    path = _db_path()
+
+    async def before_restart():
+        disk = DiskCache(path)
+        cache = GridCache(CacheManager(name="places"), cell_km=1.0)
+        cache.cache.attach_disk_tier(disk)
+        await cache.aset(48.8566, 2.3522, [{"name": "Louvre Museum"}], suffix="10000")
+        disk.close()
+
+    async def after_restart():
+        disk = DiskCache(path)
+        cache = GridCache(CacheManager(name="places"), cell_km=1.0)
+        cache.cache.attach_disk_tier(disk)
+        loaded = await cache.cache.warm_up()
+        disk.close()
+        return loaded, cache.get(48.8566, 2.3522, suffix="10000")
+
+    asyncio.run(before_restart())
+    loaded, places = asyncio.run(after_restart())
+
+    assert loaded == 1
+    assert places == [{"name": "Louvre Museum"}]
+
+
+if __name__ == "__main__":
+    run_tests([
+        test_disk_roundtrip_and_expiry,
+        test_memory_miss_falls_back_to_disk,
+        test_warm_up_after_restart,
+    ])
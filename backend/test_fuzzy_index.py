@@ -0,0 +1,69 @@
+"""Test script for the trigram fuzzy index (no network)."""
+
+from difflib import SequenceMatcher, get_close_matches
+
+from app.utils.fuzzy_index import FuzzyIndex, _trigrams
+from app.utils.spell_checker import SpellChecker
+from app.utils.text_parser import WORLD_CITIES
+from testkit import run_tests
+
+TYPOS = ["Banglore", "Parris", "Londn", "Tokio", "Barcellona", "Amsterdm", "Sydny", "Mumbay",
+         "Los Angelos", "San Fransisco", "Rio de Janero", "Kuala Lumpor", "Jaipr", "Hydrabad"]
+
+
+def single_edits(name: str) -> set:
+    """Every deletion, doubled letter and adjacent transposition of name."""
+    edits = set()
+    for i in range(len(name)):
+        edits.add(name[:i] + name[i + 1:])
+        edits.add(name[:i] + name[i] + name[i:])
+        if i < len(name) - 1:
+            edits.add(name[:i] + name[i + 1] + name[i] + name[i + 2:])
+    edits.discard("")
+    return edits
+
+
+def test_suggestion_order_matches_difflib():
+    """On the shipped city lists, suggestions and their order are difflib's (minus names sharing no trigram)."""
+    for cities in (WORLD_CITIES, SpellChecker().cities):
+        cities = list(dict.fromkeys(cities))
+        index = FuzzyIndex(cities)
+
+        for city in cities:
+            for typo in sorted(single_edits(city)):
+                ranked = get_close_matches(typo, cities, n=len(cities), cutoff=0.6)
+                expected = [name for name in ranked if _trigrams(name) & _trigrams(typo)][:3]
+                assert index.get_close_matches(typo, n=3, cutoff=0.6) == expected, f"{typo}: {expected}"
+
+    index = FuzzyIndex(WORLD_CITIES)
+    for typo in TYPOS:
+        ratio, best = index.search(typo, n=3, cutoff=0.6)[0]
+        assert best == get_close_matches(typo, WORLD_CITIES, n=1, cutoff=0.6)[0]
+        assert ratio == SequenceMatcher(None, best, typo).ratio()
+
+
+def test_exact_lookup_and_duplicates():
+    """Exact lookups ignore case; duplicate names are indexed and suggested once."""
+    index = FuzzyIndex(["Paris", "paris", "Perth", "Paris"])
+
+    assert len(index) == 3
+    assert index.exact("PARIS") == "Paris"
+    assert index.exact("Atlantis") is None
+    assert index.get_close_matches("Pariss", n=3) == ["Paris", "paris"]
+
+
+def test_cutoff_and_misses():
+    """Nothing below the cutoff is returned; unrelated words return nothing."""
+    index = FuzzyIndex(WORLD_CITIES)
+
+    assert index.get_close_matches("Weather", n=3, cutoff=0.6) == []
+    assert all(ratio >= 0.8 for ratio, _ in index.search("Chenai", n=3, cutoff=0.8))
+    assert index.get_close_matches("", n=3) == []
+
+
+if __name__ == "__main__":
+    run_tests([
+        test_suggestion_order_matches_difflib,
+        test_exact_lookup_and_duplicates,
+        test_cutoff_and_misses,
+    ])
@@ -0,0 +1,75 @@
+"""Test script for the offline gazetteer (no network)."""
+
+import asyncio
+import os
+import tempfile
+
+from app.services.gazetteer import Gazetteer, gazetteer
+from app.services.geocoding import get_coordinates
+from app.services.http_client import http_clients
+from app.utils.cache import geocoding_cache
+from app.utils.spell_checker import COMMON_CITIES
+from app.utils.text_parser import WORLD_CITIES
+from testkit import run_tests
+
+
+class NoNetworkClient:
+    """Fails the test if geocoding falls through to Nominatim."""
+
+    async def get(self, *args, **kwargs):
+        raise AssertionError("Nominatim was called")
+
+
+def test_bundled_gazetteer_covers_known_cities():
+    """Every city the parser and spell checker know resolves offline."""
+    missing = [city for city in set(WORLD_CITIES) | set(COMMON_CITIES) if gazetteer.lookup(city) is None]
+    assert not missing, f"missing: {missing}"
+
+
+def test_aliases_accents_and_spacing():
+    """Aliases, accents, dots and case/spacing all resolve to the same place."""
+    assert gazetteer.lookup("Bombay") == gazetteer.lookup("mumbai")
+    assert gazetteer.lookup("Sao Paulo") == gazetteer.lookup("São Paulo")
+    assert gazetteer.lookup("St. Petersburg").country == "RU"
+    assert gazetteer.lookup("  new   YORK ").name == "New York"
+    assert gazetteer.lookup("Atlantis") is None
+
+
+def test_more_populous_entry_wins():
+    """Duplicate names resolve to the larger place; bad lines are skipped."""
+    with tempfile.NamedTemporaryFile("w", suffix=".tsv", delete=False, encoding="utf-8") as f:
+        f.write("# name\taliases\tlat\tlon\tcountry\tpopulation\n")
+        f.write("Paris\t\t33.66\t-95.55\tUS\t24171\n")
+        f.write("Paris\tLutetia\t48.8566\t2.3522\tFR\t2161000\n")
+        f.write("broken line\n")
+
+    try:
+        small = Gazetteer(f.name)
+        assert small.load() == 2
+        assert small.lookup("paris").country == "FR"
+        assert small.lookup("lutetia").country == "FR"
+        assert small.stats() == {"names": 2, "hits": 2, "misses": 0}
+    finally:
+        os.unlink(f.name)
+
+
+def test_get_coordinates_skips_nominatim():
+    """Known cities (also after spell correction) never reach Nominatim."""
+    http_clients.register("nominatim", NoNetworkClient())
+    geocoding_cache.clear()
+
+    paris = asyncio.run(get_coordinates("Paris"))
+    assert paris == {"lat": 48.8566, "lon": 2.3522}
+
+    corrected = asyncio.run(get_coordinates("Parris"))
+    assert corrected["corrected_from"] == "Parris"
+    assert corrected["lat"] == paris["lat"]
+
+
+if __name__ == "__main__":
+    run_tests([
+        test_bundled_gazetteer_covers_known_cities,
+        test_aliases_accents_and_spacing,
+        test_more_populous_entry_wins,
+        test_get_coordinates_skips_nominatim,
+    ])
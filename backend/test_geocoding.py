@@ -0,0 +1,104 @@
+"""Test script for the geocoding not-found cache (no network)."""
+
+import asyncio
+
+import httpx
+
+import app.services.geocoding as geocoding
+from app.services.http_client import http_clients
+from app.utils.cache import geocoding_negative_cache
+from app.utils.exceptions import PlaceNotFoundError
+from testkit import FakeClock, run_tests
+
+UNKNOWN = "Xyzzyville"
+
+
+class CountingLimiter:
+    """Stand-in for nominatim_limiter that counts the budget spent."""
+
+    def __init__(self):
+        self.acquired = 0
+
+    async def acquire(self):
+        self.acquired += 1
+
+
+def lookup(names, auto_correct=True, clock=None, advance=0.0):
+    """Geocode names against a Nominatim that knows nothing; return (outcomes, upstream calls, limiter)."""
+    requests = []
+    limiter = CountingLimiter()
+
+    def handler(request):
+        requests.append(request.url.params["q"])
+        return httpx.Response(200, json=[])
+
+    async def run():
+        outcomes = []
+        for name in names:
+            if name is None:  # time passes
+                clock.now += advance
+                continue
+            try:
+                outcomes.append(await geocoding.get_coordinates(name, auto_correct=auto_correct))
+            except PlaceNotFoundError as e:
+                outcomes.append(e)
+        return outcomes
+
+    original_limiter, original_clock = geocoding.nominatim_limiter, geocoding_negative_cache._clock
+    geocoding.nominatim_limiter = limiter
+    if clock is not None:
+        geocoding_negative_cache._clock = clock.time
+    http_clients.register("nominatim", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    try:
+        return asyncio.run(run()), requests, limiter
+    finally:
+        geocoding.nominatim_limiter = original_limiter
+        geocoding_negative_cache._clock = original_clock
+        asyncio.run(http_clients.close())
+
+
+def test_repeated_miss_skips_limiter_and_upstream():
+    """The first miss is stored; repeats fail from the cache without Nominatim budget."""
+    geocoding_negative_cache.clear()
+    outcomes, requests, limiter = lookup([UNKNOWN, UNKNOWN, f"  {UNKNOWN.lower()} "])
+
+    assert requests == [UNKNOWN]
+    assert limiter.acquired == 1
+    assert all(isinstance(outcome, PlaceNotFoundError) for outcome in outcomes)
+    assert geocoding_negative_cache.get(geocoding._lookup_key(UNKNOWN, True)) is not None
+
+
+def test_miss_expires_and_key_includes_auto_correct():
+    """Entries expire after their TTL; a miss without spelling correction does not answer one with it."""
+    geocoding_negative_cache.clear()
+    clock = FakeClock()
+    ttl = geocoding_negative_cache.ttl
+
+    _, requests, limiter = lookup([UNKNOWN, UNKNOWN, None, UNKNOWN], clock=clock, advance=ttl + 1)
+    assert requests == [UNKNOWN, UNKNOWN] and limiter.acquired == 2
+
+    geocoding_negative_cache.clear()
+    _, raw, _ = lookup(["Pariss"], auto_correct=False)
+    cached = geocoding_negative_cache.get(geocoding._lookup_key("Pariss", False))
+    assert raw == ["Pariss"] and cached is not None
+    assert geocoding_negative_cache.get(geocoding._lookup_key("Pariss", True)) is None
+    corrected, requests, _ = lookup(["Pariss"])
+    assert requests == [] and corrected == [{"lat": 48.8566, "lon": 2.3522, "corrected_from": "Pariss"}]
+
+
+def test_cached_miss_keeps_suggestions():
+    """PlaceNotFoundError raised from the cache carries the same suggestions as the first miss."""
+    geocoding_negative_cache.clear()
+    (first, second), requests, _ = lookup(["Londn Towne", "Londn Towne"], auto_correct=False)
+
+    assert len(requests) == 1
+    assert first.suggestions and second.suggestions == first.suggestions
+    assert str(second) == str(first)
+
+
+if __name__ == "__main__":
+    run_tests([
+        test_repeated_miss_skips_limiter_and_upstream,
+        test_miss_expires_and_key_includes_auto_correct,
+        test_cached_miss_keeps_suggestions,
+    ])
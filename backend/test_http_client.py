@@ -0,0 +1,104 @@
+"""Test script for the pooled HTTP client registry (no network)."""
+
+import asyncio
+
+import httpx
+
+import app.main as main
+import app.services.http_client as http_client
+from app.config import settings
+from app.services.http_client import HTTPClientRegistry, http_clients
+from app.utils.bounded_executor import BoundedExecutor
+from testkit import run_tests
+
+
+def _pool(client: httpx.AsyncClient):
+    """The connection pool behind a client's default transport."""
+    return client._transport._pool
+
+
+def test_one_client_per_upstream():
+    """The same upstream gets the same client until it is closed; unknown upstreams are rejected."""
+    registry = HTTPClientRegistry()
+
+    async def run():
+        first = registry.get("nominatim")
+        again = registry.get("nominatim")
+        other = registry.get("overpass")
+        await first.aclose()
+        reopened = registry.get("nominatim")
+        stub = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200)))
+        registry.register("openmeteo", stub)
+        registered = registry.get("openmeteo")
+        await registry.close()
+        return first, again, other, reopened, stub, registered
+
+    first, again, other, reopened, stub, registered = asyncio.run(run())
+
+    assert first is again and first is not other
+    assert reopened is not first and reopened.is_closed  # closed again by registry.close()
+    assert registered is stub
+    assert registry._clients == {}
+    try:
+        registry.get("unknown")
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("unknown upstream accepted")
+
+
+def test_limits_timeouts_and_http2():
+    """Pool sizes, keep-alive and timeout come from settings; HTTP/2 only with 'h2' installed."""
+    registry = HTTPClientRegistry()
+    nominatim, openmeteo = registry.get("nominatim"), registry.get("openmeteo")
+
+    pool = _pool(nominatim)
+    assert pool._max_connections == settings.nominatim_max_connections
+    assert pool._max_keepalive_connections == min(settings.nominatim_max_connections,
+                                                  settings.http_max_keepalive_connections)
+    assert pool._keepalive_expiry == settings.http_keepalive_expiry
+    assert _pool(openmeteo)._max_connections == settings.openmeteo_max_connections
+    assert nominatim.timeout == httpx.Timeout(settings.api_timeout)
+    assert nominatim.headers["user-agent"] == f"{settings.app_name}/{settings.app_version}"
+    assert pool._http2 == (settings.http2_enabled and http_client.HTTP2_AVAILABLE)
+
+    original = http_client.HTTP2_AVAILABLE
+    http_client.HTTP2_AVAILABLE = False  # as without the 'h2' package
+    try:
+        without_h2 = HTTPClientRegistry().get("overpass")
+    finally:
+        http_client.HTTP2_AVAILABLE = original
+    assert _pool(without_h2)._http2 is False
+
+    asyncio.run(registry.close())
+    asyncio.run(without_h2.aclose())
+
+
+def test_lifespan_opens_and_closes_clients():
+    """App startup creates a client per upstream; shutdown closes them all and empties the registry."""
+    async def run():
+        async with main.lifespan(main.app):
+            clients = dict(http_clients._clients)
+            open_during = [not client.is_closed for client in clients.values()]
+        return clients, open_during
+
+    # Shutdown also closes the map render pool and replaces the agent; keep the shared ones usable
+    original_executor, original_agent = main.render_executor, main.parent_agent
+    main.render_executor = BoundedExecutor("test-render")
+    try:
+        clients, open_during = asyncio.run(run())
+    finally:
+        main.render_executor, main.parent_agent = original_executor, original_agent
+
+    assert set(clients) == {"nominatim", "openmeteo", "overpass"}
+    assert all(open_during)
+    assert all(client.is_closed for client in clients.values())
+    assert http_clients._clients == {}
+
+
+if __name__ == "__main__":
+    run_tests([
+        test_one_client_per_upstream,
+        test_limits_timeouts_and_http2,
+        test_lifespan_opens_and_closes_clients,
+    ])
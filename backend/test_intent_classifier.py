@@ -0,0 +1,42 @@
+"""Test script for the token-based intent classifier (no network)."""
+
+from app.utils.text_parser import EnhancedTextParser
+from testkit import run_tests
+
+parser = EnhancedTextParser()
+classifier = parser.intent_classifier
+
+
+def test_whole_word_matching():
+    """Keywords no longer fire inside longer words."""
+    assert classifier.classify("best hotels in mysore").weather is False  # 'hot'
+    assert classifier.classify("train to rajkot").weather is False  # 'rain'
+    assert classifier.classify("is it raining in paris").weather is True  # inflection of 'rain'
+
+
+def test_evidence_and_confidence():
+    """Matched keywords and rules are reported, strongest evidence sets the confidence."""
+    result = classifier.classify("weather and attractions in rome")
+    assert result.weather and result.places
+    assert result.evidence == ("weather", "attractions")
+    assert result.confidence == 0.95
+
+    result = classifier.classify("going to lisbon next month with friends")
+    assert result.places and not result.weather
+    assert "going to" in result.evidence
+    assert result.confidence == 0.75
+
+
+def test_short_queries_default_to_places():
+    """A bare city name is treated as a tourist guide request."""
+    result = classifier.classify("Bangalore")
+    assert result.as_dict() == {"weather": False, "places": True}
+    assert result.evidence == ("short_query",)
+
+
+if __name__ == "__main__":
+    run_tests([
+        test_whole_word_matching,
+        test_evidence_and_confidence,
+        test_short_queries_default_to_places,
+    ])
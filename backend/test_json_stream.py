@@ -0,0 +1,96 @@
+"""Test script for incremental JSON array parsing and the streamed places fetch (no network)."""
+
+import asyncio
+import json
+
+import httpx
+
+from app.config import settings
+from app.services.http_client import http_clients
+from app.services.places import get_tourist_attractions
+from app.utils.cache import places_cache
+from app.utils.json_stream import iter_array_items
+from testkit import run_tests
+
+BODY = json.dumps({
+    "version": 0.6,
+    "osm3s": {"copyright": "ODbL \"quoted\" [brackets] {braces}", "elements": []},
+    "elements": [
+        {"type": "node", "id": 1, "lat": 48.1, "lon": 2.5, "tags": {"name": "Musée d'Orsay", "name:ja": "オルセー美術館"}},
+        {"type": "way", "id": 2, "center": {"lat": -1e-3, "lon": 12345678901234567890}, "tags": {}},
+        [1, 2, {"nested": [3]}],
+        "text with \\ and é",
+        42,
+    ],
+    "remark": None,
+}, ensure_ascii=False).encode()
+
+
+async def _chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+async def _collect(chunks) -> list:
+    return [item async for item in iter_array_items(chunks, "elements")]
+
+
+def test_items_match_json_loads_for_any_chunking():
+    """Every chunk size (splitting strings, numbers and UTF-8 characters) gives the same items."""
+    expected = json.loads(BODY)["elements"]
+    for size in range(1, 40):
+        assert asyncio.run(_collect(_chunks(BODY, size))) == expected, f"chunk size {size}"
+    assert asyncio.run(_collect(_chunks(BODY, len(BODY)))) == expected
+    assert asyncio.run(_collect(_chunks(b'{"elements": []}', 3))) == []
+    assert asyncio.run(_collect(_chunks(b'{"version": 0.6}\n', 3))) == []
+
+
+def test_malformed_or_truncated_json_raises():
+    """Bad or cut-off bodies raise ValueError instead of ending quietly."""
+    for body in (b"", b"[]", b'{"elements": {}}', b'{"elements": [1, 2', b'{"elements": [{"a": 1}',
+                 b'{"elements" [1]}', b'{"elements": [1, }', b'{"elements": []} []', BODY[:-1]):
+        try:
+            asyncio.run(_collect(_chunks(body, 4)))
+        except ValueError:
+            continue
+        raise AssertionError(f"accepted {body!r}")
+
+
+def test_service_stops_reading_past_the_cap():
+    """A response that ignores the element cap is only read up to the cap."""
+    places_cache.cache.clear()
+    elements = [
+        {"type": "node", "id": i, "lat": 35.68 + i / 100000, "lon": 139.69,
+         "tags": {"name": f"Shrine {i}", "historic": "monument"}}
+        for i in range(20000)
+    ]
+    body = json.dumps({"elements": elements}).encode()
+    sent = []
+
+    async def stream():
+        for start in range(0, len(body), 16384):
+            sent.append(start)
+            yield body[start:start + 16384]
+
+    async def run():
+        http_clients._clients["overpass"] = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, content=stream()))
+        )
+        try:
+            return await get_tourist_attractions(35.6762, 139.6503)
+        finally:
+            await http_clients._clients.pop("overpass").aclose()
+
+    places = asyncio.run(run())
+
+    assert len(places) == settings.places_max_results
+    assert all(int(place["name"].split()[1]) < settings.overpass_max_elements for place in places)
+    assert len(sent) * 16384 < len(body) / 10
+
+
+if __name__ == "__main__":
+    run_tests([
+        test_items_match_json_loads_for_any_chunking,
+        test_malformed_or_truncated_json_raises,
+        test_service_stops_reading_past_the_cap,
+    ])
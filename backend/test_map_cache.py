@@ -0,0 +1,101 @@
+"""Test script for the rendered map page cache and ETag revalidation (no network)."""
+
+import asyncio
+
+import httpx
+
+import app.main as main
+import app.services.map_service as map_service
+from app.services.map_service import bucket_weather, get_map_html, map_fingerprint
+from app.utils.cache import map_cache
+from testkit import FakeParentAgent, run_tests
+
+PLACES = [
+    {"name": "Louvre", "lat": 48.8606, "lon": 2.3376, "type": "museum"},
+    {"name": "Eiffel Tower", "lat": 48.8584, "lon": 2.2945, "type": "attraction"},
+]
+
+
+def _counting_renderer():
+    renders = []
+    original = map_service.render_map_page
+
+    def render(*args, **kwargs):
+        renders.append(args)
+        return original(*args, **kwargs)
+
+    map_service.render_map_page = render
+    return renders, original
+
+
+def test_fingerprint_depends_on_content_and_weather_bucket():
+    """Small weather changes share a page; other places or a new bucket do not."""
+    base = map_fingerprint("Paris", 48.8566, 2.3522, PLACES, {"temp": 18.4, "precipitation": 42})
+
+    assert base == map_fingerprint("Paris", 48.85660001, 2.3522, PLACES, {"temp": 17.6, "precipitation": 38})
+    assert base != map_fingerprint("Paris", 48.8566, 2.3522, PLACES, {"temp": 19.6, "precipitation": 42})
+    assert base != map_fingerprint("Paris", 48.8566, 2.3522, PLACES, {"temp": 18.4, "precipitation": 47})
+    assert base != map_fingerprint("Paris", 48.8566, 2.3522, PLACES[::-1], {"temp": 18.4, "precipitation": 42})
+    assert base != map_fingerprint("Paris", 48.8566, 2.3522, PLACES, None)
+    assert bucket_weather({"temp": 18.4, "precipitation": 47}) == {"temp": 18, "precipitation": 50}
+    assert bucket_weather({"temp": None, "precipitation": None}) == {"temp": None, "precipitation": None}
+
+
+def test_same_fingerprint_renders_once():
+    """The second request for a page is served from the cache."""
+    map_cache.clear()
+    renders, original = _counting_renderer()
+    weather = {"temp": 18.4, "precipitation": 42}
+    try:
+        fingerprint = map_fingerprint("Paris", 48.8566, 2.3522, PLACES, weather)
+        first = asyncio.run(get_map_html(fingerprint, "Paris", 48.8566, 2.3522, PLACES, weather))
+        second = asyncio.run(get_map_html(fingerprint, "Paris", 48.8566, 2.3522, PLACES, weather))
+    finally:
+        map_service.render_map_page = original
+
+    assert len(renders) == 1
+    assert first is second
+    assert '"weather":{"temp":18,"precipitation":40}' in first  # bucketed values are what the page shows
+
+
+def test_get_revalidates_with_etag():
+    """GET answers 304 for a matching If-None-Match; a new weather bucket changes the ETag."""
+    map_cache.clear()
+    renders, original = _counting_renderer()
+    agent = FakeParentAgent(PLACES, weather={"temp": 18.4, "precipitation": 42})
+    original_agent, main.parent_agent = main.parent_agent, agent
+
+    async def run():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            first = await client.get("/api/tourism/map", params={"query": "Show me Paris"})
+            etag = first.headers["etag"]
+            revalidated = await client.get("/api/tourism/map", params={"query": "Show me Paris"},
+                                           headers={"If-None-Match": etag})
+            posted = await client.post("/api/tourism/map", json={"query": "Show me Paris"},
+                                       headers={"If-None-Match": etag})
+            agent.weather = {"temp": 25.0, "precipitation": 0}
+            changed = await client.get("/api/tourism/map", params={"query": "Show me Paris"},
+                                       headers={"If-None-Match": etag})
+        return first, revalidated, posted, changed
+
+    try:
+        first, revalidated, posted, changed = asyncio.run(run())
+    finally:
+        map_service.render_map_page = original
+        main.parent_agent = original_agent
+
+    assert first.status_code == 200 and first.headers["etag"].startswith('W/"')
+    assert first.headers["cache-control"] == "no-cache"
+    assert revalidated.status_code == 304 and revalidated.content == b""
+    assert posted.status_code == 200 and posted.text == first.text  # POST is never conditional
+    assert changed.status_code == 200 and changed.headers["etag"] != first.headers["etag"]
+    assert len(renders) == 2
+
+
+if __name__ == "__main__":
+    run_tests([
+        test_fingerprint_depends_on_content_and_weather_bucket,
+        test_same_fingerprint_renders_once,
+        test_get_revalidates_with_etag,
+    ])
@@ -0,0 +1,123 @@
+"""Test script for the GeoJSON map data endpoint and the static map shell (no network)."""
+
+import asyncio
+import json
+import re
+
+import httpx
+
+import app.main as main
+from app.config import settings
+from app.services.map_service import MAP_SHELL_PATH, create_map_page_html, map_geojson
+from testkit import FakeParentAgent, run_tests
+
+PLACES = [
+    {"name": "Louvre", "lat": 48.86061234567, "lon": 2.33764321, "type": "museum"},
+    {"name": "Eiffel Tower", "lat": 48.8584, "lon": 2.2945},
+]
+
+
+def _requests(*calls):
+    """Run (method, url, kwargs) requests against the app with a fake agent (Paris; Atlantis is not found)."""
+    agent = FakeParentAgent(PLACES, weather={"temp": 18.4, "precipitation": 42}, unknown=["Atlantis"])
+    original_agent, main.parent_agent = main.parent_agent, agent
+
+    async def run():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return [await client.request(method, url, **kwargs) for method, url, kwargs in calls]
+
+    try:
+        return asyncio.run(run())
+    finally:
+        main.parent_agent = original_agent
+
+
+def test_geojson_shape():
+    """City center first, then attractions in order; [lon, lat] rounded to 6 decimals."""
+    data = map_geojson("Paris", 48.8566, 2.3522, PLACES, {"temp": 18, "precipitation": 40, "unit": "C"})
+
+    assert data["type"] == "FeatureCollection"
+    assert data["features"][0] == {
+        "type": "Feature", "geometry": {"type": "Point", "coordinates": [2.3522, 48.8566]},
+        "properties": {"kind": "city", "name": "Paris", "weather": {"temp": 18, "precipitation": 40}}
+    }
+    assert data["features"][1]["geometry"]["coordinates"] == [2.337643, 48.860612]
+    assert [f["properties"] for f in data["features"][1:]] == [
+        {"kind": "attraction", "name": "Louvre", "type": "museum"},
+        {"kind": "attraction", "name": "Eiffel Tower", "type": "attraction"},
+    ]
+    assert len(map_geojson("Paris", 48.8566, 2.3522, [])["features"]) == 1
+
+
+def test_data_endpoint_revalidates_and_reports_errors():
+    """GeoJSON with bucketed weather and an ETag; 304 on a match; unknown places are a JSON 400."""
+    first, = _requests(("GET", "/api/tourism/map/data", {"params": {"query": "Map of Paris"}}))
+    etag = first.headers["etag"]
+    revalidated, missing, page = _requests(
+        ("GET", "/api/tourism/map/data", {"params": {"query": "Map of Paris"}, "headers": {"If-None-Match": etag}}),
+        ("GET", "/api/tourism/map/data", {"params": {"query": "Map of Atlantis"}}),
+        ("GET", "/api/tourism/map", {"params": {"query": "Map of Paris"}}),
+    )
+
+    assert first.status_code == 200 and first.headers["content-type"] == "application/geo+json"
+    assert first.json()["features"][0]["properties"]["weather"] == {"temp": 18, "precipitation": 40}
+    assert b" " not in first.content.replace(b"Eiffel Tower", b"")  # compact separators
+    assert revalidated.status_code == 304 and revalidated.content == b""
+    assert missing.status_code == 400 and missing.json()["error"] == "I don't know this place exists"
+    assert len(first.content) * 10 < len(page.content)
+
+
+def test_shell_is_static_and_shared_with_pages():
+    """/map is one cacheable file; full pages are that file with title and data filled in."""
+    shell, = _requests(("GET", "/map", {}))
+    with open(MAP_SHELL_PATH, encoding="utf-8") as f:
+        source = f.read()
+
+    assert shell.status_code == 200 and shell.headers["content-type"].startswith("text/html")
+    assert shell.headers["cache-control"] == f"public, max-age={settings.map_shell_max_age}"
+    assert shell.text == source
+    assert '<script type="application/json" id="map-data"></script>' in source
+    assert "/api/tourism/map/data?query=" in source
+
+    page = create_map_page_html("Paris", 48.8566, 2.3522, PLACES)
+    data = json.dumps(map_geojson("Paris", 48.8566, 2.3522, PLACES), ensure_ascii=False, separators=(",", ":"))
+    assert page == source.replace("<title>Tourist Map</title>", "<title>Paris - Tourist Map</title>").replace(
+        '<script type="application/json" id="map-data"></script>',
+        f'<script type="application/json" id="map-data">{data}</script>'
+    )
+
+
+def _bound_contents(source):
+    """First argument of every bindTooltip/bindPopup call."""
+    for match in re.finditer(r"\.bind(?:Tooltip|Popup)\(", source):
+        start = end = match.end()
+        depth = 0
+        while depth or source[end] not in ",)":
+            depth += (source[end] in "([{") - (source[end] in ")]}")
+            end += 1
+        yield source[start:end].strip()
+
+
+def test_shell_binds_text_not_html():
+    """Names reach tooltips and popups as text nodes, never concatenated into an HTML string."""
+    with open(MAP_SHELL_PATH, encoding="utf-8") as f:
+        source = f.read()
+    contents = list(_bound_contents(source))
+
+    assert len(contents) == 5
+    for content in contents:
+        literal = re.fullmatch(r'"[^"+]*"', content)
+        node = content.startswith('element("span", "", ')
+        builder = re.fullmatch(r"function \(\) \{ return (cityPopup|placePopup)\([\w., ]+\); \}", content)
+        assert literal or node or builder, content
+    assert "innerHTML" not in source and "insertAdjacentHTML" not in source
+
+
+if __name__ == "__main__":
+    run_tests([
+        test_geojson_shape,
+        test_data_endpoint_revalidates_and_reports_errors,
+        test_shell_is_static_and_shared_with_pages,
+        test_shell_binds_text_not_html,
+    ])
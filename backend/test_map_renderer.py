@@ -0,0 +1,81 @@
+"""Test script for the template map page renderer (no network)."""
+
+import json
+import re
+
+from app.config import settings
+from app.services.map_service import create_enhanced_map_html, create_map_page_html, map_fingerprint, render_map_page
+from testkit import run_tests
+
+PLACES = [
+    {"name": "Louvre", "lat": 48.8606, "lon": 2.3376, "type": "museum"},
+    {"name": "Eiffel Tower", "lat": 48.8584, "lon": 2.2945, "type": "attraction"},
+    {"name": "Parc des Buttes-Chaumont", "lat": 48.8809, "lon": 2.3828},
+]
+
+
+def _map_data(page):
+    """The JSON the page script draws the markers from."""
+    return json.loads(re.search(r'<script type="application/json" id="map-data">(.*?)</script>', page, re.S).group(1))
+
+
+def test_places_are_embedded_geojson():
+    """Markers are data, not code: the page only grows by their JSON."""
+    page = create_map_page_html("Paris", 48.8566, 2.3522, PLACES, {"temp": 18, "precipitation": 40})
+    features = _map_data(page)["features"]
+
+    assert [feature["properties"] for feature in features] == [
+        {"kind": "city", "name": "Paris", "weather": {"temp": 18, "precipitation": 40}},
+        {"kind": "attraction", "name": "Louvre", "type": "museum"},
+        {"kind": "attraction", "name": "Eiffel Tower", "type": "attraction"},
+        {"kind": "attraction", "name": "Parc des Buttes-Chaumont", "type": "attraction"},
+    ]
+    assert features[1]["geometry"] == {"type": "Point", "coordinates": [2.3376, 48.8606]}
+    assert "<title>Paris - Tourist Map</title>" in page
+
+    many = [{"name": f"Place {i}", "lat": 48.8 + i / 1000, "lon": 2.3, "type": "park"} for i in range(500)]
+    big = create_map_page_html("Paris", 48.8566, 2.3522, many)
+    assert len(_map_data(big)["features"]) == 501
+    assert _map_data(big)["features"][0]["properties"]["weather"] is None
+    assert len(big) - len(page) < len(json.dumps(_map_data(big)))
+    assert big.count("L.marker(") == page.count("L.marker(")
+
+
+def test_untrusted_text_cannot_break_out():
+    """Names are escaped in the HTML and cannot close the data script."""
+    places = [{"name": "</script><script>alert(1)</script>", "lat": 1.0, "lon": 2.0, "type": "museum"}]
+    page = create_map_page_html("<b>Evil & Co</b>", 1.0, 2.0, places)
+
+    assert page.count("</script>") == create_map_page_html("Paris", 1.0, 2.0, PLACES).count("</script>")
+    assert "<b>Evil" not in page and "&lt;b&gt;Evil &amp; Co&lt;/b&gt;" in page
+    assert _map_data(page)["features"][1]["properties"]["name"] == places[0]["name"]
+    assert _map_data(page)["features"][0]["properties"]["name"] == "<b>Evil & Co</b>"
+
+
+def test_renderer_setting():
+    """MAP_RENDERER picks the renderer, and pages of different renderers never share a cache key."""
+    original = settings.map_renderer
+    try:
+        settings.map_renderer = "template"
+        template_page = render_map_page("Paris", 48.8566, 2.3522, PLACES)
+        template_key = map_fingerprint("Paris", 48.8566, 2.3522, PLACES)
+
+        settings.map_renderer = "folium"
+        folium_page = render_map_page("Paris", 48.8566, 2.3522, PLACES)
+        folium_key = map_fingerprint("Paris", 48.8566, 2.3522, PLACES)
+    finally:
+        settings.map_renderer = original
+
+    assert template_page == create_map_page_html("Paris", 48.8566, 2.3522, PLACES)
+    assert "leaflet" in folium_page and "map-data" not in folium_page
+    assert all(place["name"] in folium_page for place in PLACES)
+    assert template_key != folium_key
+    assert len(template_page) < len(create_enhanced_map_html("Paris", 48.8566, 2.3522, PLACES))
+
+
+if __name__ == "__main__":
+    run_tests([
+        test_places_are_embedded_geojson,
+        test_untrusted_text_cannot_break_out,
+        test_renderer_setting,
+    ])
@@ -0,0 +1,85 @@
+"""Test script for micro-batched weather lookups (no network)."""
+
+import asyncio
+import httpx
+
+from app.services.http_client import http_clients
+from app.services.weather import get_current_weather
+from app.utils.cache import weather_cache
+from app.utils.micro_batcher import MicroBatcher
+from testkit import run_tests
+
+LOCATION = {"current": {"temperature_2m": 12.0}, "hourly": {"precipitation_probability": [50]}}
+
+
+def test_concurrent_items_share_one_dispatch():
+    """Items submitted within the window go out together; results fan back in order."""
+    dispatched = []
+
+    async def dispatch(items):
+        dispatched.append(list(items))
+        return [item * 10 for item in items]
+
+    batcher = MicroBatcher("test-window", dispatch, max_delay=0.01, max_batch=100)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(20)))
+
+    assert asyncio.run(run()) == [i * 10 for i in range(20)]
+    assert dispatched == [list(range(20))]
+    assert batcher.stats()["avg_batch_size"] == 20
+
+
+def test_max_batch_splits_and_errors_propagate():
+    """Full batches dispatch early; a failed dispatch fails only its own callers."""
+    dispatched = []
+
+    async def dispatch(items):
+        dispatched.append(list(items))
+        if 0 in items:
+            raise ValueError("upstream down")
+        return items
+
+    batcher = MicroBatcher("test-split", dispatch, max_delay=0.01, max_batch=3)
+
+    async def run():
+        return await asyncio.gather(*(batcher.submit(i) for i in range(5)), return_exceptions=True)
+
+    results = asyncio.run(run())
+
+    assert dispatched == [[0, 1, 2], [3, 4]]
+    assert all(isinstance(result, ValueError) for result in results[:3])
+    assert results[3:] == [3, 4]
+
+
+def test_concurrent_weather_lookups_become_one_request():
+    """get_current_weather for different cities at once issues one Open-Meteo call."""
+    weather_cache.cache.clear()
+    requests = []
+
+    def handler(request):
+        latitudes = request.url.params["latitude"].split(",")
+        requests.append(latitudes)
+        return httpx.Response(200, json=[LOCATION] * len(latitudes) if len(latitudes) > 1 else LOCATION)
+
+    cities = [(48.8566, 2.3522), (35.6762, 139.6503), (41.9028, 12.4964), (40.7128, -74.0060)]
+
+    async def run():
+        http_clients._clients["openmeteo"] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await asyncio.gather(*(get_current_weather(lat, lon) for lat, lon in cities))
+        finally:
+            await http_clients._clients.pop("openmeteo").aclose()
+
+    results = asyncio.run(run())
+
+    assert len(requests) == 1 and len(requests[0]) == len(cities)
+    assert all(result == {"temperature": 12.0, "precipitation_probability": 50} for result in results)
+
+
+if __name__ == "__main__":
+    run_tests([
+        test_concurrent_items_share_one_dispatch,
+        test_max_batch_splits_and_errors_propagate,
+        test_concurrent_weather_lookups_become_one_request,
+    ])
@@ -0,0 +1,120 @@
+"""Test script for the Overpass attraction query and the places service (no network)."""
+
+import asyncio
+from urllib.parse import parse_qs
+
+import httpx
+
+from app.config import settings
+from app.services.http_client import http_clients
+from app.services.overpass_query import build_attractions_query, parse_categories
+from app.services.places import PLACE_CATEGORIES, get_tourist_attractions
+from app.utils.cache import places_cache
+from overpass_stub import OverpassStub, synthetic_city
+from testkit import run_tests
+
+
+def test_query_is_one_clause_per_key_with_cap():
+    """One nwr clause per tag key, named elements only; wikidata-tagged ones output first, each part capped."""
+    categories = parse_categories("tourism=attraction|museum; historic=castle ;tourism=museum|zoo")
+    assert categories == {"tourism": ("attraction", "museum", "zoo"), "historic": ("castle",)}
+
+    query = build_attractions_query(48.8566, 2.3522, 10000, categories, max_elements=40)
+    assert query == (
+        "[out:json][timeout:25];\n(\n"
+        '  nwr["tourism"~"^(attraction|museum|zoo)$"]["name"]["wikidata"](around:10000,48.856600,2.352200);\n'
+        '  nwr["historic"="castle"]["name"]["wikidata"](around:10000,48.856600,2.352200);\n'
+        ")->.notable;\n.notable out tags center 40;\n(\n"
+        '  nwr["tourism"~"^(attraction|museum|zoo)$"]["name"](around:10000,48.856600,2.352200);\n'
+        '  nwr["historic"="castle"]["name"](around:10000,48.856600,2.352200);\n'
+        ")->.named;\n(.named; - .notable;);\nout tags center 40;"
+    )
+
+
+def test_malformed_categories_are_rejected():
+    """Missing values, bad characters and empty specs raise ValueError."""
+    for spec in ("", " ; ", "tourism", "tourism=", 'tourism=museum"]', "tourism=a.*|b"):
+        try:
+            parse_categories(spec)
+        except ValueError:
+            continue
+        raise AssertionError(f"accepted {spec!r}")
+
+
+def test_attractions_from_capped_query():
+    """The service gets at most the cap from Overpass and keeps only named, Latin results."""
+    places_cache.cache.clear()
+    stub = OverpassStub(synthetic_city(48.8566, 2.3522))
+    responses = []
+
+    def handler(request):
+        data = stub.evaluate(parse_qs(request.content.decode())["data"][0])
+        responses.append(data["elements"])
+        return httpx.Response(200, json=data)
+
+    async def run():
+        http_clients._clients["overpass"] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            first = await get_tourist_attractions(48.8566, 2.3522)
+            second = await get_tourist_attractions(48.8566, 2.3522)
+        finally:
+            await http_clients._clients.pop("overpass").aclose()
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    assert len(responses) == 1  # second lookup is cached
+    assert 0 < len(responses[0]) <= 2 * settings.overpass_max_elements
+    assert all("name" in element["tags"] for element in responses[0])
+    assert all(
+        any(element["tags"].get(key) in values for key, values in PLACE_CATEGORIES.items())
+        for element in responses[0]
+    )
+    assert len(first) == 5 and first == second
+    assert all(place["name"].isascii() for place in first)
+    assert len({place["name"] for place in first}) == 5
+
+
+def test_notable_elements_survive_the_cap():
+    """A wikidata-tagged attraction with the highest id is still ranked when the cap is far below the count."""
+    places_cache.cache.clear()
+    elements = [
+        {"type": "node", "id": 10 + i, "lat": 48.8566 + i / 10000, "lon": 2.3522,
+         "tags": {"tourism": "attraction", "name": f"Corner {i}"}}
+        for i in range(40)
+    ] + [{"type": "node", "id": 999999, "lat": 48.86, "lon": 2.33,
+          "tags": {"tourism": "museum", "name": "Louvre", "wikidata": "Q19675"}}]
+    stub = OverpassStub(elements)
+    responses = []
+
+    def handler(request):
+        data = stub.evaluate(parse_qs(request.content.decode())["data"][0])
+        responses.append(data["elements"])
+        return httpx.Response(200, json=data)
+
+    async def run():
+        http_clients._clients["overpass"] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await get_tourist_attractions(48.8566, 2.3522)
+        finally:
+            await http_clients._clients.pop("overpass").aclose()
+
+    original = settings.overpass_max_elements
+    settings.overpass_max_elements = 5
+    try:
+        places = asyncio.run(run())
+    finally:
+        settings.overpass_max_elements = original
+
+    ids = [element["id"] for element in responses[0]]
+    assert ids == [999999, 10, 11, 12, 13, 14]  # notable part first, then the id-ordered cap
+    assert places[0]["name"] == "Louvre"
+
+
+if __name__ == "__main__":
+    run_tests([
+        test_query_is_one_clause_per_key_with_cap,
+        test_malformed_categories_are_rejected,
+        test_attractions_from_capped_query,
+        test_notable_elements_survive_the_cap,
+    ])
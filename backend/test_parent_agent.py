@@ -0,0 +1,85 @@
+"""Test script for concurrent child agents and their deadlines (no network)."""
+
+import asyncio
+import time
+
+from app.agents.base_agent import BaseAgent
+from app.agents.parent_agent import ParentAgent
+from testkit import run_tests
+
+PARIS = {"lat": 48.8566, "lon": 2.3522}
+PARSED = {"location": "Paris", "was_corrected": False, "original_query": "Weather and places in Paris"}
+BOTH = {"weather": True, "places": True}
+
+
+class FakeAgent(BaseAgent):
+    """Child agent answering after a delay."""
+
+    def __init__(self, name: str, delay: float):
+        super().__init__(name)
+        self.delay = delay
+
+    async def process(self, lat, lon, place_name):
+        await asyncio.sleep(self.delay)
+        return self.format_response(success=True, data={"text": f"{self.name.capitalize()} for {place_name}.",
+                                                        "temperature": 21.0, "places": [{"name": "Louvre"}]})
+
+
+def run_agents(agents):
+    parent = ParentAgent()
+
+    async def run():
+        start = time.perf_counter()
+        responses = await parent._run_agents(agents, PARIS["lat"], PARIS["lon"], "Paris")
+        return responses, time.perf_counter() - start
+
+    responses, elapsed = asyncio.run(run())
+    return parent, responses, elapsed
+
+
+def test_agents_run_concurrently():
+    """Two agents take as long as the slower one, not the sum."""
+    _, responses, elapsed = run_agents([("weather", FakeAgent("weather", 0.2), 1.0),
+                                        ("places", FakeAgent("places", 0.2), 1.0)])
+
+    assert responses["weather"]["success"] and responses["places"]["success"]
+    assert elapsed < 0.35
+
+
+def test_slow_agent_times_out_fast_one_is_kept():
+    """The slow agent is flagged, the fast agent's answer is used and the delay is mentioned."""
+    parent, responses, elapsed = run_agents([("weather", FakeAgent("weather", 0.01), 1.0),
+                                             ("places", FakeAgent("places", 5.0), 0.1)])
+
+    assert elapsed < 1.0
+    assert responses["places"]["timed_out"] is True and responses["places"]["success"] is False
+    assert responses["weather"]["success"] and "timed_out" not in responses["weather"]
+
+    result = parent._compose(PARSED, PARIS, BOTH, responses)
+    assert result["success"] is True
+    assert result["data"]["text"].startswith("Weather for Paris.")
+    assert result["data"]["text"].endswith("Places information is taking longer than usual - please try again in a moment.")
+    assert result["data"]["weather"]["temp"] == 21.0 and result["data"]["places"] == []
+
+
+def test_all_agents_timed_out_is_a_failure():
+    """With nothing answered in time the result is a timeout failure, not the generic help text."""
+    parent, responses, _ = run_agents([("weather", FakeAgent("weather", 5.0), 0.05),
+                                       ("places", FakeAgent("places", 5.0), 0.05)])
+
+    result = parent._compose(PARSED, PARIS, BOTH, responses)
+    assert result["success"] is False and result["timed_out"] is True
+    assert result["data"]["text"] == ("Weather and places information for Paris is taking longer than usual"
+                                      " - please try again in a moment.")
+    assert result["data"]["coordinates"] == PARIS
+
+    # Nothing asked for (and nothing timed out) still gets the help text
+    assert parent._compose(PARSED, PARIS, BOTH, {})["success"] is True
+
+
+if __name__ == "__main__":
+    run_tests([
+        test_agents_run_concurrently,
+        test_slow_agent_times_out_fast_one_is_kept,
+        test_all_agents_timed_out_is_a_failure,
+    ])
@@ -0,0 +1,50 @@
+"""Test script for memoized parse_query results (no network)."""
+
+from app.utils.cache import parse_cache
+from app.utils.text_parser import EnhancedTextParser
+from testkit import run_tests
+
+parser = EnhancedTextParser()
+
+
+def test_equivalent_phrasings_hit_the_memo():
+    """Queries that normalize the same share one parse; per-call fields are kept."""
+    parse_cache.clear()
+    first = parser.parse_query("Weather in Paris")
+    second = parser.parse_query("  weather   in Paris ")
+
+    assert parse_cache.stats()["entries"] == 1
+    assert second["location"] == first["location"] == "Paris"
+    assert second["original_query"] == "  weather   in Paris "
+    assert first["original_query"] == "Weather in Paris"
+
+
+def test_capitalization_that_matters_is_part_of_the_key():
+    """Capitalized words feed location extraction, so they are not conflated."""
+    parse_cache.clear()
+    parser.parse_query("Weather in Paris")
+    parser.parse_query("weather in PARIS")
+
+    assert parse_cache.stats()["entries"] == 2
+
+
+def test_results_are_read_only():
+    """Cached results cannot be mutated by callers."""
+    parsed = parser.parse_query("Places to visit in Rome")
+
+    for target, key in ((parsed, "location"), (parsed["intent"], "places")):
+        try:
+            target[key] = None
+            assert False, f"parse result field '{key}' was mutable"
+        except TypeError:
+            pass
+
+    assert isinstance(parsed["suggestions"], tuple)
+
+
+if __name__ == "__main__":
+    run_tests([
+        test_equivalent_phrasings_hit_the_memo,
+        test_capitalization_that_matters_is_part_of_the_key,
+        test_results_are_read_only,
+    ])
@@ -0,0 +1,86 @@
+"""Test script for attraction scoring and top-k selection (no network)."""
+
+import asyncio
+import random
+
+import httpx
+
+from app.services.http_client import http_clients
+from app.services.place_ranking import TopK, score_attraction
+from app.services.places import get_tourist_attractions
+from app.utils.cache import places_cache
+from testkit import run_tests
+
+
+def test_top_k_keeps_best_one_per_name():
+    """Only the k best survive, duplicates keep their best score, ties go to the first pushed."""
+    top = TopK(3)
+    scores = list(range(20))
+    random.Random(3).shuffle(scores)
+    for score in scores:
+        top.push(score, f"place {score}", score)
+    assert top.items() == [19, 18, 17]
+    assert len(top) == 3
+
+    assert not top.push(18, "place 18", "same score, later")
+    assert top.push(25, "place 17", "renamed best")
+    assert top.items() == ["renamed best", 19, 18]
+
+    ties = TopK(2)
+    for name in ("a", "b", "c"):
+        ties.push(1.0, name, name)
+    assert ties.items() == ["a", "b"]
+    assert TopK(0).push(1.0, "a", "a") is False
+
+
+def test_score_prefers_notable_central_places():
+    """Wikidata/Wikipedia tags, type and closeness all raise the score."""
+    plain = score_attraction({}, "park", 8.0, 10.0)
+    central = score_attraction({}, "park", 1.0, 10.0)
+    museum = score_attraction({}, "museum", 8.0, 10.0)
+    notable = score_attraction({"wikidata": "Q1", "wikipedia:fr": "Louvre"}, "park", 8.0, 10.0)
+
+    assert central > plain and museum > plain and notable > plain
+    assert notable > central
+    assert score_attraction({}, "park", 20.0, 10.0) == score_attraction({}, "park", 10.0, 10.0)
+
+
+def test_service_returns_ranked_places():
+    """Notable places late in the response win over earlier, plain ones."""
+    places_cache.cache.clear()
+    elements = [
+        {"type": "node", "id": i, "lat": 48.9 + i / 10000, "lon": 2.35, "tags": {"name": f"Park {i}", "leisure": "park"}}
+        for i in range(100)
+    ]
+    elements += [
+        {"type": "way", "id": 1000, "center": {"lat": 48.8606, "lon": 2.3376},
+         "tags": {"name": "Louvre", "tourism": "museum", "wikidata": "Q19675", "wikipedia": "fr:Musée du Louvre"}},
+        {"type": "node", "id": 1001, "lat": 48.8584, "lon": 2.2945,
+         "tags": {"name": "Eiffel Tower", "tourism": "attraction", "wikidata": "Q243"}},
+        {"type": "node", "id": 1002, "lat": 48.8530, "lon": 2.3499,
+         "tags": {"name": "博物館", "tourism": "museum", "wikidata": "Q1"}},
+    ]
+
+    async def run():
+        http_clients._clients["overpass"] = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(200, json={"elements": elements}))
+        )
+        try:
+            return await get_tourist_attractions(48.8566, 2.3522)
+        finally:
+            await http_clients._clients.pop("overpass").aclose()
+
+    places = asyncio.run(run())
+
+    assert [place["name"] for place in places[:2]] == ["Louvre", "Eiffel Tower"]
+    assert places[0] == {"name": "Louvre", "lat": 48.8606, "lon": 2.3376, "type": "museum"}
+    assert len(places) == 5
+    assert [place["name"] for place in places[2:]] == ["Park 0", "Park 1", "Park 2"]
+
+
+if __name__ == "__main__":
+    run_tests([
+        test_top_k_keeps_best_one_per_name,
+        test_score_prefers_notable_central_places,
+        test_service_returns_ranked_places,
+    ])
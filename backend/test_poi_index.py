@@ -0,0 +1,151 @@
+"""Test script for the local POI index and its ingest (no network)."""
+
+import asyncio
+import json
+import os
+import random
+import tempfile
+import threading
+
+import httpx
+
+from app.config import settings
+from app.services.http_client import http_clients
+import app.services.places as places_service
+from app.services.places import get_tourist_attractions
+from app.services.poi_index import Coverage, PoiIndex, PoiRecord, poi_index, write_index
+from app.utils.cache import places_cache
+from app.utils.geo import distance_km
+from build_poi_index import build, parse_categories
+from testkit import run_tests
+
+PARIS = Coverage(48.70, 2.10, 49.00, 2.60)
+
+
+def _records(count=3000, seed=5):
+    rng = random.Random(seed)
+    categories = ["tourism=museum", "tourism=attraction", "leisure=park", "historic=castle"]
+    records = []
+    for i in range(count):
+        tags = {"name": f"Place {i}"}
+        if i % 7 == 0:
+            tags["wikidata"] = f"Q{i}"
+        records.append(PoiRecord(rng.uniform(48.70, 49.00), rng.uniform(2.10, 2.60), rng.choice(categories), tags))
+    return records
+
+
+def test_radius_query_matches_brute_force():
+    """Grid lookups find exactly the POIs a full scan finds, with their tags."""
+    records = _records()
+    path = os.path.join(tempfile.mkdtemp(), "pois.bin")
+    assert write_index(path, records, [PARIS], cell_deg=0.02) == len(records)
+
+    index = PoiIndex(path)
+    assert index.load() == len(records)
+
+    for lat, lon, radius in [(48.8566, 2.3522, 3000), (48.85, 2.30, 500), (48.90, 2.25, 10000)]:
+        found = index.query(lat, lon, radius, categories={"tourism=museum", "leisure=park"})
+        expected = {
+            r.tags["name"] for r in records
+            if r.category in ("tourism=museum", "leisure=park") and distance_km(lat, lon, r.lat, r.lon) <= radius / 1000
+        }
+        assert {element["tags"]["name"] for element in found} == expected
+        assert expected
+
+    place = next(e for e in index.query(records[7].lat, records[7].lon, 10) if e["tags"]["name"] == "Place 7")
+    assert place["tags"] == {records[7].category.split("=")[0]: records[7].category.split("=")[1],
+                             "name": "Place 7", "wikidata": "Q7"}
+    assert abs(place["lat"] - records[7].lat) < 1e-6
+
+    assert index.covers(48.8566, 2.3522, 10000)
+    assert not index.covers(48.95, 2.3522, 10000)  # circle crosses the northern edge
+    assert index.query(48.8566, 2.3522, 1000, categories={"shop=bakery"}) == []
+    assert PoiIndex(path + ".missing").load() == 0
+
+
+def test_ingest_geojson_inputs():
+    """FeatureCollections and feature-per-line files are read; unnamed or uncategorized features are skipped."""
+    folder = tempfile.mkdtemp()
+    collection = os.path.join(folder, "paris.geojson")
+    sequence = os.path.join(folder, "rome.geojsonseq")
+    output = os.path.join(folder, "pois.bin")
+
+    with open(collection, "w", encoding="utf-8") as f:
+        json.dump({"type": "FeatureCollection", "features": [
+            {"type": "Feature", "geometry": {"type": "Point", "coordinates": [2.3376, 48.8606]},
+             "properties": {"name": "Louvre", "tourism": "museum", "wikidata": "Q19675", "opening_hours": "x"}},
+            {"type": "Feature", "geometry": {"type": "Polygon", "coordinates": [[[2.32, 48.86], [2.34, 48.86],
+                                                                                [2.34, 48.87], [2.32, 48.86]]]},
+             "properties": {"tags": {"name": "Tuileries", "leisure": "park"}}},
+            {"type": "Feature", "geometry": {"type": "Point", "coordinates": [2.35, 48.85]},
+             "properties": {"tourism": "museum"}},
+            {"type": "Feature", "geometry": {"type": "Point", "coordinates": [2.35, 48.85]},
+             "properties": {"name": "Bakery", "shop": "bakery"}},
+        ]}, f)
+    with open(sequence, "w", encoding="utf-8") as f:
+        f.write('\x1e{"type": "Feature", "geometry": {"type": "Point", "coordinates": [12.4922, 41.8902]}, '
+                '"properties": {"name": "Colosseo", "name:en": "Colosseum", "historic": "monument"}}\n')
+
+    build([collection, sequence], output, [], parse_categories(settings.places_categories), 0.05)
+
+    index = PoiIndex(output)
+    assert index.load() == 3
+    assert len(index.coverage) == 2
+    paris = {e["tags"]["name"]: e for e in index.query(48.8606, 2.3376, 2000)}
+    assert set(paris) == {"Louvre", "Tuileries"}
+    assert paris["Louvre"]["tags"] == {"tourism": "museum", "name": "Louvre", "wikidata": "Q19675"}
+    assert abs(paris["Tuileries"]["lat"] - 48.865) < 1e-6 and abs(paris["Tuileries"]["lon"] - 2.33) < 1e-6
+    assert index.query(41.8902, 12.4922, 100)[0]["tags"]["name:en"] == "Colosseum"
+
+
+def test_places_use_index_inside_coverage_only():
+    """Covered searches never reach Overpass (and scan the index off the event loop); uncovered ones still do."""
+    path = os.path.join(tempfile.mkdtemp(), "pois.bin")
+    write_index(path, _records(), [PARIS])
+    original_path = settings.poi_index_path
+    settings.poi_index_path = poi_index.path = path
+    poi_index.load()
+    places_cache.cache.clear()
+    overpass_calls = []
+    lookup_threads = []
+    local_attractions = places_service._local_attractions
+
+    def recording_local_attractions(*args):
+        lookup_threads.append(threading.current_thread())
+        return local_attractions(*args)
+
+    def handler(request):
+        overpass_calls.append(request)
+        return httpx.Response(200, json={"elements": [
+            {"type": "node", "id": 1, "lat": 41.89, "lon": 12.49, "tags": {"name": "Colosseum", "historic": "monument"}}
+        ]})
+
+    async def run():
+        http_clients._clients["overpass"] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return await get_tourist_attractions(48.8566, 2.3522), await get_tourist_attractions(41.8902, 12.4922)
+        finally:
+            await http_clients._clients.pop("overpass").aclose()
+
+    places_service._local_attractions = recording_local_attractions
+    try:
+        paris, rome = asyncio.run(run())
+    finally:
+        places_service._local_attractions = local_attractions
+        settings.poi_index_path = poi_index.path = original_path
+        poi_index.load()
+
+    assert len(overpass_calls) == 1
+    assert len(lookup_threads) == 1 and lookup_threads[0] is not threading.main_thread()
+    assert len(paris) == settings.places_max_results
+    assert all(int(place["name"].split()[1]) % 7 == 0 for place in paris)  # wikidata-tagged places rank first
+    assert [place["name"] for place in rome] == ["Colosseum"]
+    assert len(poi_index) == 0 and not poi_index.coverage
+
+
+if __name__ == "__main__":
+    run_tests([
+        test_radius_query_matches_brute_force,
+        test_ingest_geojson_inputs,
+        test_places_use_index_inside_coverage_only,
+    ])
@@ -0,0 +1,79 @@
+"""Test script for the upstream rate limiter (runs on a fake clock, no network)."""
+
+import asyncio
+from app.utils.rate_limiter import RateLimiter
+from testkit import FakeClock, run_tests
+
+
+async def _run_callers(limiter: RateLimiter, clock: FakeClock, callers: int):
+    """Start concurrent callers and record (caller_id, upstream_call_time)."""
+    calls = []
+
+    async def caller(caller_id: int):
+        async with limiter:
+            calls.append((caller_id, clock.time()))
+
+    await asyncio.gather(*(caller(i) for i in range(callers)))
+    return calls
+
+
+def test_no_two_calls_inside_delay():
+    """500 concurrent callers never land two upstream calls inside the delay."""
+    clock = FakeClock()
+    delay = 1.0
+    limiter = RateLimiter("test", delay=delay, clock=clock.time, sleep=clock.sleep)
+
+    calls = asyncio.run(_run_callers(limiter, clock, 500))
+    times = [t for _, t in calls]
+
+    assert len(times) == 500
+    gaps = [later - earlier for earlier, later in zip(times, times[1:])]
+    assert min(gaps) >= delay - 1e-9, f"Calls {min(gaps):.6f}s apart (delay {delay}s)"
+    # Serialised, but nobody sleeps needlessly: total span is exactly (n - 1) delays
+    assert abs(times[-1] - times[0] - 499 * delay) < 1e-6
+
+
+def test_fifo_order():
+    """Callers are served in arrival order."""
+    clock = FakeClock()
+    limiter = RateLimiter("test", delay=1.0, clock=clock.time, sleep=clock.sleep)
+
+    calls = asyncio.run(_run_callers(limiter, clock, 50))
+
+    assert [caller_id for caller_id, _ in calls] == list(range(50))
+
+
+def test_burst_then_steady_rate():
+    """A burst of N goes through immediately, then one call per delay."""
+    clock = FakeClock()
+    limiter = RateLimiter("test", delay=0.5, burst=3, clock=clock.time, sleep=clock.sleep)
+
+    calls = asyncio.run(_run_callers(limiter, clock, 6))
+    times = [t for _, t in calls]
+
+    assert times[:3] == [0.0, 0.0, 0.0]
+    assert [round(t, 6) for t in times[3:]] == [0.5, 1.0, 1.5]
+
+
+def test_metrics():
+    """Queue depth and wait-time metrics are tracked."""
+    clock = FakeClock()
+    limiter = RateLimiter("test", delay=1.0, clock=clock.time, sleep=clock.sleep)
+
+    asyncio.run(_run_callers(limiter, clock, 10))
+    stats = limiter.stats()
+
+    assert stats["acquired"] == 10
+    assert stats["queue_depth"] == 0
+    assert stats["max_queue_depth"] == 9  # The first caller is served before the rest arrive
+    assert stats["max_wait_ms"] == 9000.0
+    assert stats["avg_wait_ms"] == 4500.0
+
+
+if __name__ == "__main__":
+    run_tests([
+        test_no_two_calls_inside_delay,
+        test_fifo_order,
+        test_burst_then_steady_rate,
+        test_metrics,
+    ])
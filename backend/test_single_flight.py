@@ -0,0 +1,95 @@
+"""Test script for single-flight request coalescing (no network)."""
+
+import asyncio
+from app.utils.single_flight import SingleFlight
+from testkit import run_tests
+
+
+def test_concurrent_identical_lookups_share_one_call():
+    """Concurrent callers with the same key trigger one upstream call."""
+    flight = SingleFlight("test-shared")
+    upstream_calls = []
+
+    async def lookup():
+        upstream_calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"lat": 48.85, "lon": 2.35}
+
+    async def run():
+        return await asyncio.gather(*(flight.do("paris", lookup) for _ in range(50)))
+
+    results = asyncio.run(run())
+
+    assert len(upstream_calls) == 1
+    assert all(result == {"lat": 48.85, "lon": 2.35} for result in results)
+    assert flight.stats() == {"in_flight": 0, "upstream_calls": 1, "coalesced_calls": 49}
+
+
+def test_different_keys_do_not_coalesce():
+    """Different keys each get their own upstream call."""
+    flight = SingleFlight("test-keys")
+    upstream_calls = []
+
+    async def lookup(name):
+        upstream_calls.append(name)
+        await asyncio.sleep(0.01)
+        return name
+
+    async def run():
+        return await asyncio.gather(
+            flight.do("paris", lambda: lookup("paris")),
+            flight.do("tokyo", lambda: lookup("tokyo")),
+        )
+
+    assert asyncio.run(run()) == ["paris", "tokyo"]
+    assert sorted(upstream_calls) == ["paris", "tokyo"]
+
+
+def test_errors_propagate_and_are_not_remembered():
+    """Every waiter sees the error, and the next call retries upstream."""
+    flight = SingleFlight("test-errors")
+    upstream_calls = []
+
+    async def failing_lookup():
+        upstream_calls.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream down")
+
+    async def run():
+        return await asyncio.gather(
+            *(flight.do("paris", failing_lookup) for _ in range(5)),
+            return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in results)
+
+    asyncio.run(run())
+    assert len(upstream_calls) == 2
+
+
+def test_cancelled_caller_does_not_cancel_shared_lookup():
+    """Cancelling one waiter leaves the lookup running for the others."""
+    flight = SingleFlight("test-cancel")
+
+    async def lookup():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def run():
+        first = asyncio.ensure_future(flight.do("paris", lookup))
+        second = asyncio.ensure_future(flight.do("paris", lookup))
+        await asyncio.sleep(0.005)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(run()) == "done"
+
+
+if __name__ == "__main__":
+    run_tests([
+        test_concurrent_identical_lookups_share_one_call,
+        test_different_keys_do_not_coalesce,
+        test_errors_propagate_and_are_not_remembered,
+        test_cancelled_caller_does_not_cancel_shared_lookup,
+    ])
@@ -0,0 +1,88 @@
+"""Test script for streamed tourism query results (no network)."""
+
+import asyncio
+
+import app.agents.parent_agent as parent_module
+from app.agents.parent_agent import ParentAgent
+from app.main import _stream_event
+from testkit import run_tests
+
+
+def make_agent(places_delay: float = 0.05) -> ParentAgent:
+    """Parent agent with instant geocoding, fast weather and slower places."""
+    agent = ParentAgent()
+
+    async def fake_weather(lat, lon, place_name):
+        return agent.weather_agent.format_response(
+            success=True, data={"text": f"Sunny in {place_name}.", "temperature": 24.0}
+        )
+
+    async def fake_places(lat, lon, place_name):
+        await asyncio.sleep(places_delay)
+        return agent.places_agent.format_response(
+            success=True, data={"text": f"Visit {place_name}.", "places": [{"name": "Colosseum"}]}
+        )
+
+    agent.weather_agent.process = fake_weather
+    agent.places_agent.process = fake_places
+    return agent
+
+
+def collect(agent: ParentAgent, query: str) -> list:
+    async def fake_get_coordinates(location):
+        return {"lat": 41.9028, "lon": 12.4964}
+
+    async def run():
+        return [event async for event in agent.process_stream(query)]
+
+    original = parent_module.get_coordinates
+    parent_module.get_coordinates = fake_get_coordinates
+    try:
+        return asyncio.run(run())
+    finally:
+        parent_module.get_coordinates = original
+
+
+def test_stages_arrive_in_order():
+    """Parse, location, weather (fast) and places (slow) stream before the final answer."""
+    events = collect(make_agent(), "Weather and places to visit in Rome")
+
+    assert [event["event"] for event in events] == ["parsed", "located", "weather", "places", "done"]
+    assert events[0]["location"] == "Rome"
+    assert events[1]["coordinates"] == {"lat": 41.9028, "lon": 12.4964}
+    assert events[-1]["result"]["data"]["places"] == [{"name": "Colosseum"}]
+
+
+def test_final_answer_matches_process():
+    """The 'done' event carries the same response as the non-streaming path."""
+    agent = make_agent(places_delay=0)
+    query = "Places to visit in Rome"
+    final = collect(agent, query)[-1]["result"]
+
+    async def fake_get_coordinates(location):
+        return {"lat": 41.9028, "lon": 12.4964}
+
+    original = parent_module.get_coordinates
+    parent_module.get_coordinates = fake_get_coordinates
+    try:
+        assert asyncio.run(agent.process(query)) == final
+    finally:
+        parent_module.get_coordinates = original
+
+
+def test_errors_end_the_stream_with_a_message():
+    """A query without a location yields one error line with a user-facing message."""
+    events = collect(make_agent(), "the weather today")
+
+    assert [event["event"] for event in events] == ["parsed", "error"]
+    line = _stream_event(events[-1])
+    assert line["success"] is False
+    assert "couldn't identify a location" in line["message"]
+
+
+if __name__ == "__main__":
+    run_tests([
+        test_stages_arrive_in_order,
+        test_final_answer_matches_process,
+        test_errors_end_the_stream_with_a_message,
+    ])
@@ -0,0 +1,67 @@
+"""Shared fakes and the script runner for the backend test scripts (no network).
+
+    from testkit import FakeClock, FakeParentAgent, run_tests
+
+    if __name__ == "__main__":
+        run_tests([test_one, test_two])
+"""
+
+import asyncio
+import sys
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+class FakeClock:
+    """Manually advanced clock: sleeping advances time instantly."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def time(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        await asyncio.sleep(0)  # Let other tasks run, as a real sleep would
+        self.now += max(seconds, 0.0)
+
+
+class FakeParentAgent:
+    """
+    Stand-in for ParentAgent: every query is about one place.
+
+    Queries mentioning any of the `unknown` names get the agent's
+    "not found" answer instead. `weather` may be changed between requests.
+    """
+
+    def __init__(self, places: List[Dict], weather: Optional[Dict] = None, place_name: str = "Paris",
+                 lat: float = 48.8566, lon: float = 2.3522, unknown: Iterable[str] = ()):
+        self.places = places
+        self.weather = weather
+        self.place_name = place_name
+        self.coordinates = {"lat": lat, "lon": lon}
+        self.unknown = tuple(unknown)
+
+    async def process(self, query):
+        if any(name in query for name in self.unknown):
+            return {"success": False, "data": {"text": "I don't know this place exists"}}
+
+        data = {"text": self.place_name, "place_name": self.place_name,
+                "coordinates": dict(self.coordinates), "places": self.places}
+        if self.weather is not None:
+            data["weather"] = dict(self.weather)
+        return {"success": True, "data": data}
+
+
+def run_tests(tests: List[Callable[[], None]]) -> None:
+    """Run test functions in order, print a line per test and the totals, and exit non-zero on failure."""
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✓ PASS  {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"✗ FAIL  {test.__name__}: {e}")
+
+    print(f"\nRESULTS: {len(tests) - failed} passed, {failed} failed out of {len(tests)} tests")
+    sys.exit(0 if failed == 0 else 1)